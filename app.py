@@ -1,9 +1,20 @@
+import queue
+
 from dash import Dash
 import dash_bootstrap_components as dbc
+import orjson
+from flask import Response, request, stream_with_context
 
-from backend.database.db import init_db
+from backend.database.db import engine, get_db_session, init_db
+from backend.database.pool_metrics import pool_metrics
+from backend.repositories import ScrapeLogRepository, ScrapeTaskRepository
+from backend.repositories.query_cache import query_cache
+from backend.task_events import MAX_LINES_PER_EVENT, TASK_LIST_SIZE, hub
+from backend.utils import encode_cursor
 from frontend.page_container import app_layout
 
+LOG_TAIL_LINES = 200
+
 app = Dash(
     __name__,
     use_pages=True,
@@ -16,6 +27,108 @@ app.layout = app_layout()
 # expose the underlying Flask server so WSGI servers (gunicorn) can find it
 server = app.server
 
+
+@server.route("/metrics")
+def metrics():
+    # per worker process: each gunicorn worker has its own pool and counters
+    return Response(
+        pool_metrics.render_prometheus(engine.pool) + query_cache.render_prometheus(),
+        mimetype="text/plain; version=0.0.4",
+    )
+
+
+def _sse(message: dict, event_id=None) -> str:
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {message['type']}\ndata: {orjson.dumps(message).decode()}\n\n"
+
+
+@server.route("/events/tasks")
+def task_events():
+    """Server-sent events with task changes; with ?task_id=, also that task's new log lines.
+
+    The stream opens with a snapshot, then only pushes deltas from the shared hub. The
+    snapshot is the latest TASK_LIST_SIZE tasks plus a cursor to the older ones, or for
+    one task, the task and its lines after ?after_line= / Last-Event-ID (its last
+    LOG_TAIL_LINES lines when neither is given).
+    """
+    task_id = request.args.get("task_id", type=int)
+    after_line = request.headers.get("Last-Event-ID", type=int)
+    if after_line is None:
+        after_line = request.args.get("after_line", type=int)
+
+    # subscribe before the snapshot, so nothing committed in between is missed
+    subscriber = hub.subscribe(task_id)
+
+    with get_db_session() as session:
+        if task_id is None:
+            # uncached: the snapshot must not predate the deltas that follow it
+            tasks = ScrapeTaskRepository.get_summaries.uncached(session, TASK_LIST_SIZE)
+            older = (
+                encode_cursor(ScrapeTaskRepository.summary_cursor(tasks[-1]))
+                if len(tasks) == TASK_LIST_SIZE
+                else None
+            )
+            snapshot = [
+                {
+                    "type": "tasks",
+                    "tasks": [t.model_dump(mode="json") for t in tasks],
+                    "older": older,
+                }
+            ]
+        else:
+            task = ScrapeTaskRepository.get_by_id.uncached(session, task_id)
+            if after_line is None:
+                # a fresh client starts from the tail, not from line 1
+                lines = ScrapeLogRepository.get_recent_logs(session, task_id, LOG_TAIL_LINES)
+                after_line = 0
+            else:
+                lines = ScrapeLogRepository.get_logs_after(
+                    session, task_id, after_line, MAX_LINES_PER_EVENT
+                )
+            snapshot = [{"type": "task", "task": task.model_dump(mode="json")}] if task else []
+            if lines:
+                snapshot.append(
+                    {
+                        "type": "logs",
+                        "task_id": task_id,
+                        "lines": [{"line_no": l.line_no, "text": l.text} for l in lines],
+                    }
+                )
+
+    def stream():
+        last_line = after_line
+        try:
+            for message in snapshot:
+                if message["type"] == "logs":
+                    last_line = message["lines"][-1]["line_no"]
+                yield _sse(message, last_line if task_id is not None else None)
+            while hub.is_subscribed(subscriber):
+                try:
+                    message = subscriber.get(timeout=15)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                if message["type"] == "logs":
+                    # drop lines the snapshot already sent
+                    # (copied: the hub shares one message between subscribers)
+                    message = {
+                        **message,
+                        "lines": [l for l in message["lines"] if l["line_no"] > last_line],
+                    }
+                    if not message["lines"]:
+                        continue
+                    last_line = message["lines"][-1]["line_no"]
+                yield _sse(message, last_line if task_id is not None else None)
+        finally:
+            hub.unsubscribe(subscriber)
+
+    return Response(
+        stream_with_context(stream()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 if __name__ == "__main__":
     init_db()
 
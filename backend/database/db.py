@@ -1,14 +1,54 @@
 import os
 from contextlib import contextmanager
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import sessionmaker
 
+from .pool_metrics import InstrumentedNullPool, InstrumentedQueuePool, start_pool_logging
+
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://localhost/bgg_analysis_dev")
 
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _pool_options() -> dict:
+    """Pool settings from the environment.
+
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT (seconds to wait for a checkout),
+    DB_POOL_RECYCLE (seconds, -1 = never) and DB_POOL_PRE_PING size the in-process pool.
+    DB_EXTERNAL_POOLER=1 disables it (NullPool) for when PgBouncer or similar sits in
+    front of Postgres. Note each gunicorn worker has its own pool, so the server sees
+    up to workers * (size + overflow) connections.
+    """
+    options = {"pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True)}
+    if _env_bool("DB_EXTERNAL_POOLER", False):
+        options["poolclass"] = InstrumentedNullPool
+        return options
+
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    )
+    return options
+
+
 # Engine and session factory
-engine = create_engine(DATABASE_URL, future=True)
+engine = create_engine(DATABASE_URL, future=True, **_pool_options())
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 
+# DB_POOL_LOG_INTERVAL=<seconds> prints pool metrics periodically (0 = off)
+if float(os.getenv("DB_POOL_LOG_INTERVAL", "0")) > 0:
+    start_pool_logging(lambda: engine.pool, float(os.environ["DB_POOL_LOG_INTERVAL"]))
+
 
 @contextmanager
 def get_db_session():
@@ -24,11 +64,85 @@ def get_db_session():
         session.close()
 
 
+def _uses_pg_trgm(index) -> bool:
+    return "gin_trgm_ops" in index.dialect_options["postgresql"]["ops"].values()
+
+
 def init_db():
     """Create DB tables from models. Call once during local setup or in a migration-less scenario."""
     # import models here to avoid circular imports at module import time
     from . import models
 
-    models.Base.metadata.create_all(bind=engine)
+    try:
+        with engine.begin() as conn:
+            # trigram indexes for name search
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        trigram = True
+    except DBAPIError as exc:
+        trigram = False
+        print(
+            "pg_trgm is not available, so the trigram name indexes are skipped and "
+            "search falls back to substring matching only "
+            f"({str(exc.orig).splitlines()[0]}). Install the extension and rerun init_db to enable it."
+        )
+
+    # create_all would create the trigram indexes along with their tables
+    skipped = [] if trigram else [
+        index
+        for table in models.Base.metadata.sorted_tables
+        for index in table.indexes
+        if _uses_pg_trgm(index)
+    ]
+    for index in skipped:
+        index.table.indexes.discard(index)
+    try:
+        models.Base.metadata.create_all(bind=engine)
+    finally:
+        for index in skipped:
+            index.table.indexes.add(index)
+
+    # create_all skips existing tables, so add nullable columns and indexes
+    # introduced since then separately
+    existing = inspect(engine)
+    with engine.begin() as conn:
+        for table in models.Base.metadata.sorted_tables:
+            present = {c["name"]: c for c in existing.get_columns(table.name)}
+            for column in table.columns:
+                current = present.get(column.name)
+                if current is None:
+                    if column.nullable:
+                        column_type = column.type.compile(dialect=engine.dialect)
+                        conn.execute(
+                            text(
+                                f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {column_type}'
+                            )
+                        )
+                    continue
+                if column.nullable and not current["nullable"]:
+                    conn.execute(
+                        text(f'ALTER TABLE {table.name} ALTER COLUMN "{column.name}" DROP NOT NULL')
+                    )
+                # payloads moved from json to jsonb; this rewrites the table once
+                if isinstance(column.type, JSONB) and not isinstance(current["type"], JSONB):
+                    conn.execute(
+                        text(
+                            f'ALTER TABLE {table.name} ALTER COLUMN "{column.name}" '
+                            f'TYPE jsonb USING "{column.name}"::jsonb'
+                        )
+                    )
+
+    for table in models.Base.metadata.sorted_tables:
+        for index in table.indexes:
+            if trigram or not _uses_pg_trgm(index):
+                index.create(bind=engine, checkfirst=True)
+
+    from .partitions import PARTITIONED_TABLES, ensure_partitions, is_partitioned
+
+    with engine.begin() as conn:
+        for table in PARTITIONED_TABLES:
+            if is_partitioned(conn, table):
+                ensure_partitions(conn, table)
+            else:
+                print(f"{table} is not partitioned yet; run `python maintain.py --partition`")
 
     print("\nDatabase initialized successfully.\n")
@@ -14,15 +14,29 @@ from sqlalchemy import (
     Index,
     Enum as SAEnum,
     Boolean,
-    JSON,
+    LargeBinary,
 )
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 import enum
 
 from backend.utils import parse_datetime, format_datetime
+from .payload_codec import decode_payload, encode_payload
 
 Base = declarative_base()
 
 
+def _payload_property():
+    """`payload` as a dict, whether stored as JSONB or compressed (see payload_codec.py)."""
+
+    def fget(self):
+        return decode_payload(self.payload_json, self.payload_compressed)
+
+    def fset(self, value):
+        self.payload_json, self.payload_compressed = encode_payload(value)
+
+    return property(fget, fset)
+
+
 class BoardGame(Base):
     __tablename__ = "boardgames"
 
@@ -73,9 +87,13 @@ class ScrapeTask(Base):
 
 
 class ScrapeLog(Base):
+    """One log line. Range-partitioned by month on created_at, see `partitions.py`."""
+
     __tablename__ = "scrape_logs"
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
 
-    id = Column(Integer, primary_key=True)
+    # a partitioned table's primary key must include the partition key
+    id = Column(Integer, primary_key=True, autoincrement=True)
     task_id = Column(
         "task_id_fk",
         Integer,
@@ -84,15 +102,18 @@ class ScrapeLog(Base):
         index=True,
     )
     line_no = Column(Integer, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
     text = Column(Text, nullable=False)
     task = relationship("ScrapeTask", back_populates="logs")
 
 
 class RawData(Base):
+    """Scraped payloads. Range-partitioned by month on created_at, see `partitions.py`."""
+
     __tablename__ = "raw_data"
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
 
-    id = Column(Integer, primary_key=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
     source_table = Column(String(255), nullable=False, index=True)
     source_id = Column(Integer, nullable=True, index=True)
     scrape_task_id = Column(
@@ -101,24 +122,23 @@ class RawData(Base):
         nullable=True,
         index=True,
     )
-    payload = Column(JSON, nullable=False)
+    # exactly one of these is set; read and write through `payload`
+    payload_json = Column("payload", JSONB(none_as_null=True), nullable=True)
+    payload_compressed = Column(LargeBinary, nullable=True)
+    payload = _payload_property()
     processed = Column(Boolean, nullable=False, default=False, server_default="false")
-    processor_version = Column(String(64), nullable=True)
+    processor_version = Column(String(64), nullable=True, index=True)
     error = Column(Text, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
 
 
 class CleanData(Base):
     __tablename__ = "clean_data"
 
     id = Column(Integer, primary_key=True)
-    raw_id = Column(
-        "raw_id_fk",
-        Integer,
-        ForeignKey("raw_data.id", ondelete="SET NULL"),
-        nullable=False,
-        index=True,
-    )
+    # not a foreign key: raw_data(id) alone is not unique across partitions, and raw rows
+    # outlive their retention in archives (see partitions.py)
+    raw_id = Column("raw_id_fk", Integer, nullable=False, index=True)
     source_table = Column(String(255), nullable=False, index=True)
     source_id = Column(Integer, nullable=True, index=True)
     scrape_task_id = Column(
@@ -127,15 +147,126 @@ class CleanData(Base):
         nullable=True,
         index=True,
     )
-    payload = Column(JSON, nullable=False)
+    # exactly one of these is set; read and write through `payload`
+    payload_json = Column("payload", JSONB(none_as_null=True), nullable=True)
+    payload_compressed = Column(LargeBinary, nullable=True)
+    payload = _payload_property()
+    processor_version = Column(String(64), nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class CleanDataCurrent(Base):
+    """Latest clean row per (source_table, source_id), upserted on every clean_data write."""
+
+    __tablename__ = "clean_data_current"
+
+    source_table = Column(String(255), primary_key=True)
+    source_id = Column(Integer, primary_key=True)
+    clean_id = Column(
+        "clean_id_fk",
+        Integer,
+        ForeignKey("clean_data.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    raw_id = Column("raw_id_fk", Integer, nullable=False)
+    scrape_task_id = Column(Integer, nullable=True)
+    # exactly one of these is set; read and write through `payload`
+    payload_json = Column("payload", JSONB(none_as_null=True), nullable=True)
+    payload_compressed = Column(LargeBinary, nullable=True)
+    payload = _payload_property()
     processor_version = Column(String(64), nullable=True)
     error = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 
+class CleanBoardGame(Base):
+    """Typed, one-row-per-game projection of the latest cleaned boardgame payload."""
+
+    __tablename__ = "clean_boardgames"
+
+    id = Column(Integer, primary_key=True)
+    # raw_data row this was cleaned from; not a foreign key, see CleanData.raw_id
+    raw_id = Column("raw_id_fk", Integer, nullable=True, index=True)
+    scrape_task_id = Column(
+        Integer,
+        ForeignKey("scrape_tasks.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    name = Column(String(255), nullable=True)
+    url = Column(String(255), nullable=True)
+    year_released = Column(Integer, nullable=True, index=True)
+    overall_rank = Column(Integer, nullable=True, index=True)
+    thematic_rank = Column(Integer, nullable=True)
+    avg_rating = Column(Float, nullable=True, index=True)
+    std_deviation = Column(Float, nullable=True)
+    weight = Column(Float, nullable=True, index=True)
+    no_of_ratings = Column(Integer, nullable=True, index=True)
+    own = Column(Integer, nullable=True, index=True)
+    prev_owned = Column(Integer, nullable=True)
+    wishlist = Column(Integer, nullable=True)
+    fans = Column(Integer, nullable=True)
+    comments = Column(Integer, nullable=True)
+    page_views = Column(Integer, nullable=True)
+    all_time_plays = Column(Integer, nullable=True)
+    this_month = Column(Integer, nullable=True)
+    for_trade = Column(Integer, nullable=True)
+    want_in_trade = Column(Integer, nullable=True)
+    has_parts = Column(Integer, nullable=True)
+    want_parts = Column(Integer, nullable=True)
+    official_player_count_min = Column(Integer, nullable=True)
+    official_player_count_max = Column(Integer, nullable=True)
+    community_player_count_min = Column(Integer, nullable=True)
+    community_player_count_max = Column(Integer, nullable=True)
+    best_player_count_min = Column(Integer, nullable=True)
+    best_player_count_max = Column(Integer, nullable=True)
+    designer = Column(Text, nullable=True)
+    categories = Column(ARRAY(Text), nullable=True)
+    mechanics = Column(ARRAY(Text), nullable=True)
+    publishers = Column(ARRAY(Text), nullable=True)
+    artists = Column(ARRAY(Text), nullable=True)
+    family = Column(ARRAY(Text), nullable=True)
+    alternate_names = Column(ARRAY(Text), nullable=True)
+    # name and alternate names, one per line, for the trigram name search
+    search_names = Column(Text, nullable=True)
+    min_price_usd = Column(Float, nullable=True)
+    processor_version = Column(String(64), nullable=True)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
 # Composite index for fast retrieval of latest lines per task.
 Index("ix_scrape_logs_task_line_no", ScrapeLog.task_id, ScrapeLog.line_no.desc())
 
+# Task list: newest activity first, keyset-paged on (last_update, id).
+Index("ix_scrape_tasks_last_update_id", ScrapeTask.last_update.desc(), ScrapeTask.id.desc())
+
+# Keyset pagination of the boardgames list by name: WHERE (name, id) > (:name, :id) ORDER BY name, id.
+Index("ix_boardgames_name_id", BoardGame.name, BoardGame.id)
+
+# pg_trgm GIN indexes for fuzzy / substring name search (word_similarity, ILIKE '%...%').
+Index(
+    "ix_boardgames_name_trgm",
+    BoardGame.name,
+    postgresql_using="gin",
+    postgresql_ops={"name": "gin_trgm_ops"},
+)
+Index(
+    "ix_clean_boardgames_search_names_trgm",
+    CleanBoardGame.search_names,
+    postgresql_using="gin",
+    postgresql_ops={"search_names": "gin_trgm_ops"},
+)
+
+# Partial index over the cleaning backlog, so finding unprocessed rows never scans processed ones.
+Index(
+    "ix_raw_data_pending",
+    RawData.source_table,
+    RawData.id,
+    postgresql_where=RawData.processed.is_(False) & RawData.error.is_(None),
+)
+
 # Composite index for fast retrieval of clean data by source table and id, ordered by creation time.
 Index(
     "ix_clean_data_source_table_source_id_created_at",
@@ -143,3 +274,24 @@ Index(
     CleanData.source_id,
     CleanData.created_at.desc(),
 )
+
+# The catalog sorts descending with NULLS LAST and an id tie-breaker; a plain ASC index
+# scanned backwards yields NULLS FIRST, so the usual "highest first" sorts get their own.
+for _column in ("avg_rating", "no_of_ratings", "own", "weight", "year_released"):
+    Index(
+        f"ix_clean_boardgames_{_column}_desc",
+        getattr(CleanBoardGame, _column).desc().nulls_last(),
+        CleanBoardGame.id,
+    )
+
+# GIN indexes so "games in category X" / "games with mechanic Y" filters (array @>) are indexed.
+Index(
+    "ix_clean_boardgames_categories",
+    CleanBoardGame.categories,
+    postgresql_using="gin",
+)
+Index(
+    "ix_clean_boardgames_mechanics",
+    CleanBoardGame.mechanics,
+    postgresql_using="gin",
+)
@@ -0,0 +1,33 @@
+"""Postgres NOTIFY for scrape task changes.
+
+Repositories call `notify_task_event` inside the writing transaction; Postgres delivers
+the notification on commit (and drops it on rollback) to every connection LISTENing on
+`TASK_EVENTS_CHANNEL`, see `backend.task_events.TaskEventHub`.
+"""
+
+from typing import Optional
+
+import orjson
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+TASK_EVENTS_CHANNEL = "scrape_task_events"
+
+
+def notify_task_event(
+    session: Session,
+    task_id: int,
+    first_line_no: Optional[int] = None,
+    last_line_no: Optional[int] = None,
+) -> None:
+    """Announce that a task changed; with line numbers, that those log lines were added.
+
+    The payload only identifies the change (NOTIFY payloads are capped at 8000 bytes);
+    listeners read the rows themselves.
+    """
+    payload = {"task_id": task_id}
+    if last_line_no is not None:
+        payload.update(first_line_no=first_line_no, last_line_no=last_line_no)
+    session.execute(
+        select(func.pg_notify(TASK_EVENTS_CHANNEL, orjson.dumps(payload).decode()))
+    )
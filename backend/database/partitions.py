@@ -0,0 +1,312 @@
+"""Monthly partitions, retention and archiving for scrape_logs and raw_data.
+
+Both tables are range-partitioned on created_at with one partition per calendar month
+(UTC), named `<table>_pYYYY_MM`, plus a `<table>_default` partition that only catches
+rows outside the prepared range. `ensure_partitions` creates the current month and
+MONTHS_AHEAD months ahead; run it from cron along with `apply_retention`
+(`python maintain.py`) so inserts never land in the default partition.
+
+Retention works on whole partitions: a month older than the table's retention is
+exported to `<archive_dir>/<table>/<partition>.jsonl.gz` (gzip JSON lines, one row per
+line), checked against its row count, detached and dropped. No DELETE runs on the hot
+table, so there is nothing for vacuum to clean up and the hot size is bounded by the
+retention. `restore_partition` loads an archive back into its month.
+
+Databases created before partitioning are converted once with `partition_table`.
+"""
+
+import gzip
+import os
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
+
+import orjson
+from sqlalchemy import Connection, insert, text
+
+from . import models
+from .payload_codec import decode_payload, encode_payload
+
+PARTITIONED_TABLES: Dict[str, type] = {
+    "scrape_logs": models.ScrapeLog,
+    "raw_data": models.RawData,
+}
+
+# months kept in the hot tables, counting the current one
+RETENTION_MONTHS: Dict[str, int] = {"scrape_logs": 3, "raw_data": 12}
+
+MONTHS_AHEAD = 2
+
+_PARTITION_NAME = re.compile(r"^(?P<table>\w+)_p(?P<year>\d{4})_(?P<month>\d{2})$")
+
+
+@dataclass
+class Partition:
+    table: str
+    name: str
+    start: datetime
+    end: datetime
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def month_of(moment: datetime) -> datetime:
+    moment = moment.astimezone(timezone.utc) if moment.tzinfo else moment
+    return datetime(moment.year, moment.month, 1, tzinfo=timezone.utc)
+
+
+def partition_for(table: str, month: datetime) -> Partition:
+    start = month_of(month)
+    return Partition(table, f"{table}_p{start:%Y_%m}", start, _add_months(start, 1))
+
+
+def is_partitioned(conn: Connection, table: str) -> bool:
+    return bool(
+        conn.execute(
+            text(
+                "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"
+            ),
+            {"table": table},
+        ).scalar()
+    )
+
+
+def list_partitions(conn: Connection, table: str) -> List[Partition]:
+    """The monthly partitions attached to `table`, oldest first (the default one excluded)."""
+    names = conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:table)"
+        ),
+        {"table": table},
+    ).scalars()
+    partitions = []
+    for name in names:
+        match = _PARTITION_NAME.match(name)
+        if match and match["table"] == table:
+            month = datetime(int(match["year"]), int(match["month"]), 1, tzinfo=timezone.utc)
+            partitions.append(partition_for(table, month))
+    return sorted(partitions, key=lambda p: p.start)
+
+
+def create_partition(conn: Connection, partition: Partition) -> None:
+    conn.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {partition.name} PARTITION OF {partition.table} "
+            f"FOR VALUES FROM ('{partition.start.isoformat()}') TO ('{partition.end.isoformat()}')"
+        )
+    )
+
+
+def ensure_partitions(
+    conn: Connection,
+    table: str,
+    since: Optional[datetime] = None,
+    months_ahead: int = MONTHS_AHEAD,
+) -> List[Partition]:
+    """Create the monthly partitions from `since` (default: this month) to `months_ahead`.
+
+    A month can only be added while the default partition holds none of its rows, which
+    is why partitions are created ahead of time. Returns the partitions created.
+    """
+    existing = {p.name for p in list_partitions(conn, table)}
+    month = month_of(since or datetime.now(timezone.utc))
+    last = _add_months(month_of(datetime.now(timezone.utc)), months_ahead)
+    created = []
+    while month <= last:
+        partition = partition_for(table, month)
+        if partition.name not in existing:
+            create_partition(conn, partition)
+            created.append(partition)
+        month = _add_months(month, 1)
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT"))
+    return created
+
+
+def partition_table(conn: Connection, table: str) -> int:
+    """Convert an existing plain `table` into the partitioned layout, keeping ids.
+
+    Runs in the caller's transaction and holds an exclusive lock while rows are copied.
+    Foreign keys that pointed at the old table are dropped: a partitioned table can
+    only be referenced through a key that includes created_at. Returns the rows moved.
+    """
+    old = f"{table}_unpartitioned"
+    conn.execute(text(f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE"))
+
+    for referencing, constraint in conn.execute(
+        text(
+            "SELECT conrelid::regclass::text, conname FROM pg_constraint "
+            "WHERE contype = 'f' AND confrelid = to_regclass(:table)"
+        ),
+        {"table": table},
+    ).all():
+        conn.execute(text(f'ALTER TABLE {referencing} DROP CONSTRAINT "{constraint}"'))
+
+    # free the table, constraint, index and sequence names for the partitioned table
+    sequence = conn.execute(
+        text("SELECT pg_get_serial_sequence(:table, 'id')"), {"table": table}
+    ).scalar()
+    conn.execute(text(f"ALTER TABLE {table} RENAME TO {old}"))
+    for constraint in conn.execute(
+        text(
+            "SELECT conname FROM pg_constraint "
+            "WHERE contype = 'f' AND conrelid = to_regclass(:table)"
+        ),
+        {"table": old},
+    ).scalars():
+        conn.execute(text(f'ALTER TABLE {old} DROP CONSTRAINT "{constraint}"'))
+    for index in conn.execute(
+        text("SELECT indexname FROM pg_indexes WHERE tablename = :table"), {"table": old}
+    ).scalars():
+        conn.execute(text(f'ALTER INDEX "{index}" RENAME TO "{index[:50]}_unpartitioned"'))
+    if sequence:
+        conn.execute(text(f"ALTER SEQUENCE {sequence} RENAME TO {old}_id_seq"))
+
+    model = PARTITIONED_TABLES[table]
+    model.__table__.create(bind=conn)
+    oldest = conn.execute(text(f"SELECT min(created_at) FROM {old}")).scalar()
+    ensure_partitions(conn, table, since=oldest)
+
+    columns = [c.name for c in model.__table__.columns]
+    column_list = ", ".join(f'"{c}"' for c in columns)
+    select_list = ", ".join(
+        "coalesce(created_at, now())" if c == "created_at" else f'"{c}"' for c in columns
+    )
+    moved = conn.execute(
+        text(f"INSERT INTO {table} ({column_list}) SELECT {select_list} FROM {old}")
+    ).rowcount
+    conn.execute(
+        text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"coalesce((SELECT max(id) FROM {table}), 0) + 1, false)"
+        )
+    )
+    conn.execute(text(f"DROP TABLE {old}"))
+    return moved
+
+
+def expired_partitions(
+    conn: Connection, table: str, retain_months: int, now: Optional[datetime] = None
+) -> List[Partition]:
+    """Partitions that lie entirely before the `retain_months` most recent months."""
+    cutoff = _add_months(month_of(now or datetime.now(timezone.utc)), 1 - retain_months)
+    return [p for p in list_partitions(conn, table) if p.end <= cutoff]
+
+
+def _rows(conn: Connection, partition: Partition, batch_size: int) -> Iterator[dict]:
+    result = conn.execute(
+        text(f"SELECT * FROM {partition.name} ORDER BY id").execution_options(
+            yield_per=batch_size
+        )
+    )
+    for row in result.mappings():
+        row = dict(row)
+        if "payload_compressed" in row:
+            # archives hold plain JSON whatever the storage setting
+            row["payload"] = decode_payload(row["payload"], row.pop("payload_compressed"))
+        yield row
+
+
+def archive_path(archive_dir: str, partition: Partition) -> str:
+    return os.path.join(archive_dir, partition.table, f"{partition.name}.jsonl.gz")
+
+
+def export_partition(
+    conn: Connection, partition: Partition, archive_dir: str, batch_size: int = 5000
+) -> int:
+    """Stream a partition to its gzip JSON lines archive; returns the rows written.
+
+    Writes to a temporary name first, so a half-written file never looks like an archive.
+    """
+    path = archive_path(archive_dir, partition)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    written = 0
+    with gzip.open(path + ".tmp", "wb", compresslevel=6) as archive:
+        for row in _rows(conn, partition, batch_size):
+            archive.write(orjson.dumps(row) + b"\n")
+            written += 1
+    os.replace(path + ".tmp", path)
+    return written
+
+
+def restore_partition(conn: Connection, path: str, batch_size: int = 5000) -> int:
+    """Load an archive written by `export_partition` back into its month partition.
+
+    The month's partition is recreated if it was dropped; rows keep their ids, so
+    clean rows that reference them by raw_id line up again. The next retention run
+    archives and drops it again unless the retention is raised. Returns the rows loaded.
+    """
+    name = os.path.basename(path).split(".", 1)[0]
+    match = _PARTITION_NAME.match(name)
+    if match is None or match["table"] not in PARTITIONED_TABLES:
+        raise ValueError(f"Not a partition archive: {path}")
+    table = match["table"]
+    month = datetime(int(match["year"]), int(match["month"]), 1, tzinfo=timezone.utc)
+    create_partition(conn, partition_for(table, month))
+
+    stmt = insert(PARTITIONED_TABLES[table].__table__)
+    loaded = 0
+    batch: List[dict] = []
+    with gzip.open(path, "rb") as archive:
+        for line in archive:
+            row = orjson.loads(line)
+            if "payload" in row:
+                row["payload"], row["payload_compressed"] = encode_payload(row["payload"])
+            batch.append(row)
+            if len(batch) >= batch_size:
+                conn.execute(stmt, batch)
+                loaded += len(batch)
+                batch = []
+    if batch:
+        conn.execute(stmt, batch)
+        loaded += len(batch)
+    return loaded
+
+
+def _has_pending_raw_rows(conn: Connection, partition: Partition) -> bool:
+    return bool(
+        conn.execute(
+            text(
+                f"SELECT 1 FROM {partition.name} "
+                "WHERE processed IS FALSE AND error IS NULL LIMIT 1"
+            )
+        ).scalar()
+    )
+
+
+def apply_retention(
+    conn: Connection,
+    table: str,
+    retain_months: int,
+    archive_dir: Optional[str],
+    dry_run: bool = False,
+) -> List[Partition]:
+    """Archive (unless `archive_dir` is None), detach and drop the expired partitions.
+
+    raw_data months that still hold uncleaned rows are kept. Returns the partitions
+    dropped (or that would be, with `dry_run`).
+    """
+    dropped = []
+    for partition in expired_partitions(conn, table, retain_months):
+        if table == "raw_data" and _has_pending_raw_rows(conn, partition):
+            print(f"[retention] keeping {partition.name}: it has rows not cleaned yet")
+            continue
+        if dry_run:
+            dropped.append(partition)
+            continue
+
+        if archive_dir is not None:
+            expected = conn.execute(text(f"SELECT count(*) FROM {partition.name}")).scalar()
+            written = export_partition(conn, partition, archive_dir)
+            if written != expected:
+                raise RuntimeError(
+                    f"Archive of {partition.name} has {written} rows, expected {expected}"
+                )
+        conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {partition.name}"))
+        conn.execute(text(f"DROP TABLE {partition.name}"))
+        dropped.append(partition)
+    return dropped
@@ -0,0 +1,84 @@
+"""Optional compressed storage for raw_data / clean_data payloads.
+
+Payloads are stored in the JSONB `payload` column by default. With
+PAYLOAD_COMPRESSION=zstd (or zlib), payloads whose JSON is at least
+PAYLOAD_COMPRESSION_MIN_BYTES long are stored instead as orjson bytes compressed into
+`payload_compressed`, with `payload` left NULL. The model `payload` properties and the
+repositories decode either form, so callers always see a dict.
+
+Compressed values start with a one-byte codec tag, so rows written under one setting
+stay readable after it changes. zstd needs the optional `zstandard` package; without
+it PAYLOAD_COMPRESSION=zstd falls back to zlib.
+"""
+
+import os
+import threading
+import zlib
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+_ZSTD = b"Z"
+_ZLIB = b"z"
+
+PAYLOAD_COMPRESSION = os.getenv("PAYLOAD_COMPRESSION", "off").strip().lower()
+PAYLOAD_COMPRESSION_MIN_BYTES = int(os.getenv("PAYLOAD_COMPRESSION_MIN_BYTES", "1024"))
+
+if PAYLOAD_COMPRESSION not in ("off", "zstd", "zlib"):
+    raise ValueError(f"Unknown PAYLOAD_COMPRESSION '{PAYLOAD_COMPRESSION}'")
+if PAYLOAD_COMPRESSION == "zstd" and zstandard is None:
+    print("[payload codec] zstandard is not installed, compressing payloads with zlib")
+    PAYLOAD_COMPRESSION = "zlib"
+
+# zstd contexts are not thread-safe, so each thread gets its own
+_zstd = threading.local()
+
+
+def compress_payload(raw: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd payload compression needs the zstandard package")
+        if not hasattr(_zstd, "compressor"):
+            _zstd.compressor = zstandard.ZstdCompressor(level=3)
+        return _ZSTD + _zstd.compressor.compress(raw)
+    return _ZLIB + zlib.compress(raw, 6)
+
+
+def decompress_payload(data: bytes) -> Dict[str, Any]:
+    data = bytes(data)
+    tag, body = data[:1], data[1:]
+    if tag == _ZSTD:
+        if zstandard is None:
+            raise RuntimeError("payload is zstd-compressed; install zstandard to read it")
+        if not hasattr(_zstd, "decompressor"):
+            _zstd.decompressor = zstandard.ZstdDecompressor()
+        return orjson.loads(_zstd.decompressor.decompress(body))
+    if tag == _ZLIB:
+        return orjson.loads(zlib.decompress(body))
+    raise ValueError(f"Unknown payload codec tag {tag!r}")
+
+
+def encode_payload(
+    payload: Dict[str, Any], compression: Optional[str] = None
+) -> Tuple[Optional[Dict[str, Any]], Optional[bytes]]:
+    """(payload, payload_compressed) column values for `payload` under the current setting."""
+    compression = compression or PAYLOAD_COMPRESSION
+    if compression == "off":
+        return payload, None
+    raw = orjson.dumps(payload)
+    if len(raw) < PAYLOAD_COMPRESSION_MIN_BYTES:
+        return payload, None
+    return None, compress_payload(raw, compression)
+
+
+def decode_payload(
+    payload: Optional[Dict[str, Any]], payload_compressed: Optional[bytes]
+) -> Optional[Dict[str, Any]]:
+    if payload_compressed is not None:
+        return decompress_payload(payload_compressed)
+    return payload
@@ -0,0 +1,185 @@
+"""Connection pool instrumentation: checkout latency, utilization and waits.
+
+`db.py` builds the engine with one of the instrumented pool classes below; every
+checkout is then timed into the module-level `pool_metrics`. The numbers are served
+as Prometheus text on `/metrics` (see app.py) and can also be printed periodically
+with `start_pool_logging`.
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import NullPool, Pool, QueuePool
+from sqlalchemy.util import queue as sqla_queue
+
+# upper bounds (seconds) of the checkout latency histogram
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+# a checkout counts as a wait once it spent this long blocked on the idle queue
+WAIT_THRESHOLD = 0.001
+
+
+class PoolMetrics:
+    """Thread-safe counters for connection checkouts, shared by all pools of the process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.wait_sum = 0.0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.bucket_counts = [0] * len(LATENCY_BUCKETS)
+
+    def record(self, latency: float, waited: float, timed_out: bool = False) -> None:
+        """`waited` is the part of `latency` spent blocked until a connection was returned."""
+        with self._lock:
+            self.wait_sum += waited
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.waits += int(waited >= WAIT_THRESHOLD)
+            self.latency_sum += latency
+            self.latency_max = max(self.latency_max, latency)
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if latency <= bound:
+                    self.bucket_counts[i] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = self.waits = self.timeouts = 0
+            self.wait_sum = self.latency_sum = self.latency_max = 0.0
+            self.bucket_counts = [0] * len(LATENCY_BUCKETS)
+
+    def snapshot(self, pool: Optional[Pool] = None) -> Dict[str, float]:
+        with self._lock:
+            stats: Dict[str, float] = {
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "wait_seconds": self.wait_sum,
+                "checkout_latency_avg": self.latency_sum / self.checkouts
+                if self.checkouts
+                else 0.0,
+                "checkout_latency_max": self.latency_max,
+            }
+        if isinstance(pool, QueuePool):
+            capacity = pool.size() + max(pool._max_overflow, 0)
+            stats.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                # QueuePool counts overflow from -size; only connections beyond size matter
+                overflow=max(pool.overflow(), 0),
+                utilization=pool.checkedout() / capacity if capacity else 0.0,
+            )
+        return stats
+
+    def render_prometheus(self, pool: Optional[Pool] = None) -> str:
+        """Render the counters (and current pool state) in Prometheus text format."""
+        stats = self.snapshot(pool)
+        lines = [
+            "# TYPE db_pool_checkouts_total counter",
+            f"db_pool_checkouts_total {stats['checkouts']}",
+            "# TYPE db_pool_waits_total counter",
+            f"db_pool_waits_total {stats['waits']}",
+            "# TYPE db_pool_timeouts_total counter",
+            f"db_pool_timeouts_total {stats['timeouts']}",
+            "# TYPE db_pool_wait_seconds_total counter",
+            f"db_pool_wait_seconds_total {stats['wait_seconds']}",
+            "# TYPE db_pool_checkout_seconds histogram",
+        ]
+        with self._lock:
+            for bound, count in zip(LATENCY_BUCKETS, self.bucket_counts):
+                lines.append(f'db_pool_checkout_seconds_bucket{{le="{bound}"}} {count}')
+            lines.append(f'db_pool_checkout_seconds_bucket{{le="+Inf"}} {self.checkouts}')
+            lines.append(f"db_pool_checkout_seconds_sum {self.latency_sum}")
+            lines.append(f"db_pool_checkout_seconds_count {self.checkouts}")
+        for key in ("size", "checked_out", "checked_in", "overflow", "utilization"):
+            if key in stats:
+                lines.append(f"# TYPE db_pool_{key} gauge")
+                lines.append(f"db_pool_{key} {stats[key]}")
+        return "\n".join(lines) + "\n"
+
+
+pool_metrics = PoolMetrics()
+
+
+class _TimedQueue(sqla_queue.Queue):
+    """QueuePool's idle-connection queue, timing how long each thread blocks in `get`.
+
+    QueuePool only blocks here once no connection is idle and the overflow is used
+    up, so this is the checkout's wait, without the time spent connecting.
+    """
+
+    def __init__(self, maxsize: int = 0, use_lifo: bool = False):
+        super().__init__(maxsize, use_lifo)
+        self._waits = threading.local()
+
+    def get(self, block: bool = True, timeout: Optional[float] = None):
+        start = time.perf_counter()
+        try:
+            return super().get(block, timeout)
+        finally:
+            if block:
+                self._waits.seconds = time.perf_counter() - start
+
+    def pop_wait(self) -> float:
+        """Seconds the calling thread last blocked in `get`, then reset to 0."""
+        seconds = getattr(self._waits, "seconds", 0.0)
+        self._waits.seconds = 0.0
+        return seconds
+
+
+class _TimedCheckoutMixin:
+    """Times `_do_get`, the pool's internal "get me a connection" step, including any wait."""
+
+    def _wait_seconds(self) -> float:
+        return 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()  # type: ignore[misc]
+        except PoolTimeoutError:
+            pool_metrics.record(
+                time.perf_counter() - start, self._wait_seconds(), timed_out=True
+            )
+            raise
+        pool_metrics.record(time.perf_counter() - start, self._wait_seconds())
+        return connection
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    _queue_class = _TimedQueue
+
+    def _wait_seconds(self) -> float:
+        return self._pool.pop_wait()  # type: ignore[attr-defined]
+
+
+class InstrumentedNullPool(_TimedCheckoutMixin, NullPool):
+    """Used with an external pooler (e.g. PgBouncer); latency here is the connect time."""
+
+
+def start_pool_logging(pool_getter, interval: float) -> threading.Thread:
+    """Print a one-line pool summary every `interval` seconds from a daemon thread."""
+
+    def _loop():
+        while True:
+            time.sleep(interval)
+            stats = pool_metrics.snapshot(pool_getter())
+            print(
+                "[db pool] "
+                + " ".join(
+                    f"{key}={value:.4f}" if isinstance(value, float) else f"{key}={value}"
+                    for key, value in stats.items()
+                )
+            )
+
+    thread = threading.Thread(target=_loop, name="db-pool-metrics", daemon=True)
+    thread.start()
+    return thread
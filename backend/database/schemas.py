@@ -48,6 +48,15 @@ class BoardGameOut(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class BoardGameSearchResult(BaseModel):
+    """A ranked name search hit; `score` is higher for better matches."""
+
+    id: int
+    name: str
+    url: Optional[str] = None
+    score: float
+
+
 class RawDataIn(BaseModel):
     source_table: str
     source_id: Optional[int] = None
@@ -91,14 +100,69 @@ class CleanDataOut(BaseModel):
     model_config = {"from_attributes": True}
 
 
-class ScrapeTaskOut(BaseModel):
+class CleanBoardGameIn(BaseModel):
+    id: int
+    raw_id: Optional[int] = None
+    scrape_task_id: Optional[int] = None
+    name: Optional[str] = None
+    url: Optional[str] = None
+    year_released: Optional[int] = None
+    overall_rank: Optional[int] = None
+    thematic_rank: Optional[int] = None
+    avg_rating: Optional[float] = None
+    std_deviation: Optional[float] = None
+    weight: Optional[float] = None
+    no_of_ratings: Optional[int] = None
+    own: Optional[int] = None
+    prev_owned: Optional[int] = None
+    wishlist: Optional[int] = None
+    fans: Optional[int] = None
+    comments: Optional[int] = None
+    page_views: Optional[int] = None
+    all_time_plays: Optional[int] = None
+    this_month: Optional[int] = None
+    for_trade: Optional[int] = None
+    want_in_trade: Optional[int] = None
+    has_parts: Optional[int] = None
+    want_parts: Optional[int] = None
+    official_player_count_min: Optional[int] = None
+    official_player_count_max: Optional[int] = None
+    community_player_count_min: Optional[int] = None
+    community_player_count_max: Optional[int] = None
+    best_player_count_min: Optional[int] = None
+    best_player_count_max: Optional[int] = None
+    designer: Optional[str] = None
+    categories: Optional[List[str]] = None
+    mechanics: Optional[List[str]] = None
+    publishers: Optional[List[str]] = None
+    artists: Optional[List[str]] = None
+    family: Optional[List[str]] = None
+    alternate_names: Optional[List[str]] = None
+    min_price_usd: Optional[float] = None
+    processor_version: Optional[str] = None
+
+
+class CleanBoardGameOut(CleanBoardGameIn):
+    updated_at: Optional[datetime]
+
+    model_config = {"from_attributes": True}
+
+
+class CleanBoardGameFilter(BaseModel):
+    """One server-side filter on a clean_boardgames column, e.g. ("weight", "gt", 3)."""
+
+    column: str
+    op: str
+    value: Any
+
+
+class ScrapeTaskSummary(BaseModel):
+    """The columns the task list shows; ETA is only estimated for running tasks."""
+
     id: int
     name: str
     status: ScrapeStatus
     progress: float
-    current_page: Optional[int]
-    items_processed: Optional[int]
-    message: Optional[str]
     created_at: Optional[datetime]
     last_update: Optional[datetime]
     eta: Optional[str] = None
@@ -120,6 +184,13 @@ class ScrapeTaskOut(BaseModel):
         return self
 
 
+class ScrapeTaskOut(ScrapeTaskSummary):
+    current_page: Optional[int]
+    items_processed: Optional[int]
+    message: Optional[str]
+    last_line_no: int = 0
+
+
 class ScrapeLogLineOut(BaseModel):
     id: int
     task_id: int
@@ -10,9 +10,16 @@ Usage:
 
 The logger will create a `ScrapeTask` and write log lines via `ScrapeLogRepository.append_line` using `get_db_session()`.
 If an exception is raised within the context, the logger will automatically mark the task as failed and log the exception message.
+
+With `buffered=True`, `log` and `update_progress` only queue in memory and a background
+thread writes them every `flush_interval` seconds, or sooner once `max_buffered_lines`
+lines are waiting, via `ScrapeLogRepository.append_lines`. `finish`, `fail` and `__exit__`
+flush whatever is still pending before the final status is written.
 """
 
-from typing import Optional, cast
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, cast
 
 from .database.db import get_db_session
 from .repositories import ScrapeTaskRepository, ScrapeLogRepository
@@ -25,12 +32,28 @@ class ScrapeTaskLogger:
         task_name: Optional[str] = None,
         task_id: Optional[int] = None,
         log_to_console: bool = False,
+        buffered: bool = False,
+        flush_interval: float = 1.0,
+        max_buffered_lines: int = 200,
     ):
         self.task_name = task_name
         self.task_id = task_id
         self._started = False
         self.log_to_console = log_to_console
 
+        self.buffered = buffered
+        self.flush_interval = flush_interval
+        self.max_buffered_lines = max_buffered_lines
+        self._lock = threading.Lock()
+        # serializes flushes, so batches reach the DB in the order they were queued
+        self._flush_lock = threading.Lock()
+        self._pending_lines: List[str] = []
+        self._pending_times: List[datetime] = []
+        self._pending_progress: Dict[str, Any] = {}
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._flusher: Optional[threading.Thread] = None
+
     def console_log(self, message: str) -> None:
         if self.log_to_console:
             print(f"[{self.task_id}]: {message}")
@@ -70,6 +93,15 @@ class ScrapeTaskLogger:
                 # convert to int to avoid SQLAlchemy Column typing leaking through
                 self.task_id = int(cast(int, task.id))
 
+        if self.buffered:
+            self._stopping = False
+            self._flusher = threading.Thread(
+                target=self._flush_loop,
+                name=f"scrape-task-logger-{self.task_id}",
+                daemon=True,
+            )
+            self._flusher.start()
+
         self._started = True
         return int(cast(int, self.task_id))
 
@@ -77,8 +109,16 @@ class ScrapeTaskLogger:
         if self.task_id is None:
             raise ValueError("task_id not set; call start() or provide task_id on init")
 
-        with get_db_session() as session:
-            ScrapeLogRepository.append_line(session, int(self.task_id), text)
+        if self._flusher is not None:
+            with self._lock:
+                self._pending_lines.append(text)
+                self._pending_times.append(datetime.now(timezone.utc))
+                full = len(self._pending_lines) >= self.max_buffered_lines
+            if full:
+                self._wakeup.set()
+        else:
+            with get_db_session() as session:
+                ScrapeLogRepository.append_line(session, int(self.task_id), text)
         self.console_log(text)
 
     def update_progress(
@@ -92,20 +132,80 @@ class ScrapeTaskLogger:
         if self.task_id is None:
             raise ValueError("task_id not set; call start() or provide task_id on init")
 
+        values = dict(
+            progress=progress,
+            status=status,
+            current_page=current_page,
+            items_processed=items_processed,
+            message=message,
+        )
+        if self._flusher is not None:
+            # only the latest value of each field matters, so updates are merged
+            with self._lock:
+                self._pending_progress.update(
+                    {k: v for k, v in values.items() if v is not None}
+                )
+            return
+
         with get_db_session() as session:
-            ScrapeTaskRepository.update_progress(
-                session,
-                int(self.task_id),
-                progress=progress,
-                status=status,
-                current_page=current_page,
-                items_processed=items_processed,
-                message=message,
-            )
+            ScrapeTaskRepository.update_progress(session, int(self.task_id), **values)
+
+    def flush(self) -> None:
+        """Write queued lines and progress now (buffered mode only)."""
+        if self.task_id is None:
+            return
+
+        with self._flush_lock:
+            with self._lock:
+                lines, self._pending_lines = self._pending_lines, []
+                times, self._pending_times = self._pending_times, []
+                progress, self._pending_progress = self._pending_progress, {}
+            if not lines and not progress:
+                return
+
+            try:
+                with get_db_session() as session:
+                    ScrapeLogRepository.append_lines(
+                        session, int(self.task_id), lines, created_at=times
+                    )
+                    if progress:
+                        ScrapeTaskRepository.update_progress(
+                            session, int(self.task_id), **progress
+                        )
+            except Exception:
+                # put the batch back in front of anything queued meanwhile; next flush retries
+                with self._lock:
+                    self._pending_lines[:0] = lines
+                    self._pending_times[:0] = times
+                    self._pending_progress = {**progress, **self._pending_progress}
+                raise
+
+    def close(self) -> None:
+        """Stop the background flusher and write everything still queued."""
+        flusher, self._flusher = self._flusher, None
+        if flusher is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        flusher.join()
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"[{self.task_id}]: final log flush failed: {e}")
+
+    def _flush_loop(self) -> None:
+        while not self._stopping:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"[{self.task_id}]: log flush failed, will retry: {e}")
 
     def finish(self, message: Optional[str] = None) -> None:
         if self.task_id is None:
             return
+        self.close()
         with get_db_session() as session:
             ScrapeTaskRepository.update_progress(
                 session,
@@ -121,6 +221,7 @@ class ScrapeTaskLogger:
     def fail(self, message: Optional[str] = None) -> None:
         if self.task_id is None:
             return
+        self.close()
         with get_db_session() as session:
             ScrapeTaskRepository.update_progress(
                 session,
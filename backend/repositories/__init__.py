@@ -4,6 +4,7 @@ from .scrape_task_repository import ScrapeTaskRepository
 from .scrape_log_repository import ScrapeLogRepository
 from .raw_data_repository import RawDataRepository
 from .clean_data_repository import CleanDataRepository
+from .clean_boardgame_repository import CleanBoardGameRepository
 
 __all__ = [
     "BaseRepository",
@@ -12,4 +13,5 @@ __all__ = [
     "ScrapeLogRepository",
     "RawDataRepository",
     "CleanDataRepository",
+    "CleanBoardGameRepository",
 ]
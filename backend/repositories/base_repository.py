@@ -1,6 +1,39 @@
+from typing import Dict
+
 from psycopg2 import OperationalError
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
 
 
 class BaseRepository:
     # thin helper placeholder for retries / common behavior
     retry_errors = (OperationalError,)
+    _extensions: Dict[str, bool] = {}
+
+    @staticmethod
+    def has_extension(session: Session, name: str) -> bool:
+        """Whether the Postgres extension `name` is installed; looked up once per process."""
+        installed = BaseRepository._extensions.get(name)
+        if installed is None:
+            installed = bool(
+                session.execute(
+                    text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = :name)"),
+                    {"name": name},
+                ).scalar()
+            )
+            BaseRepository._extensions[name] = installed
+        return installed
+
+    @staticmethod
+    def estimated_row_count(session: Session, model) -> int:
+        """Row count from the planner statistics, without scanning the table.
+
+        Falls back to an exact count when the table has never been analyzed.
+        """
+        estimate = session.execute(
+            text("SELECT reltuples FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+            {"table": model.__tablename__},
+        ).scalar()
+        if estimate is not None and estimate >= 0:
+            return int(estimate)
+        return int(session.execute(select(func.count()).select_from(model)).scalar_one())
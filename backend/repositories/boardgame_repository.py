@@ -1,12 +1,32 @@
-from typing import Iterable, List, Optional
-from sqlalchemy import select
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import (
+    and_,
+    case,
+    exists,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+    union_all,
+)
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 import pandas as pd
 
 from .base_repository import BaseRepository
+from .copy_loader import copy_to_temp_table
+from .query_cache import cached, invalidate_on_commit
 from ..database import models, schemas
-from ..database.schemas import BoardGameIn, BoardGameOut
+from ..database.schemas import BoardGameIn, BoardGameOut, BoardGameSearchResult
+
+# Sort keys usable for keyset pagination; each ends in the primary key so it is unique.
+PAGE_SORT_KEYS: Dict[str, Tuple[Any, ...]] = {
+    "id": (models.BoardGame.id,),
+    "name": (models.BoardGame.name, models.BoardGame.id),
+}
 
 
 class BoardGameRepository(BaseRepository):
@@ -21,6 +41,7 @@ class BoardGameRepository(BaseRepository):
             set_={"name": stmt.excluded.name, "url": stmt.excluded.url},
         )
         session.execute(stmt)
+        invalidate_on_commit(session, "boardgames")
 
     @staticmethod
     def bulk_upsert(session: Session, boardgames: Iterable[BoardGameIn]) -> None:
@@ -34,8 +55,43 @@ class BoardGameRepository(BaseRepository):
             set_={"name": stmt.excluded.name, "url": stmt.excluded.url},
         )
         session.execute(stmt)
+        invalidate_on_commit(session, "boardgames")
 
     @staticmethod
+    def copy_upsert(session: Session, boardgames: Iterable[BoardGameIn]) -> int:
+        """Bulk upsert through COPY into a temp table and one INSERT ... SELECT ... ON CONFLICT.
+
+        Rows are streamed, so `boardgames` can be a generator over millions of games.
+        Returns the number of rows loaded.
+        """
+        columns = ["id", "name", "url"]
+        temp, copied = copy_to_temp_table(
+            session,
+            models.BoardGame.__table__,
+            columns,
+            ((bg.id, bg.name, bg.url) for bg in boardgames),
+        )
+        if copied == 0:
+            return 0
+
+        # ON CONFLICT cannot touch the same row twice, so keep the last copied row per id
+        # (ctid follows COPY order in the fresh temp table)
+        latest = (
+            select(temp.c.id, temp.c.name, temp.c.url)
+            .distinct(temp.c.id)
+            .order_by(temp.c.id, literal_column("ctid").desc())
+        )
+        stmt = pg_insert(models.BoardGame).from_select(columns, latest)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[models.BoardGame.id],
+            set_={"name": stmt.excluded.name, "url": stmt.excluded.url},
+        )
+        session.execute(stmt)
+        invalidate_on_commit(session, "boardgames")
+        return copied
+
+    @staticmethod
+    @cached("boardgames", ttl=60)
     def get_by_id(session: Session, boardgame_id: int) -> Optional[BoardGameOut]:
         obj = (
             session.execute(
@@ -57,7 +113,200 @@ class BoardGameRepository(BaseRepository):
         )
         return [BoardGameOut.model_validate(o) for o in objs]
 
+    @staticmethod
+    @cached("boardgames", ttl=30)
+    def get_page_after(
+        session: Session,
+        cursor: Optional[Sequence[Any]] = None,
+        limit: int = 100,
+        sort: str = "id",
+    ) -> List[BoardGameOut]:
+        """Keyset pagination: the `limit` games that sort right after `cursor`.
+
+        `cursor` holds the sort-key values of the last game already shown (see
+        `page_cursor`); None starts at the first game. Unlike OFFSET, the cost does not
+        grow with how deep the page is.
+        """
+        columns = BoardGameRepository._sort_columns(sort)
+        stmt = select(models.BoardGame)
+        if cursor is not None:
+            if not BoardGameRepository.is_valid_cursor(cursor, sort):
+                raise ValueError(f"Cursor {cursor!r} does not match sort key '{sort}'")
+            stmt = stmt.where(tuple_(*columns) > tuple_(*cursor))
+        stmt = stmt.order_by(*columns).limit(limit)
+
+        objs = list(session.execute(stmt).scalars().all())
+        return [BoardGameOut.model_validate(o) for o in objs]
+
+    @staticmethod
+    @cached("boardgames", ttl=30)
+    def get_page_before(
+        session: Session,
+        cursor: Optional[Sequence[Any]] = None,
+        limit: int = 100,
+        sort: str = "id",
+    ) -> List[BoardGameOut]:
+        """The `limit` games that sort right before `cursor`, in ascending order.
+
+        None returns the last page.
+        """
+        columns = BoardGameRepository._sort_columns(sort)
+        stmt = select(models.BoardGame)
+        if cursor is not None:
+            if not BoardGameRepository.is_valid_cursor(cursor, sort):
+                raise ValueError(f"Cursor {cursor!r} does not match sort key '{sort}'")
+            stmt = stmt.where(tuple_(*columns) < tuple_(*cursor))
+        stmt = stmt.order_by(*[c.desc() for c in columns]).limit(limit)
+
+        # Query used DESC+LIMIT to seek backwards; reverse so callers get ascending order.
+        objs = list(reversed(session.execute(stmt).scalars().all()))
+        return [BoardGameOut.model_validate(o) for o in objs]
+
+    @staticmethod
+    def page_cursor(boardgame: BoardGameOut, sort: str = "id") -> List[Any]:
+        """Sort-key values of `boardgame`, to pass as the cursor of the next/previous page."""
+        return [
+            getattr(boardgame, column.key)
+            for column in BoardGameRepository._sort_columns(sort)
+        ]
+
+    @staticmethod
+    def is_valid_cursor(cursor: Sequence[Any], sort: str = "id") -> bool:
+        """Whether `cursor` has one value of the right type per sort column of `sort`."""
+        columns = PAGE_SORT_KEYS.get(sort)
+        if columns is None or len(cursor) != len(columns):
+            return False
+        return all(
+            isinstance(value, column.type.python_type) and not isinstance(value, bool)
+            for value, column in zip(cursor, columns)
+        )
+
+    @staticmethod
+    @cached("boardgames", ttl=60)
+    def estimated_count(session: Session) -> int:
+        return BaseRepository.estimated_row_count(session, models.BoardGame)
+
+    @staticmethod
+    def _sort_columns(sort: str) -> Tuple[Any, ...]:
+        columns = PAGE_SORT_KEYS.get(sort)
+        if columns is None:
+            raise ValueError(f"Unknown boardgames sort key '{sort}'")
+        return columns
+
+    @staticmethod
+    @cached("boardgames", "clean_boardgames", ttl=60)
+    def search(
+        session: Session, query: str, limit: int = 10, threshold: float = 0.5
+    ) -> List[BoardGameSearchResult]:
+        """Fuzzy name search over boardgame names and cleaned alternate names.
+
+        Matches substrings (ILIKE) and near-misses (pg_trgm word similarity of at
+        least `threshold`); both are served by the trigram GIN indexes. Results are
+        ranked by word similarity, with a bonus for substring and prefix matches.
+        Without pg_trgm installed only substring matches are found, ranked by the
+        bonuses alone, and each ILIKE scans its table.
+        """
+        query = query.strip()
+        if not query:
+            return []
+
+        escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        trigram = BaseRepository.has_extension(session, "pg_trgm")
+        if trigram:
+            # `<%`/`%>` use pg_trgm.word_similarity_threshold; scoped to this transaction
+            session.execute(
+                select(
+                    func.set_config(
+                        "pg_trgm.word_similarity_threshold", str(threshold), True
+                    )
+                )
+            )
+
+        def hits(id_column, names_column):
+            score = case(
+                (names_column.ilike(f"{escaped}%", escape="\\"), 1.0), else_=0.0
+            ) + case((names_column.ilike(f"%{escaped}%", escape="\\"), 0.5), else_=0.0)
+            matched = names_column.ilike(f"%{escaped}%", escape="\\")
+            if trigram:
+                score = func.word_similarity(query, names_column) + score
+                matched = or_(matched, names_column.op("%>")(literal(query)))
+            return select(id_column.label("id"), score.label("score")).where(matched)
+
+        clean = models.CleanBoardGame
+        matches = union_all(
+            hits(models.BoardGame.id, models.BoardGame.name),
+            hits(clean.id, clean.search_names),
+        ).subquery()
+        best = (
+            select(matches.c.id, func.max(matches.c.score).label("score"))
+            .group_by(matches.c.id)
+            .order_by(func.max(matches.c.score).desc(), matches.c.id)
+            .limit(limit)
+            .subquery()
+        )
+        stmt = (
+            select(
+                best.c.id,
+                func.coalesce(models.BoardGame.name, clean.name).label("name"),
+                func.coalesce(models.BoardGame.url, clean.url).label("url"),
+                best.c.score,
+            )
+            .outerjoin(models.BoardGame, models.BoardGame.id == best.c.id)
+            .outerjoin(clean, clean.id == best.c.id)
+            .order_by(best.c.score.desc(), best.c.id)
+        )
+        return [
+            BoardGameSearchResult(
+                id=row.id, name=row.name or str(row.id), url=row.url, score=row.score
+            )
+            for row in session.execute(stmt)
+        ]
+
     @staticmethod
     def get_all(session: Session) -> List[BoardGameOut]:
         objs = list(session.execute(select(models.BoardGame)).scalars().all())
         return [BoardGameOut.model_validate(o) for o in objs]
+
+    @staticmethod
+    def get_scrape_queue(
+        session: Session,
+        task_id: Optional[int] = None,
+        fresh_since: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        fresh_task_name: str = "scrape_boardgames_info",
+    ) -> List[BoardGameOut]:
+        """Games still to scrape, by id: those with no raw row from task `task_id` and
+        none created since `fresh_since` by a `fresh_task_name` task. Rows written by
+        other tasks (re-extraction from snapshots) do not make a game fresh.
+
+        One anti-join (NOT EXISTS) in the database, so a resumed task skips the games it
+        already stored without loading them into Python; Postgres answers it with a hash
+        anti join over the task's raw rows and those created since `fresh_since`.
+        """
+        done = []
+        if task_id is not None:
+            done.append(models.RawData.scrape_task_id == task_id)
+        if fresh_since is not None:
+            done.append(
+                and_(
+                    models.RawData.created_at >= fresh_since,
+                    models.RawData.scrape_task_id.in_(
+                        select(models.ScrapeTask.id).where(
+                            models.ScrapeTask.name == fresh_task_name
+                        )
+                    ),
+                )
+            )
+
+        stmt = select(models.BoardGame).order_by(models.BoardGame.id)
+        if done:
+            stmt = stmt.where(
+                ~exists().where(
+                    models.RawData.source_table == "boardgames",
+                    models.RawData.source_id == models.BoardGame.id,
+                    or_(*done),
+                )
+            )
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return [BoardGameOut.model_validate(o) for o in session.execute(stmt).scalars()]
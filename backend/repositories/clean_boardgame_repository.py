@@ -0,0 +1,165 @@
+import operator
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import ARRAY, String, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from .base_repository import BaseRepository
+from .query_cache import cached, invalidate_on_commit
+from ..database import models
+from ..database.schemas import CleanBoardGameFilter, CleanBoardGameIn, CleanBoardGameOut
+
+
+def _contains(column, value):
+    # arrays use @> (GIN indexed), text columns a case-insensitive substring match
+    if isinstance(column.type, ARRAY):
+        return column.contains([value])
+    return column.icontains(value, autoescape=True)
+
+
+def _search_names(name: Optional[str], alternate_names: Optional[Sequence[str]]) -> Optional[str]:
+    """Name plus alternate names, one per line: the text the trigram search indexes."""
+    names = [n for n in [name, *(alternate_names or [])] if n]
+    return "\n".join(names) if names else None
+
+
+_FILTER_OPERATORS: Dict[str, Callable[[Any, Any], Any]] = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "lt": operator.lt,
+    "le": operator.le,
+    "gt": operator.gt,
+    "ge": operator.ge,
+    "contains": _contains,
+}
+
+
+class CleanBoardGameRepository(BaseRepository):
+    @staticmethod
+    def bulk_upsert(session: Session, boardgames: Iterable[CleanBoardGameIn]) -> None:
+        """Insert or replace typed rows with one statement.
+
+        A row is only replaced by data from the same or a newer raw row, so cleaning
+        an old scrape after a newer one never moves a game back in time.
+        """
+        # ON CONFLICT cannot touch the same row twice, so keep the newest row per game
+        latest: Dict[int, Dict[str, Any]] = {}
+        for bg in boardgames:
+            current = latest.get(bg.id)
+            if current is None or (current["raw_id"] or 0) <= (bg.raw_id or 0):
+                row = bg.model_dump()
+                row["search_names"] = _search_names(bg.name, bg.alternate_names)
+                latest[bg.id] = row
+        if not latest:
+            return
+
+        stmt = pg_insert(models.CleanBoardGame)
+        update_columns: Dict[Any, Any] = {
+            column: stmt.excluded[column.name]
+            for column in models.CleanBoardGame.__table__.columns
+            if column.name not in ("id", "updated_at")
+        }
+        update_columns[models.CleanBoardGame.updated_at] = func.now()
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[models.CleanBoardGame.id],
+            set_=update_columns,
+            where=func.coalesce(models.CleanBoardGame.raw_id, 0)
+            <= func.coalesce(stmt.excluded.raw_id_fk, 0),
+        )
+        # executemany form: the statement compiles once (cached) and is still sent as a
+        # single multi-row INSERT per batch via SQLAlchemy's insertmanyvalues. render_nulls
+        # keeps rows with different None columns in the same batch.
+        session.execute(
+            stmt, list(latest.values()), execution_options={"render_nulls": True}
+        )
+        invalidate_on_commit(session, "clean_boardgames")
+
+    @staticmethod
+    def backfill_search_names(session: Session) -> int:
+        """Fill `search_names` for rows written before the column existed."""
+        stmt = (
+            update(models.CleanBoardGame)
+            .where(models.CleanBoardGame.search_names.is_(None))
+            .values(
+                search_names=func.nullif(
+                    func.concat_ws(
+                        "\n",
+                        models.CleanBoardGame.name,
+                        func.array_to_string(models.CleanBoardGame.alternate_names, "\n"),
+                    ),
+                    "",
+                )
+            )
+            .execution_options(synchronize_session=False)
+        )
+        invalidate_on_commit(session, "clean_boardgames")
+        return session.execute(stmt).rowcount
+
+    @staticmethod
+    def get_by_id(session: Session, boardgame_id: int) -> Optional[CleanBoardGameOut]:
+        obj = session.get(models.CleanBoardGame, boardgame_id)
+        return CleanBoardGameOut.model_validate(obj) if obj is not None else None
+
+    @staticmethod
+    @cached("clean_boardgames", ttl=30)
+    def query(
+        session: Session,
+        filters: Sequence[CleanBoardGameFilter] = (),
+        sort_by: Sequence[Tuple[str, bool]] = (),
+        skip: int = 0,
+        take: int = 100,
+    ) -> List[CleanBoardGameOut]:
+        """Filter, sort and page games in SQL.
+
+        `sort_by` holds (column, descending) pairs; `id` is always appended as a tie-breaker
+        so pages are stable.
+        """
+        stmt = select(models.CleanBoardGame).where(
+            *CleanBoardGameRepository._where(filters)
+        )
+        for column_name, descending in sort_by:
+            column = CleanBoardGameRepository._column(column_name)
+            stmt = stmt.order_by(
+                column.desc().nulls_last() if descending else column.asc().nulls_last()
+            )
+        stmt = stmt.order_by(models.CleanBoardGame.id).offset(skip).limit(take)
+
+        objs = list(session.execute(stmt).scalars().all())
+        return [CleanBoardGameOut.model_validate(o) for o in objs]
+
+    @staticmethod
+    @cached("clean_boardgames", ttl=30)
+    def count(session: Session, filters: Sequence[CleanBoardGameFilter] = ()) -> int:
+        stmt = (
+            select(func.count())
+            .select_from(models.CleanBoardGame)
+            .where(*CleanBoardGameRepository._where(filters))
+        )
+        return int(session.execute(stmt).scalar_one())
+
+    @staticmethod
+    @cached("clean_boardgames", ttl=60)
+    def estimated_count(session: Session) -> int:
+        return BaseRepository.estimated_row_count(session, models.CleanBoardGame)
+
+    @staticmethod
+    def _column(name: str):
+        column = models.CleanBoardGame.__table__.columns.get(name)
+        if column is None:
+            raise ValueError(f"Unknown clean_boardgames column '{name}'")
+        return column
+
+    @staticmethod
+    def _where(filters: Sequence[CleanBoardGameFilter]) -> list:
+        clauses = []
+        for f in filters:
+            op = _FILTER_OPERATORS.get(f.op)
+            if op is None:
+                raise ValueError(f"Unknown filter operator '{f.op}'")
+            column = CleanBoardGameRepository._column(f.column)
+            if isinstance(column.type, ARRAY) and f.op != "contains":
+                raise ValueError(f"Array column '{f.column}' only supports 'contains'")
+            if f.op == "contains" and not isinstance(column.type, (ARRAY, String)):
+                raise ValueError(f"'contains' needs a text column, not '{f.column}'")
+            clauses.append(op(column, f.value))
+        return clauses
@@ -1,9 +1,12 @@
-from typing import Any, List, Optional, Dict
+from typing import Any, Iterator, List, Optional, Dict, Sequence, Tuple
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
-from sqlalchemy import select, update
+from sqlalchemy import func, insert, select, update
 
 from .base_repository import BaseRepository
+from .query_cache import cached, invalidate_on_commit
 from ..database import models, schemas
+from ..database.payload_codec import encode_payload
 from ..database.schemas import CleanDataIn, CleanDataOut
 
 
@@ -23,7 +26,164 @@ class CleanDataRepository(BaseRepository):
         session.add(clean)
         session.flush()
         session.refresh(clean)
-        return CleanDataOut.model_validate(clean)
+        out = CleanDataOut.model_validate(clean)
+        CleanDataRepository._upsert_current(
+            session,
+            [
+                {
+                    **out.model_dump(exclude={"payload"}),
+                    "payload_json": clean.payload_json,
+                    "payload_compressed": clean.payload_compressed,
+                }
+            ],
+        )
+        return out
+
+    @staticmethod
+    def bulk_create(
+        session: Session, rows: Sequence[Tuple[int, CleanDataIn]]
+    ) -> List[int]:
+        """Insert many (raw_id, CleanDataIn) pairs as a multi-row INSERT and return their ids."""
+        clean_dicts = []
+        for raw_id, clean_in in rows:
+            payload_json, payload_compressed = encode_payload(clean_in.payload)
+            clean_dicts.append(
+                {
+                    "raw_id": raw_id,
+                    "source_table": clean_in.source_table,
+                    "source_id": clean_in.source_id,
+                    "scrape_task_id": clean_in.scrape_task_id,
+                    "payload_json": payload_json,
+                    "payload_compressed": payload_compressed,
+                    "processor_version": clean_in.processor_version,
+                }
+            )
+        if not clean_dicts:
+            return []
+
+        # executemany form compiles once and is sent as one multi-row INSERT (insertmanyvalues);
+        # render_nulls keeps rows with different None columns in the same batch
+        clean_ids = list(
+            session.scalars(
+                insert(models.CleanData).returning(
+                    models.CleanData.id, sort_by_parameter_order=True
+                ),
+                clean_dicts,
+                execution_options={"render_nulls": True},
+            ).all()
+        )
+
+        for clean_id, clean_dict in zip(clean_ids, clean_dicts):
+            clean_dict["id"] = clean_id
+        CleanDataRepository._upsert_current(session, clean_dicts)
+        return clean_ids
+
+    @staticmethod
+    def _upsert_current(session: Session, clean_dicts: List[Dict[str, Any]]) -> None:
+        """Point clean_data_current at these rows unless it already holds a newer raw row."""
+        latest: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        for clean in clean_dicts:
+            if clean["source_id"] is None or clean["raw_id"] is None:
+                continue
+            key = (clean["source_table"], clean["source_id"])
+            current = latest.get(key)
+            if current is None or (current["raw_id"], current["clean_id"]) <= (
+                clean["raw_id"],
+                clean["id"],
+            ):
+                latest[key] = {
+                    "source_table": clean["source_table"],
+                    "source_id": clean["source_id"],
+                    "clean_id": clean["id"],
+                    "raw_id": clean["raw_id"],
+                    "scrape_task_id": clean["scrape_task_id"],
+                    "payload_json": clean["payload_json"],
+                    "payload_compressed": clean["payload_compressed"],
+                    "processor_version": clean["processor_version"],
+                    "error": clean.get("error"),
+                }
+        if not latest:
+            return
+
+        stmt = pg_insert(models.CleanDataCurrent)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                models.CleanDataCurrent.source_table,
+                models.CleanDataCurrent.source_id,
+            ],
+            set_={
+                models.CleanDataCurrent.clean_id: stmt.excluded.clean_id_fk,
+                models.CleanDataCurrent.raw_id: stmt.excluded.raw_id_fk,
+                models.CleanDataCurrent.scrape_task_id: stmt.excluded.scrape_task_id,
+                models.CleanDataCurrent.payload_json: stmt.excluded.payload,
+                models.CleanDataCurrent.payload_compressed: stmt.excluded.payload_compressed,
+                models.CleanDataCurrent.processor_version: stmt.excluded.processor_version,
+                models.CleanDataCurrent.error: stmt.excluded.error,
+                models.CleanDataCurrent.created_at: func.now(),
+            },
+            where=models.CleanDataCurrent.raw_id <= stmt.excluded.raw_id_fk,
+        )
+        session.execute(
+            stmt, list(latest.values()), execution_options={"render_nulls": True}
+        )
+        invalidate_on_commit(session, "clean_data")
+
+    @staticmethod
+    def refresh_current(session: Session) -> None:
+        """Rebuild clean_data_current from the full clean_data history in one statement.
+
+        Only needed to backfill; regular writes keep the snapshot current.
+        """
+        latest = (
+            select(
+                models.CleanData.source_table,
+                models.CleanData.source_id,
+                models.CleanData.id,
+                models.CleanData.raw_id,
+                models.CleanData.scrape_task_id,
+                models.CleanData.payload_json,
+                models.CleanData.payload_compressed,
+                models.CleanData.processor_version,
+                models.CleanData.error,
+            )
+            .where(models.CleanData.source_id.is_not(None))
+            .distinct(models.CleanData.source_table, models.CleanData.source_id)
+            .order_by(
+                models.CleanData.source_table,
+                models.CleanData.source_id,
+                models.CleanData.raw_id.desc(),
+                models.CleanData.id.desc(),
+            )
+        )
+        stmt = pg_insert(models.CleanDataCurrent).from_select(
+            [
+                "source_table",
+                "source_id",
+                "clean_id_fk",
+                "raw_id_fk",
+                "scrape_task_id",
+                "payload",
+                "payload_compressed",
+                "processor_version",
+                "error",
+            ],
+            latest,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["source_table", "source_id"],
+            set_={
+                "clean_id_fk": stmt.excluded.clean_id_fk,
+                "raw_id_fk": stmt.excluded.raw_id_fk,
+                "scrape_task_id": stmt.excluded.scrape_task_id,
+                "payload": stmt.excluded.payload,
+                "payload_compressed": stmt.excluded.payload_compressed,
+                "processor_version": stmt.excluded.processor_version,
+                "error": stmt.excluded.error,
+                "created_at": func.now(),
+            },
+        )
+        session.execute(stmt)
+        invalidate_on_commit(session, "clean_data")
 
     @staticmethod
     def get_by_id(session: Session, clean_id: int) -> Optional[CleanDataOut]:
@@ -31,20 +191,56 @@ class CleanDataRepository(BaseRepository):
         return CleanDataOut.model_validate(obj) if obj is not None else None
 
     @staticmethod
+    @cached("clean_data", ttl=60)
     def get_by_source_id_and_table(
         session: Session, source_table: str, source_id: int
     ) -> Optional[CleanDataOut]:
+        """Latest clean row for a source, read from the clean_data_current snapshot."""
+        obj = session.get(models.CleanDataCurrent, (source_table, source_id))
+        return CleanDataRepository._current_out(obj) if obj is not None else None
+
+    @staticmethod
+    def get_current_by_source_table(
+        session: Session, source_table: str, skip: int = 0, take: int = 100
+    ) -> List[CleanDataOut]:
+        """One latest clean row per source, paged by source_id."""
         stmt = (
-            select(models.CleanData)
-            .where(
-                (models.CleanData.source_table == source_table)
-                & (models.CleanData.source_id == source_id)
-            )
-            .order_by(models.CleanData.created_at.desc())
-            .limit(1)
+            select(models.CleanDataCurrent)
+            .where(models.CleanDataCurrent.source_table == source_table)
+            .order_by(models.CleanDataCurrent.source_id)
+            .offset(skip)
+            .limit(take)
+        )
+        objs = list(session.execute(stmt).scalars().all())
+        return [CleanDataRepository._current_out(o) for o in objs]
+
+    @staticmethod
+    def iter_current_by_source_table(
+        session: Session, source_table: str, batch_size: int = 1000
+    ) -> Iterator[List[CleanDataOut]]:
+        """Stream the whole snapshot for a source table in batches (server-side cursor)."""
+        stmt = (
+            select(models.CleanDataCurrent)
+            .where(models.CleanDataCurrent.source_table == source_table)
+            .order_by(models.CleanDataCurrent.source_id)
+            .execution_options(yield_per=batch_size)
+        )
+        for partition in session.execute(stmt).scalars().partitions():
+            yield [CleanDataRepository._current_out(o) for o in partition]
+
+    @staticmethod
+    def _current_out(obj: models.CleanDataCurrent) -> CleanDataOut:
+        return CleanDataOut(
+            id=obj.clean_id,
+            raw_id=obj.raw_id,
+            source_table=obj.source_table,
+            source_id=obj.source_id,
+            scrape_task_id=obj.scrape_task_id,
+            payload=obj.payload,
+            processor_version=obj.processor_version,
+            error=obj.error,
+            created_at=obj.created_at,
         )
-        obj = session.execute(stmt).scalars().first()
-        return CleanDataOut.model_validate(obj) if obj is not None else None
 
     @staticmethod
     def get_by_raw_id(session: Session, raw_id: int) -> List[CleanDataOut]:
@@ -66,16 +262,9 @@ class CleanDataRepository(BaseRepository):
     def get_by_source(
         session: Session, source_table: str, source_id: int
     ) -> Optional[CleanDataOut]:
-        stmt = (
-            select(models.CleanData)
-            .where(
-                (models.CleanData.source_table == source_table)
-                & (models.CleanData.source_id == source_id)
-            )
-            .limit(1)
+        return CleanDataRepository.get_by_source_id_and_table(
+            session, source_table, source_id
         )
-        obj = session.execute(stmt).scalars().first()
-        return CleanDataOut.model_validate(obj) if obj is not None else None
 
     @staticmethod
     def mark_error(
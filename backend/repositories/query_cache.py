@@ -0,0 +1,291 @@
+"""Short-TTL cache for read-only repository queries.
+
+Repository reads that Dash callbacks repeat for every tab and user are wrapped with
+`cached`, e.g.::
+
+    @staticmethod
+    @cached("boardgames", ttl=30)
+    def get_by_id(session, boardgame_id): ...
+
+The cache key is the query name plus the arguments after the session. Entries expire
+after their TTL and the least recently used ones are evicted once the cache holds
+`max_entries`. Writes call `invalidate_on_commit(session, "boardgames")`; the entries
+tagged with those namespaces are dropped when the transaction commits (not before, so a
+concurrent reader cannot re-cache the old rows).
+
+QUERY_CACHE selects the store:
+    local   (default) a dict in this process; every gunicorn worker has its own
+    shared  a SQLite file (QUERY_CACHE_PATH) shared by all processes on the host, so
+            one worker's miss warms the others and a write by the scraper or the
+            cleaning pipeline (separate processes) invalidates the web workers' entries
+    off     no caching
+In local mode writes from other processes are not seen until the TTL runs out, except
+for scrape tasks: `TaskEventHub` invalidates them when it hears their notifications.
+
+Hit and miss counters per query are served on `/metrics` (see app.py).
+"""
+
+import functools
+import os
+import pickle
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# cached values are read back as-is; None results (e.g. unknown id) are cached too
+_MISSING = object()
+
+_PENDING_KEY = "query_cache_invalidate"
+
+
+class LocalCacheStore:
+    """In-process LRU dict of key -> (expires_at, namespaces, value)."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Tuple[str, ...], Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def set(self, key: str, namespaces: Tuple[str, ...], value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, namespaces, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, namespaces: Iterable[str]) -> None:
+        namespaces = set(namespaces)
+        with self._lock:
+            stale = [k for k, e in self._entries.items() if namespaces.intersection(e[1])]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SqliteCacheStore:
+    """LRU table in a SQLite file, shared by every process that opens the same path.
+
+    Values are pickled. Each thread (and each forked worker) uses its own connection.
+    """
+
+    def __init__(self, path: str, max_entries: int = 1024):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY, namespaces TEXT NOT NULL,"
+                " expires_at REAL NOT NULL, used_at REAL NOT NULL, value BLOB NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS ix_entries_used_at ON entries (used_at)"
+            )
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def get(self, key: str) -> Any:
+        connection = self._connection()
+        now = time.time()
+        row = connection.execute(
+            "SELECT value FROM entries WHERE key = ? AND expires_at > ?", (key, now)
+        ).fetchone()
+        if row is None:
+            return _MISSING
+        connection.execute("UPDATE entries SET used_at = ? WHERE key = ?", (now, key))
+        return pickle.loads(row[0])
+
+    def set(self, key: str, namespaces: Tuple[str, ...], value: Any, ttl: float) -> None:
+        connection = self._connection()
+        now = time.time()
+        # namespaces stored as "|a|b|" so one can be matched with LIKE '%|a|%'
+        connection.execute(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+            (
+                key,
+                "|" + "|".join(namespaces) + "|",
+                now + ttl,
+                now,
+                pickle.dumps(value, pickle.HIGHEST_PROTOCOL),
+            ),
+        )
+        connection.execute(
+            "DELETE FROM entries WHERE expires_at <= ? OR key IN ("
+            " SELECT key FROM entries ORDER BY used_at"
+            " LIMIT max((SELECT count(*) FROM entries) - ?, 0))",
+            (now, self.max_entries),
+        )
+
+    def invalidate(self, namespaces: Iterable[str]) -> None:
+        connection = self._connection()
+        for namespace in namespaces:
+            connection.execute(
+                "DELETE FROM entries WHERE namespaces LIKE ?", (f"%|{namespace}|%",)
+            )
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM entries")
+
+
+class QueryCache:
+    def __init__(self, store=None):
+        # store=None disables caching; the counters still count misses
+        self.store = store
+        self._lock = threading.Lock()
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self.errors = 0
+
+    @classmethod
+    def from_env(cls) -> "QueryCache":
+        mode = os.getenv("QUERY_CACHE", "local").strip().lower()
+        max_entries = int(os.getenv("QUERY_CACHE_MAX_ENTRIES", "1024"))
+        if mode == "off":
+            return cls(None)
+        if mode == "shared":
+            path = os.getenv(
+                "QUERY_CACHE_PATH",
+                os.path.join(tempfile.gettempdir(), "bgg_query_cache.sqlite3"),
+            )
+            return cls(SqliteCacheStore(path, max_entries))
+        if mode == "local":
+            return cls(LocalCacheStore(max_entries))
+        raise ValueError(f"Unknown QUERY_CACHE mode '{mode}'")
+
+    def get_or_load(
+        self,
+        name: str,
+        key: str,
+        namespaces: Tuple[str, ...],
+        ttl: float,
+        load: Callable[[], Any],
+    ) -> Any:
+        value = _MISSING
+        if self.store is not None:
+            try:
+                value = self.store.get(key)
+            except sqlite3.Error as e:
+                # a broken cache must never break reads
+                self._count_error(e)
+        self._count(self.hits if value is not _MISSING else self.misses, name)
+        if value is not _MISSING:
+            return value
+
+        value = load()
+        if self.store is not None:
+            try:
+                self.store.set(key, namespaces, value, ttl)
+            except sqlite3.Error as e:
+                self._count_error(e)
+        return value
+
+    def invalidate(self, *namespaces: str) -> None:
+        if self.store is None or not namespaces:
+            return
+        try:
+            self.store.invalidate(namespaces)
+        except sqlite3.Error as e:
+            self._count_error(e)
+
+    def clear(self) -> None:
+        if self.store is not None:
+            self.store.clear()
+        with self._lock:
+            self.hits.clear()
+            self.misses.clear()
+            self.errors = 0
+
+    def _count(self, counter: Dict[str, int], name: str) -> None:
+        with self._lock:
+            counter[name] = counter.get(name, 0) + 1
+
+    def _count_error(self, error: Exception) -> None:
+        with self._lock:
+            self.errors += 1
+        print(f"[query cache] {error}")
+
+    def render_prometheus(self) -> str:
+        """Per-query hit and miss counters in Prometheus text format (this process only)."""
+        with self._lock:
+            hits, misses, errors = dict(self.hits), dict(self.misses), self.errors
+        lines = ["# TYPE query_cache_hits_total counter"]
+        lines += [f'query_cache_hits_total{{query="{q}"}} {n}' for q, n in sorted(hits.items())]
+        lines.append("# TYPE query_cache_misses_total counter")
+        lines += [
+            f'query_cache_misses_total{{query="{q}"}} {n}' for q, n in sorted(misses.items())
+        ]
+        lines += ["# TYPE query_cache_errors_total counter", f"query_cache_errors_total {errors}"]
+        return "\n".join(lines) + "\n"
+
+
+query_cache = QueryCache.from_env()
+
+
+def cached(*namespaces: str, ttl: float = 30.0):
+    """Cache a repository read `fn(session, *args, **kwargs)` for `ttl` seconds.
+
+    The entry is tagged with `namespaces` (the tables it reads) for invalidation.
+    `fn.uncached` calls the query directly, for callers that must see the latest rows.
+    """
+
+    def decorator(fn):
+        name = fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(session: Session, *args, **kwargs):
+            if session.info.get(_PENDING_KEY, set()).intersection(namespaces):
+                # this transaction wrote those tables: read its own writes
+                return fn(session, *args, **kwargs)
+            key = f"{name}:{args!r}:{sorted(kwargs.items())!r}"
+            return query_cache.get_or_load(
+                name, key, namespaces, ttl, lambda: fn(session, *args, **kwargs)
+            )
+
+        wrapper.uncached = fn
+        return wrapper
+
+    return decorator
+
+
+def invalidate_on_commit(session: Session, *namespaces: str) -> None:
+    """Drop cached entries of these namespaces once `session` commits."""
+    session.info.setdefault(_PENDING_KEY, set()).update(namespaces)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    namespaces: Optional[set] = session.info.pop(_PENDING_KEY, None)
+    if namespaces:
+        query_cache.invalidate(*namespaces)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -1,12 +1,25 @@
-from typing import Any, List, Optional, Dict
+from typing import Any, Iterable, Iterator, List, NamedTuple, Optional, Dict, Sequence
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Session
-from sqlalchemy import select, update
+from sqlalchemy import ColumnElement, Integer, Row, any_, bindparam, insert, select, update
 
 from .base_repository import BaseRepository
+from .copy_loader import copy_to_temp_table
 from ..database import models, schemas
+from ..database.payload_codec import decode_payload, encode_payload
 from ..database.schemas import RawDataIn, RawDataOut
 
 
+class RawRow(NamedTuple):
+    """A raw row as handed to the cleaning pipeline, with its payload decoded."""
+
+    id: int
+    source_table: str
+    source_id: Optional[int]
+    scrape_task_id: Optional[int]
+    payload: Dict[str, Any]
+
+
 class RawDataRepository(BaseRepository):
     @staticmethod
     def create(session: Session, raw_in: RawDataIn) -> RawDataOut:
@@ -22,9 +35,52 @@ class RawDataRepository(BaseRepository):
         session.refresh(raw)
         return RawDataOut.model_validate(raw)
 
+    @staticmethod
+    def copy_insert(session: Session, raws: Iterable[RawDataIn]) -> int:
+        """Bulk insert through COPY into a temp table and one INSERT ... SELECT.
+
+        raw_data is append-only with generated ids, so there is nothing to merge on;
+        rows are streamed, so `raws` can be a generator. Returns the number of rows loaded.
+        """
+        columns = [
+            "source_table",
+            "source_id",
+            "scrape_task_id",
+            "payload",
+            "payload_compressed",
+            "processor_version",
+        ]
+        temp, copied = copy_to_temp_table(
+            session,
+            models.RawData.__table__,
+            columns,
+            (
+                (
+                    raw.source_table,
+                    raw.source_id,
+                    raw.scrape_task_id,
+                    *encode_payload(raw.payload),
+                    raw.processor_version,
+                )
+                for raw in raws
+            ),
+        )
+        if copied == 0:
+            return 0
+
+        session.execute(
+            insert(models.RawData).from_select(
+                columns, select(*[temp.c[name] for name in columns])
+            )
+        )
+        return copied
+
     @staticmethod
     def get_by_id(session: Session, raw_id: int) -> Optional[RawDataOut]:
-        raw = session.get(models.RawData, raw_id)
+        # the primary key is (id, created_at); ids are still unique
+        raw = session.execute(
+            select(models.RawData).where(models.RawData.id == raw_id)
+        ).scalar_one_or_none()
         return RawDataOut.model_validate(raw) if raw is not None else None
 
     @staticmethod
@@ -37,6 +93,110 @@ class RawDataRepository(BaseRepository):
         objs = list(session.execute(stmt).scalars().all())
         return [RawDataOut.model_validate(o) for o in objs]
 
+    @staticmethod
+    def iter_by_scrape_task_id(
+        session: Session, scrape_task_id: int, batch_size: int = 1000
+    ) -> Iterator[List[RawRow]]:
+        """Stream a task's rows in batches through a server-side cursor.
+
+        Yields lists of at most `batch_size` lightweight rows with `id`, `source_table`,
+        `source_id`, `scrape_task_id` and `payload` attributes, so memory stays bounded
+        by the batch size rather than the task size.
+        """
+        return RawDataRepository._iter_rows(
+            session, models.RawData.scrape_task_id == scrape_task_id, batch_size
+        )
+
+    @staticmethod
+    def iter_by_source_table(
+        session: Session, source_table: str, batch_size: int = 1000
+    ) -> Iterator[List[RawRow]]:
+        """Streaming counterpart of `get_by_source_table`, see `iter_by_scrape_task_id`."""
+        return RawDataRepository._iter_rows(
+            session, models.RawData.source_table == source_table, batch_size
+        )
+
+    @staticmethod
+    def claim_pending(
+        session: Session,
+        source_table: str,
+        processor_version: Optional[str] = None,
+        limit: int = 500,
+    ) -> List[RawRow]:
+        """Lock and return up to `limit` rows waiting to be (re)processed.
+
+        A row is pending when it is unprocessed and has no error, or, if
+        `processor_version` is given, when it was handled by a different version.
+        Uses `SELECT ... FOR UPDATE SKIP LOCKED`, so concurrent workers (in any process
+        or on any machine) never claim the same row. The locks are held until the
+        caller's transaction ends.
+
+        Unprocessed rows are claimed first, by an index scan of ix_raw_data_pending;
+        only when those run short are stale-version rows claimed, through the
+        processor_version index. One query ORing both conditions can use neither index.
+        """
+        unprocessed = models.RawData.processed.is_(False) & models.RawData.error.is_(None)
+        claimed = RawDataRepository._claim(
+            session, (models.RawData.source_table == source_table) & unprocessed, limit
+        )
+        if processor_version is None or len(claimed) >= limit:
+            return claimed
+
+        # two range conditions instead of `<>`, so Postgres ORs two index range scans;
+        # unprocessed rows were all claimed above (SKIP LOCKED does not skip our own
+        # locks, so they must be excluded here) or are locked by another worker
+        stale = (
+            (models.RawData.source_table == source_table)
+            & (
+                (models.RawData.processor_version < processor_version)
+                | (models.RawData.processor_version > processor_version)
+            )
+            & ~unprocessed
+        )
+        return claimed + RawDataRepository._claim(session, stale, limit - len(claimed))
+
+    @staticmethod
+    def _claim(session: Session, where: ColumnElement[bool], limit: int) -> List[RawRow]:
+        stmt = (
+            select(*RawDataRepository._row_columns())
+            .where(where)
+            .order_by(models.RawData.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return RawDataRepository._decode_rows(session.execute(stmt).all())
+
+    @staticmethod
+    def _row_columns():
+        return (
+            models.RawData.id,
+            models.RawData.source_table,
+            models.RawData.source_id,
+            models.RawData.scrape_task_id,
+            models.RawData.payload_json,
+            models.RawData.payload_compressed,
+        )
+
+    @staticmethod
+    def _decode_rows(rows: Iterable[Row]) -> List[RawRow]:
+        return [
+            RawRow(id, source_table, source_id, scrape_task_id, decode_payload(json, compressed))
+            for id, source_table, source_id, scrape_task_id, json, compressed in rows
+        ]
+
+    @staticmethod
+    def _iter_rows(
+        session: Session, where: ColumnElement[bool], batch_size: int
+    ) -> Iterator[List[RawRow]]:
+        stmt = (
+            select(*RawDataRepository._row_columns())
+            .where(where)
+            .order_by(models.RawData.id)
+            .execution_options(yield_per=batch_size)
+        )
+        for partition in session.execute(stmt).partitions():
+            yield RawDataRepository._decode_rows(partition)
+
     @staticmethod
     def get_by_source(
         session: Session, source_table: str, source_id: int
@@ -76,3 +236,28 @@ class RawDataRepository(BaseRepository):
             update(models.RawData).where(models.RawData.id == raw_id).values(**values)
         )
         session.execute(stmt)
+
+    @staticmethod
+    def mark_many_processed(
+        session: Session,
+        raw_ids: Sequence[int],
+        processor_version: Optional[str] = None,
+    ) -> None:
+        """Mark many rows as processed with one `UPDATE ... WHERE id = ANY(:raw_ids)`."""
+        if not raw_ids:
+            return
+
+        values: Dict[str, Any] = {"processed": True, "error": None}
+        if processor_version is not None:
+            values["processor_version"] = processor_version
+
+        stmt = (
+            update(models.RawData)
+            .where(
+                models.RawData.id
+                == any_(bindparam("raw_ids", list(raw_ids), type_=ARRAY(Integer)))
+            )
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        session.execute(stmt)
@@ -1,10 +1,13 @@
-from typing import List, Optional
-from sqlalchemy import select, update
+from datetime import datetime
+from typing import List, Optional, Sequence
+from sqlalchemy import insert, select, update
 from sqlalchemy.orm import Session
 
 from backend.database import models, schemas
 from backend.database.schemas import ScrapeLogLineOut
 from .base_repository import BaseRepository
+from .query_cache import invalidate_on_commit
+from ..database.notify import notify_task_event
 
 
 class ScrapeLogRepository(BaseRepository):
@@ -25,8 +28,85 @@ class ScrapeLogRepository(BaseRepository):
         session.add(log)
         session.flush()
         session.refresh(log)
+        notify_task_event(session, task_id, next_line_no, next_line_no)
+        # the task row's last_line_no moved
+        invalidate_on_commit(session, "scrape_tasks")
         return ScrapeLogLineOut.model_validate(log)
 
+    @staticmethod
+    def append_lines(
+        session: Session,
+        task_id: int,
+        texts: Sequence[str],
+        created_at: Optional[Sequence[datetime]] = None,
+    ) -> int:
+        """Append several lines with one counter update and one multi-row insert.
+
+        Reserves `len(texts)` consecutive line numbers with a single
+        UPDATE ... RETURNING, so the scrape_tasks row lock is taken once per batch
+        rather than once per line. `created_at` optionally carries the time each
+        line was logged. Returns the last line_no written.
+        """
+        if not texts:
+            return 0
+
+        inc_stmt = (
+            update(models.ScrapeTask)
+            .where(models.ScrapeTask.id == task_id)
+            .values(last_line_no=models.ScrapeTask.last_line_no + len(texts))
+            .returning(models.ScrapeTask.last_line_no)
+        )
+        last_line_no = int(session.execute(inc_stmt).scalar_one())
+        first_line_no = last_line_no - len(texts) + 1
+
+        rows = []
+        for offset, text in enumerate(texts):
+            row = {"task_id": task_id, "line_no": first_line_no + offset, "text": text}
+            if created_at is not None:
+                row["created_at"] = created_at[offset]
+            rows.append(row)
+        session.execute(insert(models.ScrapeLog), rows)
+        notify_task_event(session, task_id, first_line_no, last_line_no)
+        invalidate_on_commit(session, "scrape_tasks")
+        return last_line_no
+
+    @staticmethod
+    def get_logs_after(
+        session: Session, task_id: int, after_line_no: int = 0, limit: int = 1000
+    ) -> List[ScrapeLogLineOut]:
+        """Lines with line_no > `after_line_no`, oldest first (index range scan)."""
+        stmt = (
+            select(models.ScrapeLog)
+            .where(
+                models.ScrapeLog.task_id == task_id,
+                models.ScrapeLog.line_no > after_line_no,
+            )
+            .order_by(models.ScrapeLog.line_no)
+            .limit(limit)
+        )
+        rows = list(session.execute(stmt).scalars().all())
+        return [ScrapeLogLineOut.model_validate(r) for r in rows]
+
+    @staticmethod
+    def get_logs_between(
+        session: Session, task_id: int, first_line_no: int, last_line_no: int
+    ) -> List[ScrapeLogLineOut]:
+        """Lines first_line_no..last_line_no inclusive, oldest first.
+
+        Line numbers are contiguous per task, so this is how history is paged: a page
+        is a line_no range on the (task_id, line_no) index, never an OFFSET.
+        """
+        stmt = (
+            select(models.ScrapeLog)
+            .where(
+                models.ScrapeLog.task_id == task_id,
+                models.ScrapeLog.line_no.between(first_line_no, last_line_no),
+            )
+            .order_by(models.ScrapeLog.line_no)
+        )
+        rows = list(session.execute(stmt).scalars().all())
+        return [ScrapeLogLineOut.model_validate(r) for r in rows]
+
     @staticmethod
     def get_recent_logs(
         session: Session, task_id: int, limit: int = 200
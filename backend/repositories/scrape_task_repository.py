@@ -1,12 +1,20 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
 import pandas as pd
-from sqlalchemy import select, update
+from sqlalchemy import select, tuple_, update
 from sqlalchemy.orm import Session
 
-from backend.database.schemas import ScrapeStatus, ScrapeTaskCreate, ScrapeTaskOut
+from backend.database.schemas import (
+    ScrapeStatus,
+    ScrapeTaskCreate,
+    ScrapeTaskOut,
+    ScrapeTaskSummary,
+)
 
 from .base_repository import BaseRepository
+from .query_cache import cached, invalidate_on_commit
 from ..database import models
+from ..database.notify import notify_task_event
 
 
 class ScrapeTaskRepository(BaseRepository):
@@ -18,9 +26,12 @@ class ScrapeTaskRepository(BaseRepository):
         session.add(task)
         session.flush()
         session.refresh(task)
+        notify_task_event(session, int(task.id))
+        invalidate_on_commit(session, "scrape_tasks")
         return ScrapeTaskOut.model_validate(task)
 
     @staticmethod
+    @cached("scrape_tasks", ttl=2)
     def get_by_id(session: Session, task_id: int) -> Optional[ScrapeTaskOut]:
         obj = (
             session.execute(
@@ -63,10 +74,38 @@ class ScrapeTaskRepository(BaseRepository):
         return ScrapeTaskOut.model_validate(obj) if obj is not None else None
 
     @staticmethod
+    @cached("scrape_tasks", ttl=2)
     def get_all_tasks(session: Session) -> List[ScrapeTaskOut]:
         objs = list(session.execute(select(models.ScrapeTask)).scalars().all())
         return [ScrapeTaskOut.model_validate(o) for o in objs]
 
+    @staticmethod
+    @cached("scrape_tasks", ttl=2)
+    def get_summaries(
+        session: Session,
+        limit: int = 50,
+        before: Optional[Tuple[datetime, int]] = None,
+    ) -> List[ScrapeTaskSummary]:
+        """Most recently updated tasks first, only the listed columns.
+
+        `before` is the (last_update, id) of the last task already shown; the next page
+        is read from ix_scrape_tasks_last_update_id, so the cost does not grow with the
+        task history.
+        """
+        task = models.ScrapeTask
+        stmt = select(
+            task.id, task.name, task.status, task.progress, task.created_at, task.last_update
+        )
+        if before is not None:
+            stmt = stmt.where(tuple_(task.last_update, task.id) < tuple_(*before))
+        stmt = stmt.order_by(task.last_update.desc(), task.id.desc()).limit(limit)
+        return [ScrapeTaskSummary.model_validate(row) for row in session.execute(stmt)]
+
+    @staticmethod
+    def summary_cursor(summary: ScrapeTaskSummary) -> List[Any]:
+        """JSON-safe `before` values for the page after `summary`."""
+        return [summary.last_update.isoformat(), summary.id]
+
     @staticmethod
     def update_progress(
         session: Session,
@@ -103,3 +142,5 @@ class ScrapeTaskRepository(BaseRepository):
             .execution_options(synchronize_session="fetch")
         )
         session.execute(stmt)
+        notify_task_event(session, task_id)
+        invalidate_on_commit(session, "scrape_tasks")
@@ -0,0 +1,159 @@
+"""Fan-out of scrape task changes to live dashboards.
+
+One `TaskEventHub` per process holds a single LISTEN connection on
+`TASK_EVENTS_CHANNEL`. When notifications arrive it reads the changed tasks and new
+log lines once and pushes them to every subscriber queue; the `/events/tasks` SSE
+endpoint in app.py drains one queue per open browser tab. So N open dashboards cost
+one listener plus one read per change, instead of N polling queries.
+
+A task list stream opens with the TASK_LIST_SIZE most recently updated tasks
+(`{"type": "tasks", "tasks": [...ScrapeTaskSummary...], "older": cursor}`); older ones
+are paged in by the page itself.
+
+Messages put on subscriber queues:
+    {"type": "task", "task": {...ScrapeTaskOut...}}
+    {"type": "logs", "task_id": 1, "lines": [{"line_no": 1, "text": "..."}, ...]}
+
+SSE keeps one request open per tab, so under gunicorn use threaded (gthread) or
+async workers.
+"""
+
+import queue
+import select
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+import psycopg2
+
+from .database.db import engine, get_db_session
+from .database.notify import TASK_EVENTS_CHANNEL
+from .repositories import ScrapeLogRepository, ScrapeTaskRepository
+from .repositories.query_cache import query_cache
+
+# lines pushed per log notification batch; a client that falls further behind resyncs
+MAX_LINES_PER_EVENT = 1000
+# tasks in the task list snapshot, and per "older tasks" page
+TASK_LIST_SIZE = 50
+
+
+class TaskEventHub:
+    def __init__(self, poll_timeout: float = 5.0, max_queue: int = 1000):
+        self.poll_timeout = poll_timeout
+        self.max_queue = max_queue
+        self._lock = threading.Lock()
+        # subscriber queue -> task id filter (None = all tasks, no log lines)
+        self._subscribers: Dict["queue.Queue[Dict[str, Any]]", Optional[int]] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, task_id: Optional[int] = None) -> "queue.Queue[Dict[str, Any]]":
+        subscriber: "queue.Queue[Dict[str, Any]]" = queue.Queue(self.max_queue)
+        with self._lock:
+            self._subscribers[subscriber] = task_id
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._listen_forever, name="task-event-hub", daemon=True
+                )
+                self._thread.start()
+        return subscriber
+
+    def unsubscribe(self, subscriber: "queue.Queue[Dict[str, Any]]") -> None:
+        with self._lock:
+            self._subscribers.pop(subscriber, None)
+
+    def is_subscribed(self, subscriber: "queue.Queue[Dict[str, Any]]") -> bool:
+        with self._lock:
+            return subscriber in self._subscribers
+
+    def _listen_forever(self) -> None:
+        while True:
+            try:
+                self._listen()
+            except Exception as e:
+                print(f"[task events] listener failed, reconnecting: {e}")
+                time.sleep(self.poll_timeout)
+
+    def _listen(self) -> None:
+        # a dedicated connection outside the pool: LISTEN needs it for the process lifetime
+        dsn = engine.url.set(drivername="postgresql").render_as_string(
+            hide_password=False
+        )
+        connection = psycopg2.connect(dsn)
+        try:
+            connection.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            with connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {TASK_EVENTS_CHANNEL}")
+
+            while True:
+                ready, _, _ = select.select([connection], [], [], self.poll_timeout)
+                if not ready:
+                    continue
+                connection.poll()
+                payloads = [orjson.loads(n.payload) for n in connection.notifies]
+                connection.notifies.clear()
+                if payloads:
+                    self._dispatch(payloads)
+        finally:
+            connection.close()
+
+    def _dispatch(self, payloads: List[Dict[str, Any]]) -> None:
+        # the writer may be another process, whose commit only cleared its own local cache
+        query_cache.invalidate("scrape_tasks")
+
+        with self._lock:
+            subscribers = list(self._subscribers.items())
+        if not subscribers:
+            return
+
+        # coalesce the batch: every changed task once, and one line range per task
+        task_ids = {p["task_id"] for p in payloads}
+        line_ranges: Dict[int, Tuple[int, int]] = {}
+        for p in payloads:
+            if p.get("last_line_no") is None:
+                continue
+            first, last = line_ranges.get(p["task_id"], (p["first_line_no"], p["last_line_no"]))
+            line_ranges[p["task_id"]] = (
+                min(first, p["first_line_no"]),
+                max(last, p["last_line_no"]),
+            )
+        watched = {task_id for _, task_id in subscribers if task_id is not None}
+
+        messages: List[Dict[str, Any]] = []
+        with get_db_session() as session:
+            for task_id in sorted(task_ids):
+                task = ScrapeTaskRepository.get_by_id.uncached(session, task_id)
+                if task is not None:
+                    messages.append({"type": "task", "task": task.model_dump(mode="json")})
+            for task_id, (first, last) in line_ranges.items():
+                if task_id not in watched:
+                    continue
+                lines = ScrapeLogRepository.get_logs_after(
+                    session, task_id, first - 1, min(last - first + 1, MAX_LINES_PER_EVENT)
+                )
+                messages.append(
+                    {
+                        "type": "logs",
+                        "task_id": task_id,
+                        "lines": [{"line_no": l.line_no, "text": l.text} for l in lines],
+                    }
+                )
+
+        for subscriber, task_filter in subscribers:
+            for message in messages:
+                message_task = (
+                    message["task"]["id"] if message["type"] == "task" else message["task_id"]
+                )
+                if task_filter is None and message["type"] == "logs":
+                    continue
+                if task_filter is not None and task_filter != message_task:
+                    continue
+                try:
+                    subscriber.put_nowait(message)
+                except queue.Full:
+                    # a stalled client; it gets a fresh snapshot when it reconnects
+                    self.unsubscribe(subscriber)
+                    break
+
+
+hub = TaskEventHub()
@@ -1,5 +1,7 @@
+import base64
+import json
 from datetime import datetime
-from typing import Optional, cast
+from typing import Any, List, Optional, cast
 
 import pandas as pd
 
@@ -13,6 +15,23 @@ def model_list_to_dataframe(models: list) -> pd.DataFrame:
     return pd.DataFrame(dicts)
 
 
+def encode_cursor(values: List[Any]) -> str:
+    """Encode keyset pagination values as an opaque, URL-safe token."""
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: Optional[str]) -> Optional[List[Any]]:
+    """Inverse of `encode_cursor`; None for a missing or malformed token."""
+    if not token:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except ValueError:
+        return None
+    return values if isinstance(values, list) else None
+
+
 def format_datetime(dt: Optional[datetime]) -> Optional[str]:
     if dt is None:
         return None
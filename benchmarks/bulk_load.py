@@ -0,0 +1,131 @@
+"""Rows/sec of the INSERT-based loaders against the COPY-based ones.
+
+    python -m benchmarks.bulk_load --rows 100000 1000000
+
+boardgames: `bulk_upsert` in batches vs `copy_upsert`, each run once on an
+empty id range (insert) and once over the same ids (update).
+raw_data: row-wise `create` (capped at --rowwise-cap rows, it is slow) vs
+`copy_insert`. Both sides of each pair include generating the synthetic
+rows. Runs against DATABASE_URL; benchmark games use ids from
+900,000,000 up and are deleted afterwards, together with the synthetic task.
+"""
+
+import argparse
+import time
+from typing import Callable, Iterator
+
+from sqlalchemy import delete
+
+from backend.database import models
+from backend.database.db import get_db_session
+from backend.database.schemas import BoardGameIn, RawDataIn
+from backend.repositories import BoardGameRepository, RawDataRepository
+from benchmarks.synthetic import FIRST_ID, create_task, drop_task, make_raw_payloads
+
+
+def _boardgames(n: int) -> Iterator[BoardGameIn]:
+    for i in range(n):
+        game_id = FIRST_ID + i
+        yield BoardGameIn(
+            id=game_id,
+            name=f"Benchmark game {game_id}",
+            url=f"https://boardgamegeek.com/boardgame/{game_id}/benchmark",
+        )
+
+
+def _raws(task_id: int, n: int) -> Iterator[RawDataIn]:
+    for payload in make_raw_payloads(n):
+        yield RawDataIn(
+            source_table="boardgames",
+            source_id=payload["id"],
+            scrape_task_id=task_id,
+            payload=payload,
+        )
+
+
+def _drop_boardgames() -> None:
+    with get_db_session() as session:
+        session.execute(delete(models.BoardGame).where(models.BoardGame.id >= FIRST_ID))
+
+
+def _drop_raws(task_id: int) -> None:
+    with get_db_session() as session:
+        session.execute(
+            delete(models.RawData).where(models.RawData.scrape_task_id == task_id)
+        )
+
+
+def _upsert_batched(n: int, batch_size: int) -> None:
+    batch = []
+    for bg in _boardgames(n):
+        batch.append(bg)
+        if len(batch) >= batch_size:
+            with get_db_session() as session:
+                BoardGameRepository.bulk_upsert(session, batch)
+            batch = []
+    if batch:
+        with get_db_session() as session:
+            BoardGameRepository.bulk_upsert(session, batch)
+
+
+def _upsert_copy(n: int) -> None:
+    with get_db_session() as session:
+        BoardGameRepository.copy_upsert(session, _boardgames(n))
+
+
+def _insert_rowwise(task_id: int, n: int) -> None:
+    with get_db_session() as session:
+        for raw in _raws(task_id, n):
+            RawDataRepository.create(session, raw)
+
+
+def _insert_copy(task_id: int, n: int) -> None:
+    with get_db_session() as session:
+        RawDataRepository.copy_insert(session, _raws(task_id, n))
+
+
+def _timed(label: str, rows: int, fn: Callable[[], None]) -> None:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {rows:>8} rows  {elapsed:8.2f}s  {rows / elapsed:10.0f} rows/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--rowwise-cap", type=int, default=10_000)
+    args = parser.parse_args()
+
+    task_id = None
+    try:
+        task_id = create_task("benchmark_bulk_load")
+        for n in args.rows:
+            print(f"--- {n} rows")
+            for mode in ("insert", "update"):
+                if mode == "insert":
+                    _drop_boardgames()
+                _timed(
+                    f"boardgames bulk_upsert {mode}",
+                    n,
+                    lambda: _upsert_batched(n, args.batch_size),
+                )
+            for mode in ("insert", "update"):
+                if mode == "insert":
+                    _drop_boardgames()
+                _timed(f"boardgames copy_upsert {mode}", n, lambda: _upsert_copy(n))
+            _drop_boardgames()
+
+            rowwise = min(n, args.rowwise_cap)
+            _timed("raw_data create (row-wise)", rowwise, lambda: _insert_rowwise(task_id, rowwise))
+            _drop_raws(task_id)
+            _timed("raw_data copy_insert", n, lambda: _insert_copy(task_id, n))
+            _drop_raws(task_id)
+    finally:
+        _drop_boardgames()
+        drop_task(task_id)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Rows/sec of the cleaning pipeline on a synthetic corpus.
+
+    python -m benchmarks.cleaning --rows 20000 --batch-sizes 100 500 2000
+
+"before" replays the original one-session-per-row path, "batched" runs
+`clean_boardgame_info` with each batch size. Runs against DATABASE_URL; the
+synthetic task and all its rows are deleted afterwards.
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+from sqlalchemy import delete, update
+
+from backend.database import models
+from backend.database.db import get_db_session
+from backend.database.schemas import CleanDataIn
+from backend.repositories import CleanDataRepository, RawDataRepository
+from benchmarks.synthetic import create_task, drop_clean_games, drop_task, seed_raw_data
+from cleaning.clean_boardgame_info import (
+    PROCESSOR_VERSION,
+    clean_boardgame_info,
+    clean_boardgame_payload,
+)
+
+
+def _reset(task_id: int) -> None:
+    drop_clean_games()
+    with get_db_session() as session:
+        session.execute(
+            delete(models.CleanData).where(models.CleanData.scrape_task_id == task_id)
+        )
+        session.execute(
+            update(models.RawData)
+            .where(models.RawData.scrape_task_id == task_id)
+            .values(processed=False, processor_version=None, error=None)
+        )
+
+
+def _clean_rowwise(task_id: int) -> None:
+    """The pre-batching pipeline: one session, INSERT and UPDATE per row."""
+    with get_db_session() as session:
+        raw_data = RawDataRepository.get_by_scrape_task_id(session, task_id)
+
+    for raw in raw_data:
+        clean_in = CleanDataIn(
+            source_table=raw.source_table,
+            source_id=raw.source_id,
+            scrape_task_id=raw.scrape_task_id,
+            payload=clean_boardgame_payload(raw.payload),
+            processor_version=PROCESSOR_VERSION,
+        )
+        with get_db_session() as session:
+            CleanDataRepository.create(session, clean_in, raw_id=raw.id)
+            RawDataRepository.mark_processed(
+                session, raw.id, processor_version=PROCESSOR_VERSION
+            )
+
+
+def _timed(label: str, rows: int, fn) -> None:
+    start = time.perf_counter()
+    # the pipeline prints progress per chunk; keep the benchmark output readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<20} {rows:>8} rows  {elapsed:8.2f}s  {rows / elapsed:10.0f} rows/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--skip-before", action="store_true")
+    args = parser.parse_args()
+
+    task_id = None
+    try:
+        task_id = create_task("benchmark_cleaning")
+        seed_raw_data(task_id, args.rows)
+
+        if not args.skip_before:
+            _timed("before (row-wise)", args.rows, lambda: _clean_rowwise(task_id))
+
+        for batch_size in args.batch_sizes:
+            _reset(task_id)
+            _timed(
+                f"batched ({batch_size})",
+                args.rows,
+                lambda: clean_boardgame_info(task_id=task_id, batch_size=batch_size),
+            )
+    finally:
+        drop_task(task_id)
+
+
+if __name__ == "__main__":
+    main()
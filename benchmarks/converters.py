@@ -0,0 +1,61 @@
+"""Microbenchmark of the cleaning converters on realistic BGG strings.
+
+    python -m benchmarks.converters --number 100000
+
+CPU only, no database needed.
+"""
+
+import argparse
+import timeit
+
+from benchmarks.synthetic import make_raw_payloads
+from cleaning.clean_boardgame_info import (
+    clean_boardgame_payload,
+    clean_boardgame_payloads,
+    clean_float,
+    clean_int,
+    clean_str,
+    clean_str_list,
+    parse_dimension_to_volume,
+    parse_player_counts,
+    parse_price_and_store,
+)
+
+CASES = [
+    ("clean_int", clean_int, "1,234,567"),
+    ("clean_int (n/a)", clean_int, "N/A"),
+    ("clean_float", clean_float, "7.85432"),
+    ("clean_float (weight)", clean_float, "3.12 / 5"),
+    ("clean_str", clean_str, "  Isaac Childres "),
+    ("clean_str_list", clean_str_list, "Adventure\nExploration\nFantasy\nFighting"),
+    (
+        "parse_player_counts",
+        parse_player_counts,
+        "Number of Players: 1–4\nPlayers Community: 1–4\nBest: 3–4",
+    ),
+    ("parse_price_and_store", parse_price_and_store, "from CA$64.99 - Miniature Market"),
+    ("parse_dimension_to_volume", parse_dimension_to_volume, "29.6 x 29.6 x 7.2 cm"),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=100000)
+    parser.add_argument("--payloads", type=int, default=10000)
+    args = parser.parse_args()
+
+    for label, converter, value in CASES:
+        elapsed = timeit.timeit(lambda: converter(value), number=args.number)
+        print(f"{label:<28} {elapsed / args.number * 1e9:8.0f} ns/call")
+
+    payloads = make_raw_payloads(args.payloads)
+    for label, fn in [
+        ("row-wise payloads", lambda: [clean_boardgame_payload(p) for p in payloads]),
+        ("batched payloads", lambda: clean_boardgame_payloads(payloads)),
+    ]:
+        elapsed = min(timeit.repeat(fn, number=1, repeat=3))
+        print(f"{label:<28} {len(payloads) / elapsed:8.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
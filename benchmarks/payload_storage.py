@@ -0,0 +1,72 @@
+"""Table size and read throughput of payload storage formats.
+
+    python -m benchmarks.payload_storage --rows 50000
+
+Loads the same synthetic payloads into temporary tables stored as json text, jsonb
+and compressed bytea (zlib, plus zstd when `zstandard` is installed), then reports
+each table's size on disk and how fast all payloads are read back as dicts.
+Runs against DATABASE_URL; the temporary tables vanish with the connection.
+"""
+
+import argparse
+import time
+
+import orjson
+from sqlalchemy import text
+
+from backend.database.db import engine
+from backend.database.payload_codec import compress_payload, decompress_payload, zstandard
+from benchmarks.synthetic import make_raw_payloads
+
+FORMATS = ["json", "jsonb", "zlib"] + (["zstd"] if zstandard is not None else [])
+
+
+def _load(conn, fmt: str, payloads, batch_size: int = 2000) -> None:
+    column_type = {"json": "json", "jsonb": "jsonb"}.get(fmt, "bytea")
+    conn.execute(
+        text(f"CREATE TEMP TABLE payload_{fmt} (id serial PRIMARY KEY, payload {column_type})")
+    )
+    if fmt in ("json", "jsonb"):
+        values = [{"payload": orjson.dumps(p).decode()} for p in payloads]
+        stmt = text(f"INSERT INTO payload_{fmt} (payload) VALUES (CAST(:payload AS {fmt}))")
+    else:
+        values = [{"payload": compress_payload(orjson.dumps(p), fmt)} for p in payloads]
+        stmt = text(f"INSERT INTO payload_{fmt} (payload) VALUES (:payload)")
+    for i in range(0, len(values), batch_size):
+        conn.execute(stmt, values[i : i + batch_size])
+
+
+def _read(conn, fmt: str) -> float:
+    start = time.perf_counter()
+    rows = conn.execute(text(f"SELECT payload FROM payload_{fmt}")).scalars()
+    if fmt in ("json", "jsonb"):
+        # psycopg2 decodes json and jsonb into dicts itself
+        decoded = sum(1 for _ in rows)
+    else:
+        decoded = sum(1 for value in rows if decompress_payload(value))
+    elapsed = time.perf_counter() - start
+    return decoded / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    args = parser.parse_args()
+
+    payloads = make_raw_payloads(args.rows)
+    raw_bytes = sum(len(orjson.dumps(p)) for p in payloads)
+    print(f"{args.rows} payloads, {raw_bytes / args.rows:.0f} bytes of JSON each on average")
+
+    with engine.connect() as conn:
+        for fmt in FORMATS:
+            _load(conn, fmt, payloads)
+            size = conn.execute(
+                text("SELECT pg_total_relation_size(:table)"), {"table": f"payload_{fmt}"}
+            ).scalar()
+            rate = max(_read(conn, fmt) for _ in range(3))
+            print(f"{fmt:<6} {size / 1024 / 1024:8.1f} MiB  {rate:10.0f} rows/s read")
+        conn.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Simulate N dashboard clients polling /scraping and /task against the DB pool.
+
+    DB_POOL_SIZE=5 DB_MAX_OVERFLOW=10 python -m benchmarks.pool_load --clients 10 50 200
+
+Each client is a thread that, every --interval seconds, runs the queries behind the
+/scraping table (all tasks) and the /task page (one task plus its recent logs), the
+way one gunicorn worker serves its share of browsers. Pool settings come from the
+same DB_* environment variables as the app. Reports request latency percentiles and
+the pool metrics (checkout latency, waits, timeouts) per client count.
+"""
+
+import argparse
+import random
+import threading
+import time
+from typing import List
+
+from backend.database.db import engine, get_db_session
+from backend.database.pool_metrics import pool_metrics
+from backend.repositories import ScrapeLogRepository, ScrapeTaskRepository
+from benchmarks.synthetic import create_task, drop_task
+
+
+def _seed_logs(task_id: int, lines: int) -> None:
+    with get_db_session() as session:
+        ScrapeLogRepository.append_lines(
+            session, task_id, [f"line {i}" for i in range(lines)]
+        )
+
+
+def _client(task_id: int, interval: float, stop: threading.Event, latencies: List[float], errors: List[str]) -> None:
+    # spread the first poll like browsers opening the page at different times
+    stop.wait(random.random() * interval)
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            with get_db_session() as session:
+                ScrapeTaskRepository.get_all_tasks(session)
+            with get_db_session() as session:
+                ScrapeTaskRepository.get_by_id(session, task_id)
+                ScrapeLogRepository.get_recent_logs(session, task_id)
+            latencies.append(time.perf_counter() - start)
+        except Exception as e:
+            errors.append(type(e).__name__)
+        stop.wait(interval)
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run(clients: int, duration: float, interval: float, task_id: int) -> None:
+    pool_metrics.reset()
+    stop = threading.Event()
+    latencies: List[float] = []
+    errors: List[str] = []
+    threads = [
+        threading.Thread(target=_client, args=(task_id, interval, stop, latencies, errors))
+        for _ in range(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    stats = pool_metrics.snapshot(engine.pool)
+    print(
+        f"{clients:>5} clients  {len(latencies):>6} polls  {len(errors):>4} errors  "
+        f"p50 {_percentile(latencies, 0.5) * 1000:7.1f}ms  "
+        f"p95 {_percentile(latencies, 0.95) * 1000:7.1f}ms  "
+        f"max {_percentile(latencies, 1.0) * 1000:7.1f}ms  |  "
+        f"checkouts {stats['checkouts']:>6}  waits {stats['waits']:>5}  "
+        f"timeouts {stats['timeouts']:>4}  waited {stats['wait_seconds']:6.2f}s  "
+        f"checkout avg {stats['checkout_latency_avg'] * 1000:6.2f}ms  "
+        f"max {stats['checkout_latency_max'] * 1000:7.1f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--interval", type=float, default=5.0, help="poll interval per client")
+    parser.add_argument("--log-lines", type=int, default=2000)
+    args = parser.parse_args()
+
+    task_id = None
+    try:
+        task_id = create_task("benchmark_pool_load")
+        _seed_logs(task_id, args.log_lines)
+        for clients in args.clients:
+            run(clients, args.duration, args.interval, task_id)
+    finally:
+        drop_task(task_id)
+
+
+if __name__ == "__main__":
+    main()
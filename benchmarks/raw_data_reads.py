@@ -0,0 +1,89 @@
+"""Peak RSS of reading a task's raw rows: list-based vs streaming.
+
+    python -m benchmarks.raw_data_reads --rows 50000
+
+Each read mode runs in a fresh interpreter so peak RSS is measured in
+isolation. Runs against DATABASE_URL; the synthetic task is deleted afterwards.
+"""
+
+import argparse
+import resource
+import subprocess
+import sys
+import time
+
+from backend.database.db import get_db_session
+from backend.repositories import RawDataRepository
+from benchmarks.synthetic import create_task, drop_task, seed_raw_data
+
+MODES = ["list", "stream"]
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _read(mode: str, task_id: int, batch_size: int) -> int:
+    total = 0
+    with get_db_session() as session:
+        if mode == "list":
+            for raw in RawDataRepository.get_by_scrape_task_id(session, task_id):
+                total += len(raw.payload)
+        else:
+            for chunk in RawDataRepository.iter_by_scrape_task_id(
+                session, task_id, batch_size=batch_size
+            ):
+                for raw in chunk:
+                    total += len(raw.payload)
+    return total
+
+
+def _child(mode: str, task_id: int, batch_size: int) -> None:
+    baseline = _peak_rss_mb()
+    start = time.perf_counter()
+    _read(mode, task_id, batch_size)
+    elapsed = time.perf_counter() - start
+    print(f"{mode:<8} {elapsed:8.2f}s  peak RSS {_peak_rss_mb():8.1f} MiB (+{_peak_rss_mb() - baseline:.1f})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--task-id", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.child, args.task_id, args.batch_size)
+        return
+
+    task_id = None
+    try:
+        task_id = create_task("benchmark_raw_data_reads")
+        seed_raw_data(task_id, args.rows)
+        print(f"{args.rows} rows, batch size {args.batch_size}")
+
+        for mode in MODES:
+            subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "benchmarks.raw_data_reads",
+                    "--child",
+                    mode,
+                    "--task-id",
+                    str(task_id),
+                    "--batch-size",
+                    str(args.batch_size),
+                ],
+                check=True,
+            )
+    finally:
+        drop_task(task_id)
+
+
+if __name__ == "__main__":
+    main()
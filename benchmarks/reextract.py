@@ -0,0 +1,155 @@
+"""Offline re-extraction throughput on synthetic page snapshots.
+
+    python -m benchmarks.reextract --games 2000 --workers 1 4
+
+Renders synthetic BGG-like credits/versions/marketplace/stats pages (padded with
+filler markup to a realistic size), saves them to a temporary snapshot store, then
+times `extract_games` per worker count and checks that every payload matches the
+one the pages were rendered from. CPU and local disk only, no database or browser.
+"""
+
+import argparse
+import html
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.synthetic import make_raw_payloads
+from scraping.extraction import build_raw_payload
+from scraping.reextract_boardgame_info import extract_games
+from scraping.snapshots import SnapshotStore
+
+CREDITS_KEYS = [
+    "Primary Name",
+    "Alternate Names",
+    "Designer",
+    "Solo Designer",
+    "Artists",
+    "Publishers",
+    "Categories",
+    "Mechanics",
+    "Family",
+]
+PAGE_KEYS = ["id", "name", "url", "year", "player counts", "dimensions", "prices"]
+
+
+def _lines(value: str) -> str:
+    return "<br>".join(f"<a href='#'>{html.escape(line)}</a>" for line in value.split("\n"))
+
+
+def _outline(items) -> str:
+    return "".join(
+        '<li class="outline-item">'
+        f'<div class="outline-item-title">{html.escape(key)}</div>'
+        f'<div class="outline-item-description"><span>{_lines(value)}</span></div></li>'
+        for key, value in items
+    )
+
+
+def _page(body: str, padding: str) -> str:
+    return f"<html><head><title>BGG</title></head><body>{padding}{body}{padding}</body></html>"
+
+
+def render_pages(payload: dict, padding: str) -> dict:
+    """page type -> HTML that extracts back to `payload`."""
+    credits = [(k, payload[k]) for k in CREDITS_KEYS]
+    stats = [(k, v) for k, v in payload.items() if k not in CREDITS_KEYS + PAGE_KEYS]
+    return {
+        "credits": _page(
+            f'<ul><li itemprop="numberOfPlayers">{html.escape(payload["player counts"])}</li></ul>'
+            f'<h1><span class="game-year">{payload["year"]}</span></h1>'
+            f"<credits-module><ul>{_outline(credits)}</ul></credits-module>",
+            padding,
+        ),
+        "versions": _page(
+            "".join(
+                f"<div><span ng-if=\"ldata.displaytype==='dimensions'\">{d}</span></div>"
+                for d in payload["dimensions"]
+            ),
+            padding,
+        ),
+        "marketplace": _page(
+            '<ul class="shopping-listings">'
+            + "".join(
+                f'<li class="item-listing"><a href="#"><span class="item-listing__btn-text">'
+                f"{html.escape(p)}</span></a></li>"
+                for p in payload["prices"]
+            )
+            + "</ul>",
+            padding,
+        ),
+        "stats": _page(f'<div class="panel-body"><ul>{_outline(stats)}</ul></div>', padding),
+    }
+
+
+def _expected(payload: dict) -> dict:
+    pages = {"credits": {k: payload[k] for k in CREDITS_KEYS}}
+    pages["credits"].update(
+        {"player counts": payload["player counts"], "year": payload["year"]}
+    )
+    pages["versions"] = {"dimensions": payload["dimensions"]}
+    pages["marketplace"] = {"prices": payload["prices"]}
+    pages["stats"] = {
+        k: v for k, v in payload.items() if k not in CREDITS_KEYS + PAGE_KEYS
+    }
+    return build_raw_payload(payload["id"], None, None, pages)
+
+
+def _same(a: dict, b: dict) -> bool:
+    # dimensions are de-duplicated through a set, so their order is not kept
+    return {**a, "dimensions": sorted(a["dimensions"])} == {
+        **b,
+        "dimensions": sorted(b["dimensions"]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument(
+        "--padding-kb", type=int, default=100, help="filler markup per page, in KiB"
+    )
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    filler = "".join(
+        f'<div class="row"><span class="c{rng.randint(0, 99)}">{rng.random():.12f}</span></div>'
+        for _ in range(args.padding_kb * 1024 // 64)
+    )
+    payloads = make_raw_payloads(args.games)
+
+    with tempfile.TemporaryDirectory() as root:
+        store = SnapshotStore(root)
+        start = time.perf_counter()
+        for payload in payloads:
+            for page_type, page in render_pages(payload, filler).items():
+                store.save(payload["id"], page_type, f"/boardgame/{payload['id']}", page)
+        disk = sum(
+            os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(root) for f in files
+        )
+        print(
+            f"{args.games} games, {args.games * 4} pages saved in "
+            f"{time.perf_counter() - start:.1f}s, {disk / 1024 / 1024:.1f} MiB on disk"
+        )
+
+        expected = {p["id"]: _expected(p) for p in payloads}
+        for workers in args.workers:
+            start = time.perf_counter()
+            mismatches = 0
+            for game_id, pages, error in extract_games(store, workers):
+                if error is not None or not _same(
+                    build_raw_payload(game_id, None, None, pages), expected[game_id]
+                ):
+                    mismatches += 1
+            elapsed = time.perf_counter() - start
+            rate = args.games / elapsed
+            print(
+                f"{workers:>2} workers {elapsed:8.2f}s  {rate:8.0f} games/s  "
+                f"100k games in {100000 / rate / 60:5.1f} min  {mismatches} mismatches"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Page load time and bandwidth per game with and without a resource policy.
+
+    python -m benchmarks.resource_policy --games 10 --latency-ms 50
+
+Serves fixture pages from a local HTTP stand-in for BGG: each of a game's four pages
+pulls images, a web font, a video and an "analytics" and an "ads" script, every
+subresource delayed by --latency-ms. Each game's pages are loaded in Camoufox up to
+the `load` event; the server counts the bytes it actually sent, so blocked requests
+are visible as bandwidth that was never used. Needs camoufox, no database.
+"""
+
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from scraping.camoufox_wrapper import CamoufoxWrapper
+from scraping.resource_policy import ResourcePolicy
+
+PAGE_TYPES = ["credits", "versions", "marketplace/stores", "stats"]
+
+ASSETS = {
+    # path -> (content type, size in bytes)
+    "/static/cover.jpg": ("image/jpeg", 250_000),
+    "/static/thumb-1.jpg": ("image/jpeg", 40_000),
+    "/static/thumb-2.jpg": ("image/jpeg", 40_000),
+    "/static/thumb-3.jpg": ("image/jpeg", 40_000),
+    "/static/font.woff2": ("font/woff2", 120_000),
+    "/static/trailer.mp4": ("video/mp4", 1_000_000),
+    "/static/app.js": ("application/javascript", 60_000),
+    "/analytics/gtag.js": ("application/javascript", 90_000),
+    "/ads/slot.js": ("application/javascript", 150_000),
+}
+
+# the app script is what renders BGG pages, so it must keep loading
+BENCHMARK_POLICIES = {
+    "none": None,
+    "types": ResourcePolicy(block_urls=()),
+    "types+urls": ResourcePolicy(block_urls=("*/analytics/*", "*/ads/*")),
+}
+
+
+def _fixture_page(game_id: int, page_type: str) -> bytes:
+    items = "".join(
+        f'<li class="outline-item"><div class="outline-item-title">Field {i}</div>'
+        f'<div class="outline-item-description">Value {i} of game {game_id}</div></li>'
+        for i in range(40)
+    )
+    return f"""<!doctype html>
+<html><head>
+<style>@font-face {{ font-family: bgg; src: url(/static/font.woff2); }}
+body {{ font-family: bgg; }}</style>
+<script src="/static/app.js"></script>
+<script async src="/analytics/gtag.js"></script>
+<script async src="/ads/slot.js"></script>
+</head><body>
+<h1>Game {game_id} - {page_type}</h1>
+<img src="/static/cover.jpg"><img src="/static/thumb-1.jpg">
+<img src="/static/thumb-2.jpg"><img src="/static/thumb-3.jpg">
+<video src="/static/trailer.mp4" preload="auto"></video>
+<div class="panel-body"><ul>{items}</ul></div>
+</body></html>""".encode()
+
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency: float):
+        super().__init__(("127.0.0.1", 0), FixtureHandler)
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.bytes_sent = 0
+        self.requests = 0
+
+    def count(self, size: int) -> None:
+        with self.lock:
+            self.bytes_sent += size
+            self.requests += 1
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    server: FixtureServer
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path in ASSETS:
+            content_type, size = ASSETS[path]
+            # scripts must stay valid JavaScript: pad them as a comment
+            pad = b"x" * (size - 4)
+            body = b"/*" + pad + b"*/" if content_type.endswith("javascript") else pad
+            time.sleep(self.server.latency)
+        elif path.startswith("/boardgame/"):
+            _, _, game_id, page_type = path.split("/", 3)
+            content_type, body = "text/html", _fixture_page(int(game_id), page_type)
+        else:
+            self.send_error(404)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.count(len(body))
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--latency-ms", type=int, default=50)
+    args = parser.parse_args()
+
+    server = FixtureServer(args.latency_ms / 1000)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        with CamoufoxWrapper().start_browser(enable_cache=False) as browser:
+            for label, policy in BENCHMARK_POLICIES.items():
+                page = browser.new_page(policy=policy)
+                sent_before = server.bytes_sent
+                start = time.perf_counter()
+                for game_id in range(1, args.games + 1):
+                    for page_type in PAGE_TYPES:
+                        page.page.goto(
+                            f"{base}/boardgame/{game_id}/{page_type}", wait_until="load"
+                        )
+                elapsed = time.perf_counter() - start
+                sent = server.bytes_sent - sent_before
+                print(
+                    f"{label:<11} {elapsed / args.games:6.2f}s/game  "
+                    f"{sent / args.games / 1024:8.0f} KiB/game  {page.resources}"
+                )
+                page.close()
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
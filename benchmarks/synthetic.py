@@ -0,0 +1,155 @@
+"""Synthetic BGG-like payloads and DB fixtures shared by the benchmark scripts.
+
+Everything created here lives under a dedicated scrape task, and synthetic games
+use ids from FIRST_ID up, far above real BGG ids, so `drop_task` removes it again
+without touching real data.
+"""
+
+import random
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete
+
+from backend.database import models
+from backend.database.db import get_db_session
+from backend.database.schemas import RawDataIn, ScrapeStatus, ScrapeTaskCreate
+from backend.repositories import RawDataRepository, ScrapeTaskRepository
+
+# first synthetic game id; cleaning upserts per-game rows, so ids must not clash
+FIRST_ID = 900_000_000
+
+_NAMES = ["Gloomhaven", "Brass: Birmingham", "Ark Nova", "Terraforming Mars", "Wingspan"]
+_PEOPLE = ["Isaac Childres", "Gavan Brown", "Mathias Wigge", "Jacob Fryxelius", "Elizabeth Hargrave"]
+_CATEGORIES = ["Adventure", "Economic", "Exploration", "Fantasy", "Animals", "Science Fiction"]
+_MECHANICS = ["Action Queue", "Hand Management", "Campaign", "Network Building", "Tile Placement"]
+_STORES = ["Amazon", "Miniature Market", "Philibert", "Zatu Games", "Spielgaben"]
+_CURRENCIES = ["$", "CA$", "£", "€", "CHF"]
+
+
+def _maybe(rng: random.Random, value: str, na_rate: float = 0.05) -> str:
+    return "N/A" if rng.random() < na_rate else value
+
+
+def _count(rng: random.Random, upper: int) -> str:
+    return f"{rng.randint(0, upper):,}"
+
+
+def make_raw_payload(game_id: int, rng: random.Random) -> Dict[str, Any]:
+    """One payload shaped like the output of `scrape_boardgames_info`."""
+    name = f"{rng.choice(_NAMES)} #{game_id}"
+    min_players = rng.randint(1, 3)
+    max_players = min_players + rng.randint(0, 4)
+
+    return {
+        "id": game_id,
+        "name": name,
+        "url": f"/boardgame/{game_id}/synthetic-{game_id}",
+        "year": f"({rng.randint(1980, 2025)})",
+        "player counts": (
+            f"Number of Players: {min_players}–{max_players}\n"
+            f"Players Community: {min_players}–{max_players + 1}\n"
+            f"Best: {min_players}–{max_players}"
+        ),
+        "Primary Name": name,
+        "Alternate Names": "\n".join(f"{name} ({lang})" for lang in ["DE", "FR", "PL"]),
+        "Designer": rng.choice(_PEOPLE),
+        "Solo Designer": _maybe(rng, rng.choice(_PEOPLE), 0.7),
+        "Artists": "\n".join(rng.sample(_PEOPLE, 2)),
+        "Publishers": "\n".join(rng.sample(_PEOPLE, 3)),
+        "Categories": "\n".join(rng.sample(_CATEGORIES, 3)),
+        "Mechanics": "\n".join(rng.sample(_MECHANICS, 3)),
+        "Family": _maybe(rng, "Components: Miniatures\nTheme: Fantasy", 0.3),
+        "Year Released": str(rng.randint(1980, 2025)),
+        "Avg. Rating": f"{rng.uniform(4, 9):.5f}",
+        "No. of Ratings": _count(rng, 120000),
+        "Std. Deviation": f"{rng.uniform(0.8, 2.0):.3f}",
+        "Weight": f"{rng.uniform(1, 5):.2f} / 5",
+        "Comments": _count(rng, 20000),
+        "Fans": _count(rng, 20000),
+        "Page Views": _count(rng, 5000000),
+        "Overall Rank": _maybe(rng, str(rng.randint(1, 30000)), 0.2),
+        "Thematic Rank": _maybe(rng, str(rng.randint(1, 2000)), 0.6),
+        "All Time Plays": _count(rng, 200000),
+        "This Month": _count(rng, 5000),
+        "Own": _count(rng, 200000),
+        "Prev. Owned": _count(rng, 20000),
+        "For Trade": _count(rng, 2000),
+        "Want In Trade": _count(rng, 5000),
+        "Wishlist": _count(rng, 50000),
+        "Has Parts": _count(rng, 100),
+        "Want Parts": _count(rng, 100),
+        "dimensions": [
+            f"{rng.uniform(10, 40):.1f} x {rng.uniform(10, 40):.1f} x {rng.uniform(2, 15):.1f} cm"
+            for _ in range(rng.randint(0, 4))
+        ],
+        "prices": [
+            f"from {rng.choice(_CURRENCIES)}{rng.uniform(10, 150):.2f} - {rng.choice(_STORES)}"
+            for _ in range(rng.randint(0, 6))
+        ],
+    }
+
+
+def make_raw_payloads(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [make_raw_payload(FIRST_ID + i, rng) for i in range(n)]
+
+
+def create_task(name: str = "benchmark") -> int:
+    with get_db_session() as session:
+        task = ScrapeTaskRepository.create_task(
+            session,
+            ScrapeTaskCreate(name=name, status=ScrapeStatus.completed, progress=1.0),
+        )
+        return task.id
+
+
+def seed_raw_data(task_id: int, n: int, seed: int = 0) -> None:
+    """COPY `n` synthetic raw rows for `task_id` into raw_data."""
+    with get_db_session() as session:
+        RawDataRepository.copy_insert(
+            session,
+            (
+                RawDataIn(
+                    source_table="boardgames",
+                    source_id=payload["id"],
+                    scrape_task_id=task_id,
+                    payload=payload,
+                )
+                for payload in make_raw_payloads(n, seed)
+            ),
+        )
+
+
+def drop_clean_games() -> None:
+    """Delete the per-game clean rows (typed table and current snapshot) of synthetic ids."""
+    with get_db_session() as session:
+        session.execute(
+            delete(models.CleanBoardGame).where(models.CleanBoardGame.id >= FIRST_ID)
+        )
+        session.execute(
+            delete(models.CleanDataCurrent).where(
+                models.CleanDataCurrent.source_table == "boardgames",
+                models.CleanDataCurrent.source_id >= FIRST_ID,
+            )
+        )
+
+
+def drop_task(task_id: Optional[int]) -> None:
+    """Delete a benchmark task together with its raw, clean and log rows."""
+    if task_id is None:
+        return
+
+    drop_clean_games()
+    with get_db_session() as session:
+        session.execute(
+            delete(models.CleanData).where(models.CleanData.scrape_task_id == task_id)
+        )
+        session.execute(
+            delete(models.RawData).where(models.RawData.scrape_task_id == task_id)
+        )
+        session.execute(
+            delete(models.ScrapeLog).where(models.ScrapeLog.task_id == task_id)
+        )
+        session.execute(
+            delete(models.ScrapeTask).where(models.ScrapeTask.id == task_id)
+        )
@@ -1,4 +1,41 @@
-from cleaning.clean_boardgame_info import clean_boardgame_info
+import argparse
 
+from backend.database.db import get_db_session
+from backend.repositories import CleanBoardGameRepository, CleanDataRepository
+from cleaning.clean_boardgame_info import (
+    clean_boardgame_info,
+    clean_pending_boardgame_info,
+)
 
-clean_boardgame_info()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Clean scraped boardgame data")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="number of worker processes claiming pending rows",
+    )
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument(
+        "--task-id",
+        type=int,
+        default=None,
+        help="reprocess every raw row of this task instead of only pending rows",
+    )
+    parser.add_argument(
+        "--refresh-current",
+        action="store_true",
+        help="rebuild the latest-clean-row-per-game snapshot from the full history "
+        "and fill missing search names",
+    )
+    args = parser.parse_args()
+
+    if args.refresh_current:
+        with get_db_session() as session:
+            CleanDataRepository.refresh_current(session)
+            CleanBoardGameRepository.backfill_search_names(session)
+    elif args.task_id is not None:
+        clean_boardgame_info(task_id=args.task_id, batch_size=args.batch_size)
+    else:
+        clean_pending_boardgame_info(workers=args.workers, batch_size=args.batch_size)
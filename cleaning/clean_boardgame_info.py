@@ -1,29 +1,68 @@
+import multiprocessing
 import re
-from typing import Optional, cast
+import time
+from typing import Any, Callable, Iterable, NamedTuple, Optional, Sequence, cast
+
+from sqlalchemy.orm import Session
 
 from backend.database.db import get_db_session
 from backend.repositories.raw_data_repository import RawDataRepository
 from backend.repositories.scrape_task_repository import ScrapeTaskRepository
 from backend.repositories.clean_data_repository import CleanDataRepository
+from backend.repositories.clean_boardgame_repository import CleanBoardGameRepository
 from backend.utils import model_list_to_dataframe
-from backend.database.schemas import CleanDataIn
+from backend.database.schemas import CleanBoardGameIn, CleanDataIn
 
-PROCESSOR_VERSION = "1.0"
+# 1.1: cleaning also writes the typed clean_boardgames table
+# 1.2: player counts are read from the scraper's "player counts" key
+PROCESSOR_VERSION = "1.2"
 
 
 def clean_field_name(name: str) -> str:
     return name.replace(".", "").replace(" ", "_").lower()
 
 
+_INT_PATTERN = re.compile(r"([\d,]+)")
+_FLOAT_PATTERN = re.compile(r"([\d.]+)")
+_PLAYER_COUNTS_PATTERN = re.compile(
+    r"([\w]+[\w ]+):? (?:\(no votes\) )?(\d+)[-–](\d+)"
+)
+_PRICE_PATTERN = re.compile(
+    r"(?:from )?((?:CA)?\$|£|€|C\$|Fr\.|CHF) ?([\d.]+)(?: [-–] )(.+)"
+)
+_DIMENSION_PATTERN = re.compile(
+    r"(\d+(?:\.\d+)?) x (\d+(?:\.\d+)?) x (\d+(?:\.\d+)?) cm"
+)
+
+# USD conversion rates per currency symbol matched by _PRICE_PATTERN
+CONVERSION_RATES = {
+    "$": 1.0,
+    "CA$": 0.73,
+    "£": 1.35,
+    "€": 1.18,
+    "Fr.": 0.17,
+    "CHF": 1.29,
+}
+
+_PLAYER_COUNT_KEYS = {
+    "best": "best_player_count",
+    "players community": "community_player_count",
+    "number of players": "official_player_count",
+}
+
+
+def _is_missing(value: Optional[str]) -> bool:
+    return value is None or value == "" or value.lower() == "n/a"
+
+
 def clean_int(value: Optional[str | int]) -> Optional[int]:
     if isinstance(value, int):
         return value
 
-    if value is None or value == "" or value.lower() == "n/a":
+    if _is_missing(value):
         return None
 
-    pattern = r"([\d,]+)"
-    match = re.search(pattern, value)
+    match = _INT_PATTERN.search(value)
     if not match:
         return None
 
@@ -31,14 +70,14 @@ def clean_int(value: Optional[str | int]) -> Optional[int]:
 
 
 def clean_str(value: Optional[str]) -> Optional[str]:
-    if value is None or value == "" or value.lower() == "n/a":
+    if _is_missing(value):
         return None
 
     return value.strip()
 
 
 def clean_str_list(value: Optional[str]) -> Optional[list[str]]:
-    if value is None or value == "" or value.lower() == "n/a":
+    if _is_missing(value):
         return None
 
     return [item.strip() for item in value.split("\n") if item.strip() != ""]
@@ -50,12 +89,10 @@ def clean_float(value: Optional[str | float]) -> Optional[float]:
     if isinstance(value, int):
         return float(value)
 
-    if value is None or value == "" or value.lower() == "n/a":
+    if _is_missing(value):
         return None
 
-    pattern = r"([\d.]+)"
-
-    match = re.search(pattern, value.strip())
+    match = _FLOAT_PATTERN.search(value.strip())
     if not match:
         return None
 
@@ -63,51 +100,35 @@ def clean_float(value: Optional[str | float]) -> Optional[float]:
 
 
 def parse_player_counts(value: Optional[str]) -> Optional[dict[str, int]]:
-    if value is None or value == "" or value.lower() == "n/a":
+    if _is_missing(value):
         return None
 
-    pattern = r"([\w]+[\w ]+):? (?:\(no votes\) )?(\d+)[-–](\d+)"
-    matches = re.findall(pattern, value)
+    matches = _PLAYER_COUNTS_PATTERN.findall(value)
     if not matches:
         return None
 
     result: dict = {}
     for typ, min_s, max_s in matches:
-        if typ.lower() == "best":
-            typ = "best_player_count"
-        elif typ.lower() == "players community":
-            typ = "community_player_count"
-        elif typ.lower() == "number of players":
-            typ = "official_player_count"
+        typ = _PLAYER_COUNT_KEYS.get(typ.lower(), typ).strip()
 
-        result[f"{typ.strip()}_min"] = int(min_s)
-        result[f"{typ.strip()}_max"] = int(max_s)
+        result[f"{typ}_min"] = int(min_s)
+        result[f"{typ}_max"] = int(max_s)
 
     return result
 
 
 def parse_price_and_store(value: Optional[str]) -> Optional[tuple[float, str]]:
-    if value is None or value == "" or value.lower() == "n/a":
+    if _is_missing(value):
         return None
 
-    pattern = r"(?:from )?((?:CA)?\$|£|€|C\$|Fr\.|CHF) ?([\d.]+)(?: [-–] )(.+)"
-    match = re.search(pattern, value.strip())
+    match = _PRICE_PATTERN.search(value.strip())
     if not match:
         return None
 
     currency = match.group(1).replace(" ", "").strip()
     amount = clean_float(match.group(2))
 
-    conversion_rates = {
-        "$": 1.0,
-        "CA$": 0.73,
-        "£": 1.35,
-        "€": 1.18,
-        "Fr.": 0.17,
-        "CHF": 1.29,
-    }
-
-    if currency not in conversion_rates:
+    if currency not in CONVERSION_RATES:
         return None
 
     if amount is None:
@@ -117,15 +138,14 @@ def parse_price_and_store(value: Optional[str]) -> Optional[tuple[float, str]]:
     if store is None or store == "":
         return None
 
-    return (round(amount * conversion_rates[currency], 3), store)
+    return (round(amount * CONVERSION_RATES[currency], 3), store)
 
 
 def parse_dimension_to_volume(value: Optional[str]) -> Optional[float]:
-    if value is None or value == "" or value.lower() == "n/a":
+    if _is_missing(value):
         return None
 
-    pattern = r"(\d+(?:\.\d+)?) x (\d+(?:\.\d+)?) x (\d+(?:\.\d+)?) cm"
-    match = re.search(pattern, value.strip())
+    match = _DIMENSION_PATTERN.search(value.strip())
     if not match:
         return None
 
@@ -139,22 +159,41 @@ def parse_dimension_to_volume(value: Optional[str]) -> Optional[float]:
     return round(length * width * height, 3)
 
 
-def clean_boardgame_info():
-    with get_db_session() as session:
-        task = ScrapeTaskRepository.get_latest_completed_task_by_name(
-            session, name="scrape_boardgames_info"
-        )
+def clean_prices(values: Optional[list[str]]) -> dict[str, float]:
+    """Map store -> USD price; later listings for the same store win."""
+    cleaned_prices = {}
+    for raw_price in values or []:
+        parsed_price = parse_price_and_store(raw_price)
+        if parsed_price is not None:
+            cleaned_prices[parsed_price[1]] = parsed_price[0]
+    return cleaned_prices
+
+
+def clean_volumes(values: Optional[list[str]]) -> list[float]:
+    volumes = []
+    for dim in values or []:
+        volume = parse_dimension_to_volume(dim)
+        if volume is not None:
+            volumes.append(volume)
+    return volumes
+
 
-        if task is None:
-            print("No completed task found")
-            return
+class FieldSpec(NamedTuple):
+    raw_name: str
+    column: str
+    converter: Callable[[Any], Any]
 
-        raw_data = RawDataRepository.get_by_scrape_task_id(session, task.id)
 
-    for raw in raw_data:
-        cleaned_data = {}
+def _specs(converter: Callable[[Any], Any], raw_names: list[str]) -> list[FieldSpec]:
+    return [FieldSpec(name, clean_field_name(name), converter) for name in raw_names]
 
-        int_fields = [
+
+# Declarative description of a cleaned boardgame payload, built once at import.
+# Each spec reads `raw_name` from the raw payload and stores `converter(value)` under `column`.
+FIELD_SPECS: tuple[FieldSpec, ...] = (
+    *_specs(
+        clean_int,
+        [
             "id",
             "Own",
             "Fans",
@@ -173,19 +212,12 @@ def clean_boardgame_info():
             "Has Parts",
             "Want Parts",
             "Want In Trade",
-        ]
-        for field_name in int_fields:
-            cleaned_field_name = clean_field_name(field_name)
-            cleaned_value = clean_int(raw.payload.get(field_name))
-            cleaned_data[cleaned_field_name] = cleaned_value
-
-        float_fields = ["Weight", "Avg. Rating", "Std. Deviation"]
-        for field_name in float_fields:
-            cleaned_field_name = clean_field_name(field_name)
-            cleaned_value = clean_float(raw.payload.get(field_name))
-            cleaned_data[cleaned_field_name] = cleaned_value
-
-        str_fields = [
+        ],
+    ),
+    *_specs(clean_float, ["Weight", "Avg. Rating", "Std. Deviation"]),
+    *_specs(
+        clean_str,
+        [
             "name",
             "url",
             "Editor",
@@ -194,13 +226,11 @@ def clean_boardgame_info():
             "Primary Name",
             "Solo Designer",
             "Insert Designer",
-        ]
-        for field_name in str_fields:
-            cleaned_field_name = clean_field_name(field_name)
-            cleaned_value = clean_str(raw.payload.get(field_name))
-            cleaned_data[cleaned_field_name] = cleaned_value
-
-        str_list_fields = [
+        ],
+    ),
+    *_specs(
+        clean_str_list,
+        [
             "Artists",
             "Sculptors",
             "Categories",
@@ -211,59 +241,242 @@ def clean_boardgame_info():
             "Graphic Designers",
             "Mechanisms",
             "Family",
-        ]
-        for field_name in str_list_fields:
-            cleaned_field_name = clean_field_name(field_name)
-            cleaned_value = clean_str_list(raw.payload.get(field_name))
-            cleaned_data[cleaned_field_name] = cleaned_value
-
-        # parse player counts
-        player_counts_raw = raw.payload.get("player_counts")
-        parsed_player_counts = parse_player_counts(player_counts_raw)
-        if parsed_player_counts is not None:
-            for key, value in parsed_player_counts.items():
-                cleaned_data[key] = value
-
-        # parse prices (and convert to USD)
-        cleaned_prices = {}
-        for raw_price in raw.payload.get("prices", []):
-            parsed_price = parse_price_and_store(raw_price)
-            if parsed_price is not None:
-                cleaned_prices[parsed_price[1]] = parsed_price[0]
-        cleaned_data["prices"] = cleaned_prices
-
-        # parse dimensions
-        volumes = []
-        for dim in raw.payload.get("dimensions", []):
-            volume = parse_dimension_to_volume(dim)
-            if volume is not None:
-                volumes.append(volume)
-
-        cleaned_data["volumes_cm3"] = volumes
-
-        # persist cleaned data and mark raw as processed
-        clean_in = CleanDataIn(
-            source_table=raw.source_table,
-            source_id=raw.source_id,
-            scrape_task_id=raw.scrape_task_id,
-            payload=cleaned_data,
+        ],
+    ),
+)
+
+# Fields that expand into several columns or are collections, applied after FIELD_SPECS.
+PLAYER_COUNTS_FIELD = "player counts"
+# the key the cleaner used to read; kept for payloads written with it
+_LEGACY_PLAYER_COUNTS_FIELD = "player_counts"
+PRICES_SPEC = FieldSpec("prices", "prices", clean_prices)
+VOLUMES_SPEC = FieldSpec("dimensions", "volumes_cm3", clean_volumes)
+
+_COMPILED_SPECS = tuple((spec.raw_name, spec.column, spec.converter) for spec in FIELD_SPECS)
+
+
+def clean_boardgame_payload(payload: dict) -> dict:
+    get = payload.get
+    cleaned_data = {
+        column: converter(get(raw_name))
+        for raw_name, column, converter in _COMPILED_SPECS
+    }
+
+    player_counts = get(PLAYER_COUNTS_FIELD)
+    if player_counts is None:
+        player_counts = get(_LEGACY_PLAYER_COUNTS_FIELD)
+    parsed_player_counts = parse_player_counts(player_counts)
+    if parsed_player_counts is not None:
+        cleaned_data.update(parsed_player_counts)
+
+    cleaned_data[PRICES_SPEC.column] = clean_prices(get(PRICES_SPEC.raw_name))
+    cleaned_data[VOLUMES_SPEC.column] = clean_volumes(get(VOLUMES_SPEC.raw_name))
+
+    return cleaned_data
+
+
+def clean_boardgame_payloads(payloads: Iterable[dict]) -> list[dict]:
+    """Clean a batch of payloads in one pass; raises on the first malformed payload."""
+    return [clean_boardgame_payload(payload) for payload in payloads]
+
+
+def _clean_chunk(
+    raws: Sequence[Any],
+) -> tuple[list[tuple[int, CleanDataIn]], list[tuple[int, str]]]:
+    """Clean a chunk of raw rows in memory. Returns (cleaned, failed) where failed holds (raw_id, error)."""
+    cleaned: list[tuple[int, CleanDataIn]] = []
+    failed: list[tuple[int, str]] = []
+
+    for raw in raws:
+        try:
+            clean_in = CleanDataIn(
+                source_table=raw.source_table,
+                source_id=raw.source_id,
+                scrape_task_id=raw.scrape_task_id,
+                payload=clean_boardgame_payload(raw.payload),
+                processor_version=PROCESSOR_VERSION,
+            )
+        except Exception as exc:
+            failed.append((raw.id, str(exc)))
+            continue
+        cleaned.append((raw.id, clean_in))
+
+    return cleaned, failed
+
+
+# Cleaned payload keys copied 1:1 into clean_boardgames columns.
+_TYPED_COLUMNS = tuple(
+    name
+    for name in CleanBoardGameIn.model_fields
+    if name not in ("id", "raw_id", "scrape_task_id", "min_price_usd", "processor_version")
+)
+
+
+def _typed_boardgame(raw_id: int, clean_in: CleanDataIn) -> Optional[CleanBoardGameIn]:
+    if clean_in.source_id is None:
+        return None
+
+    payload = clean_in.payload
+    return CleanBoardGameIn(
+        id=clean_in.source_id,
+        raw_id=raw_id,
+        scrape_task_id=clean_in.scrape_task_id,
+        min_price_usd=min((payload.get("prices") or {}).values(), default=None),
+        processor_version=clean_in.processor_version,
+        **{name: payload.get(name) for name in _TYPED_COLUMNS},
+    )
+
+
+def _typed_boardgames(cleaned: list[tuple[int, CleanDataIn]]) -> list[CleanBoardGameIn]:
+    typed = (_typed_boardgame(raw_id, clean_in) for raw_id, clean_in in cleaned)
+    return [bg for bg in typed if bg is not None]
+
+
+def _persist_chunk(
+    session: Session,
+    cleaned: list[tuple[int, CleanDataIn]],
+    failed: list[tuple[int, str]],
+) -> int:
+    """Write a cleaned chunk with one INSERT, one typed upsert and one UPDATE.
+
+    If the chunk write fails, it is retried row by row in savepoints so a single bad
+    row is recorded as an error instead of rolling back the rest of the chunk.
+    Returns the number of rows written.
+    """
+    written = 0
+
+    try:
+        with session.begin_nested():
+            CleanDataRepository.bulk_create(session, cleaned)
+            CleanBoardGameRepository.bulk_upsert(session, _typed_boardgames(cleaned))
+            RawDataRepository.mark_many_processed(
+                session,
+                [raw_id for raw_id, _ in cleaned],
+                processor_version=PROCESSOR_VERSION,
+            )
+        written = len(cleaned)
+    except Exception:
+        for raw_id, clean_in in cleaned:
+            try:
+                with session.begin_nested():
+                    CleanDataRepository.create(session, clean_in, raw_id=raw_id)
+                    CleanBoardGameRepository.bulk_upsert(
+                        session, _typed_boardgames([(raw_id, clean_in)])
+                    )
+                    RawDataRepository.mark_processed(
+                        session, raw_id, processor_version=PROCESSOR_VERSION
+                    )
+                written += 1
+            except Exception as exc:
+                failed.append((raw_id, str(exc)))
+
+    for raw_id, error in failed:
+        RawDataRepository.mark_processed(
+            session,
+            raw_id,
+            processed=False,
             processor_version=PROCESSOR_VERSION,
+            error=error,
         )
 
-        with get_db_session() as session:
-            try:
-                CleanDataRepository.create(session, clean_in, raw_id=raw.id)
-                RawDataRepository.mark_processed(
-                    session,
-                    raw.id,
+    return written
 
-                    processor_version=PROCESSOR_VERSION,
-                )
 
-                print(f"Cleaned boardgame '{cleaned_data.get('name')}' (id: {cleaned_data.get('id')}) with {len(cleaned_data)} fields")
-            except Exception as exc:
-                RawDataRepository.mark_processed(
-                    session, raw.id, processed=False, error=str(exc)
-                )
+def clean_boardgame_info(task_id: Optional[int] = None, batch_size: int = 500):
+    """Clean the raw rows of a scrape task in chunks of `batch_size`.
+
+    Defaults to the latest completed `scrape_boardgames_info` task. Raw rows are
+    streamed from a server-side cursor, so memory use does not grow with the task.
+    """
+    with get_db_session() as session:
+        if task_id is None:
+            task = ScrapeTaskRepository.get_latest_completed_task_by_name(
+                session, name="scrape_boardgames_info"
+            )
+
+            if task is None:
+                print("No completed task found")
+                return
+
+            task_id = task.id
+
+    written = 0
+    errors = 0
+    # the read session keeps the cursor open; each chunk is written in its own transaction
+    with get_db_session() as read_session:
+        for chunk in RawDataRepository.iter_by_scrape_task_id(
+            read_session, task_id, batch_size=batch_size
+        ):
+            cleaned, failed = _clean_chunk(chunk)
+
+            with get_db_session() as session:
+                written += _persist_chunk(session, cleaned, failed)
+            errors += len(failed)
+
+            print(f"Cleaned {written} boardgames ({errors} errors)")
 
     print("Boardgame cleaning complete")
+
+
+def clean_worker(worker_id: int, batch_size: int = 500) -> tuple[int, int, int, float]:
+    """Claim, clean and write pending boardgame rows until none are left.
+
+    Pending rows are those not yet processed and those cleaned by an older
+    PROCESSOR_VERSION, across all scrape tasks.
+
+    Each batch is claimed with SKIP LOCKED and written in the same transaction, so any
+    number of workers can drain the backlog side by side.
+    Returns (worker_id, rows written, errors, elapsed seconds).
+    """
+    written = 0
+    errors = 0
+    start = time.perf_counter()
+
+    while True:
+        with get_db_session() as session:
+            claimed = RawDataRepository.claim_pending(
+                session,
+                "boardgames",
+                processor_version=PROCESSOR_VERSION,
+                limit=batch_size,
+            )
+            if not claimed:
+                break
+
+            cleaned, failed = _clean_chunk(claimed)
+            written += _persist_chunk(session, cleaned, failed)
+        errors += len(failed)
+
+    return worker_id, written, errors, time.perf_counter() - start
+
+
+def clean_pending_boardgame_info(workers: int = 1, batch_size: int = 500):
+    """Incrementally clean pending boardgame rows with `workers` processes and report throughput.
+
+    A single worker runs in-process, so a rerun with nothing pending returns right away.
+    """
+    if workers <= 1:
+        results = [clean_worker(0, batch_size)]
+    else:
+        # spawn so every worker builds its own engine instead of sharing forked connections
+        ctx = multiprocessing.get_context("spawn")
+        with ctx.Pool(workers) as pool:
+            results = pool.starmap(
+                clean_worker, [(worker_id, batch_size) for worker_id in range(workers)]
+            )
+
+    total_written = 0
+    total_errors = 0
+    wall = max((elapsed for *_, elapsed in results), default=0.0)
+    for worker_id, written, errors, elapsed in results:
+        rate = written / elapsed if elapsed > 0 else 0.0
+        print(
+            f"Worker {worker_id}: {written} rows, {errors} errors in {elapsed:.1f}s ({rate:.0f} rows/s)"
+        )
+        total_written += written
+        total_errors += errors
+
+    total_rate = total_written / wall if wall > 0 else 0.0
+    print(
+        f"Boardgame cleaning complete: {total_written} rows, {total_errors} errors in {wall:.1f}s ({total_rate:.0f} rows/s)"
+    )
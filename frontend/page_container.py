@@ -1,7 +1,35 @@
-from dash import html
+from dash import Input, Output, dcc, html
 import dash
 import dash_bootstrap_components as dbc
 
+from backend.database.db import get_db_session
+from backend.repositories import BoardGameRepository
+
+
+def _search_box():
+    return html.Div(
+        [
+            dbc.Input(
+                id="navbar-search",
+                type="search",
+                placeholder="Search games...",
+                debounce=0.3,
+                autocomplete="off",
+                size="sm",
+            ),
+            html.Div(
+                id="navbar-search-results",
+                style={
+                    "position": "absolute",
+                    "zIndex": 1000,
+                    "minWidth": "100%",
+                    "marginTop": "0.25rem",
+                },
+            ),
+        ],
+        style={"position": "relative", "marginLeft": "1rem"},
+    )
+
 
 def app_layout():
     # build nav items from registered pages
@@ -10,6 +38,7 @@ def app_layout():
         nav_items.append(
             dbc.NavItem(dbc.NavLink(page["name"], href=page["relative_path"]))
         )
+    nav_items.append(dbc.NavItem(_search_box()))
 
     navbar = dbc.NavbarSimple(
         children=nav_items,
@@ -20,3 +49,27 @@ def app_layout():
     )
 
     return html.Div([navbar, dash.page_container])
+
+
+@dash.callback(
+    Output("navbar-search-results", "children"),
+    Input("navbar-search", "value"),
+)
+def _update_search_results(query):
+    if not query or len(query.strip()) < 2:
+        return None
+
+    with get_db_session() as session:
+        results = BoardGameRepository.search(session, query, limit=8)
+
+    if not results:
+        return dbc.ListGroup([dbc.ListGroupItem("No matches", disabled=True)])
+    return dbc.ListGroup(
+        [
+            dbc.ListGroupItem(
+                dcc.Link(result.name, href=f"/boardgame?id={result.id}"),
+                style={"whiteSpace": "nowrap"},
+            )
+            for result in results
+        ]
+    )
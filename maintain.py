@@ -0,0 +1,79 @@
+import argparse
+import os
+
+from backend.database.db import engine
+from backend.database.partitions import (
+    PARTITIONED_TABLES,
+    RETENTION_MONTHS,
+    apply_retention,
+    ensure_partitions,
+    is_partitioned,
+    partition_table,
+    restore_partition,
+)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Partition maintenance for scrape_logs and raw_data: create upcoming "
+        "months, archive and drop expired ones"
+    )
+    parser.add_argument(
+        "--partition",
+        action="store_true",
+        help="one-off: convert tables created before partitioning (locks them while copying)",
+    )
+    parser.add_argument(
+        "--archive-dir",
+        default=os.getenv("ARCHIVE_DIR", "archive"),
+        help="where expired partitions are written as .jsonl.gz",
+    )
+    parser.add_argument(
+        "--no-archive",
+        action="store_true",
+        help="drop expired partitions without exporting them",
+    )
+    for table, months in RETENTION_MONTHS.items():
+        parser.add_argument(
+            f"--{table.replace('_', '-')}-months",
+            type=int,
+            default=months,
+            help=f"months of {table} kept in the database (default {months})",
+        )
+    parser.add_argument("--dry-run", action="store_true", help="only list what would be dropped")
+    parser.add_argument(
+        "--restore",
+        metavar="ARCHIVE",
+        nargs="+",
+        help="load archived partitions back instead of running maintenance",
+    )
+    args = parser.parse_args()
+
+    if args.restore:
+        for path in args.restore:
+            with engine.begin() as conn:
+                print(f"{path}: {restore_partition(conn, path)} rows restored")
+        raise SystemExit(0)
+
+    for table in PARTITIONED_TABLES:
+        # one transaction per table, so a failure leaves the other table's work intact
+        with engine.begin() as conn:
+            if not is_partitioned(conn, table):
+                if not args.partition:
+                    print(f"{table} is not partitioned; run with --partition first")
+                    continue
+                print(f"{table}: {partition_table(conn, table)} rows moved to partitions")
+
+            for partition in ensure_partitions(conn, table):
+                print(f"{table}: created {partition.name}")
+
+            dropped = apply_retention(
+                conn,
+                table,
+                getattr(args, f"{table}_months"),
+                None if args.no_archive else args.archive_dir,
+                dry_run=args.dry_run,
+            )
+            for partition in dropped:
+                verb = "would drop" if args.dry_run else "dropped"
+                print(f"{table}: {verb} {partition.name}")
@@ -2,25 +2,60 @@ import dash
 from dash import html, dcc, Input, Output
 import dash_bootstrap_components as dbc
 
-from urllib.parse import parse_qs
+import math
+from typing import Any, List, Optional
+from urllib.parse import parse_qs, urlencode
 
 from backend.database.db import get_db_session
 from backend.repositories import BoardGameRepository
-from backend.utils import model_list_to_dataframe
+from backend.repositories.boardgame_repository import PAGE_SORT_KEYS
+from backend.utils import decode_cursor, encode_cursor, model_list_to_dataframe
 
 dash.register_page(__name__)
 
 app = dash.get_app()
 
 
-def _fetch_df_for_page(page: int = 1, per_page: int = 10):
-    skip = (page - 1) * per_page
+PER_PAGE = 10
 
+
+def _fetch_page(
+    after: Optional[List[Any]],
+    before: Optional[List[Any]],
+    sort: str,
+    per_page: int = PER_PAGE,
+):
+    """Fetch one keyset page plus whether there are pages before/after it.
+
+    One extra row is requested in the direction of travel to know if more follow.
+    """
     with get_db_session() as session:
-        boardgames = BoardGameRepository.get_some(session, skip=skip, take=per_page)
+        if before is not None:
+            boardgames = BoardGameRepository.get_page_before(
+                session, before, per_page + 1, sort
+            )
+            has_prev, has_next = len(boardgames) > per_page, True
+            boardgames = boardgames[-per_page:]
+            if not has_prev and len(boardgames) < per_page:
+                # walked back past the start (rows changed meanwhile): show the first page
+                before = None
+        if before is None:
+            boardgames = BoardGameRepository.get_page_after(
+                session, after, per_page + 1, sort
+            )
+            has_prev, has_next = after is not None, len(boardgames) > per_page
+            boardgames = boardgames[:per_page]
+
+        total = BoardGameRepository.estimated_count(session)
+        cursors = (
+            [BoardGameRepository.page_cursor(boardgames[0], sort),
+             BoardGameRepository.page_cursor(boardgames[-1], sort)]
+            if boardgames
+            else [None, None]
+        )
         df_boardgames = model_list_to_dataframe(boardgames)
 
-    return df_boardgames
+    return df_boardgames, has_prev, has_next, cursors, total
 
 
 def layout(*args, **kwargs):
@@ -47,9 +82,23 @@ def render_table(query):
         page = max(1, int(page_str))
     except ValueError:
         page = 1
+    sort = qs.get("sort", ["id"])[0]
+    if sort not in PAGE_SORT_KEYS:
+        sort = "id"
+    # keyset cursors: sort-key values of the row the page starts after / ends before
+    after = decode_cursor(qs.get("after", [None])[0])
+    before = decode_cursor(qs.get("before", [None])[0])
+    # a hand-edited or stale cursor (e.g. from another sort) starts over at the first page
+    if after is not None and not BoardGameRepository.is_valid_cursor(after, sort):
+        after = None
+    if before is not None and not BoardGameRepository.is_valid_cursor(before, sort):
+        before = None
+    if after is None and before is None:
+        page = 1
 
-    per_page = 10
-    df = _fetch_df_for_page(page, per_page)
+    df, has_prev, has_next, (first, last), total = _fetch_page(after, before, sort)
+    if not has_prev:
+        page = 1
 
     if df is None or df.empty:
         table = html.Div("No data available")
@@ -63,18 +112,27 @@ def render_table(query):
             responsive=True,
         )
 
-    prev_disabled = page <= 1
-    prev_page = page - 1
-    next_page = page + 1
+    def href(**params):
+        return "?" + urlencode({"sort": sort, **params})
 
     prev_link = dcc.Link(
-        dbc.Button("Previous", color="primary", disabled=prev_disabled),
-        href=f"?page={prev_page}",
+        dbc.Button("Previous", color="primary", disabled=not has_prev),
+        href=href(before=encode_cursor(first), page=page - 1) if has_prev else href(),
+    )
+    next_link = dcc.Link(
+        dbc.Button("Next", color="primary", disabled=not has_next),
+        href=href(after=encode_cursor(last), page=page + 1) if has_next else href(),
+    )
+    pages = max(1, math.ceil(total / PER_PAGE))
+    page_indicator = html.Span(f"Page {page} of ~{pages}", style={"margin": "0 1rem"})
+    sort_links = html.Span(
+        [
+            dcc.Link(f"Sort by {key}", href=f"?{urlencode({'sort': key})}", style={"marginLeft": "1rem"})
+            for key in PAGE_SORT_KEYS
+        ]
     )
-    next_link = dcc.Link(dbc.Button("Next", color="primary"), href=f"?page={next_page}")
-    page_indicator = html.Span(f"Page {page}", style={"margin": "0 1rem"})
 
-    pagination = html.Div([prev_link, page_indicator, next_link])
+    pagination = html.Div([prev_link, page_indicator, next_link, sort_links])
 
     return table, pagination
 
@@ -0,0 +1,196 @@
+import math
+from typing import Any, List, Optional, Tuple
+
+import dash
+from dash import Input, Output, dash_table, html
+
+from backend.database.db import get_db_session
+from backend.database.schemas import CleanBoardGameFilter
+from backend.repositories import CleanBoardGameRepository
+
+dash.register_page(__name__)
+
+PAGE_SIZE = 25
+
+# (column, header, DataTable type); arrays are shown comma-joined as text
+CATALOG_COLUMNS = [
+    ("name", "Name", "text"),
+    ("year_released", "Year", "numeric"),
+    ("overall_rank", "Rank", "numeric"),
+    ("avg_rating", "Rating", "numeric"),
+    ("weight", "Weight", "numeric"),
+    ("no_of_ratings", "Ratings", "numeric"),
+    ("own", "Owned", "numeric"),
+    ("designer", "Designer", "text"),
+    ("categories", "Categories", "text"),
+    ("mechanics", "Mechanics", "text"),
+    ("min_price_usd", "Min price (USD)", "numeric"),
+]
+_COLUMN_TYPES = {column: kind for column, _, kind in CATALOG_COLUMNS}
+
+# ARRAY columns only support "contains": an exact, case-sensitive element match (GIN @>),
+# so "Economic" matches the category Economic but "economic" or "Econ" match nothing
+_ARRAY_COLUMNS = {"categories", "mechanics"}
+_ARRAY_SYMBOLS = {"contains", "scontains"}
+
+# DataTable filter_query operators -> CleanBoardGameRepository filter ops.
+# Longer symbols first, so ">=" is not read as ">".
+_FILTER_OPERATORS = [
+    ("ge", ">="),
+    ("le", "<="),
+    ("ne", "!="),
+    ("lt", "<"),
+    ("gt", ">"),
+    ("eq", "="),
+    ("contains", "contains"),
+    ("contains", "icontains"),
+    ("contains", "scontains"),
+    ("ge", "ge"),
+    ("le", "le"),
+    ("ne", "ne"),
+    ("lt", "lt"),
+    ("gt", "gt"),
+    ("eq", "eq"),
+]
+
+
+def _parse_value(column: str, raw: str) -> Any:
+    value = raw.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "'\"`":
+        value = value[1:-1]
+    if _COLUMN_TYPES.get(column) == "numeric":
+        number = float(value)
+        return int(number) if number.is_integer() else number
+    return value
+
+
+def parse_filter_query(filter_query: Optional[str]) -> List[CleanBoardGameFilter]:
+    """Translate DataTable's `{col} op value && ...` filter syntax into repository filters.
+
+    Unknown columns or operators and unparsable values are dropped rather than failing
+    the whole table.
+    """
+    filters = []
+    for part in (filter_query or "").split(" && "):
+        part = part.strip()
+        if not part.startswith("{") or "}" not in part:
+            continue
+        column, rest = part[1:].split("}", 1)
+        if column not in _COLUMN_TYPES:
+            continue
+        rest = rest.strip()
+        for op, symbol in _FILTER_OPERATORS:
+            if rest.startswith(symbol + " ") or (rest.startswith(symbol) and not symbol.isalpha()):
+                if column in _ARRAY_COLUMNS and symbol not in _ARRAY_SYMBOLS:
+                    break
+                if _COLUMN_TYPES[column] == "numeric" and op == "contains":
+                    # substring matching needs text; numbers only compare
+                    break
+                try:
+                    value = _parse_value(column, rest[len(symbol) :])
+                except ValueError:
+                    break
+                if value != "":
+                    if column == "name" and op == "contains":
+                        # trigram-indexed, and also matches alternate names
+                        column = "search_names"
+                    filters.append(CleanBoardGameFilter(column=column, op=op, value=value))
+                break
+    return filters
+
+
+def _fetch_page(
+    page_current: int,
+    page_size: int,
+    sort_by: List[dict],
+    filters: List[CleanBoardGameFilter],
+) -> Tuple[List[dict], int]:
+    sort = [
+        (s["column_id"], s["direction"] == "desc")
+        for s in sort_by or []
+        if s["column_id"] in _COLUMN_TYPES
+    ]
+    with get_db_session() as session:
+        boardgames = CleanBoardGameRepository.query(
+            session,
+            filters=filters,
+            sort_by=sort,
+            skip=page_current * page_size,
+            take=page_size,
+        )
+        # the planner estimate is free; an exact count is only needed once filtered
+        total = (
+            CleanBoardGameRepository.count(session, filters)
+            if filters
+            else CleanBoardGameRepository.estimated_count(session)
+        )
+
+    rows = []
+    for bg in boardgames:
+        row = {column: getattr(bg, column) for column in _COLUMN_TYPES}
+        for column, value in row.items():
+            if isinstance(value, list):
+                row[column] = ", ".join(value)
+        row["name"] = f"[{bg.name or bg.id}](/boardgame?id={bg.id})"
+        row["id"] = bg.id
+        rows.append(row)
+    return rows, total
+
+
+def layout(*args, **kwargs):
+    return html.Div(
+        [
+            html.H1("Catalog"),
+            html.Div(id="catalog-count", style={"marginBottom": "0.5rem"}),
+            dash_table.DataTable(
+                id="catalog-table",
+                columns=[
+                    {
+                        "name": header,
+                        "id": column,
+                        "type": kind,
+                        "presentation": "markdown" if column == "name" else "input",
+                        **(
+                            {
+                                "filter_options": {
+                                    "case": "sensitive",
+                                    "placeholder_text": "exact name, e.g. Economic",
+                                }
+                            }
+                            if column in _ARRAY_COLUMNS
+                            else {}
+                        ),
+                    }
+                    for column, header, kind in CATALOG_COLUMNS
+                ],
+                page_current=0,
+                page_size=PAGE_SIZE,
+                page_action="custom",
+                sort_action="custom",
+                sort_mode="multi",
+                sort_by=[{"column_id": "overall_rank", "direction": "asc"}],
+                filter_action="custom",
+                filter_query="",
+                filter_options={"case": "insensitive"},
+                style_table={"overflowX": "auto"},
+                style_cell={"textAlign": "left", "maxWidth": "20rem", "whiteSpace": "normal"},
+            ),
+        ]
+    )
+
+
+@dash.callback(
+    Output("catalog-table", "data"),
+    Output("catalog-table", "page_count"),
+    Output("catalog-count", "children"),
+    Input("catalog-table", "page_current"),
+    Input("catalog-table", "page_size"),
+    Input("catalog-table", "sort_by"),
+    Input("catalog-table", "filter_query"),
+)
+def update_catalog(page_current, page_size, sort_by, filter_query):
+    filters = parse_filter_query(filter_query)
+    rows, total = _fetch_page(page_current or 0, page_size or PAGE_SIZE, sort_by, filters)
+    page_count = max(1, math.ceil(total / (page_size or PAGE_SIZE)))
+    label = f"{total} games" if filters else f"~{total} games"
+    return rows, page_count, label
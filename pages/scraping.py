@@ -1,58 +1,43 @@
+from datetime import datetime
+
 import dash
-from dash import html, Input, Output, dcc
+from dash import dash_table, dcc, html, Input, Output, State
 
 from backend.database.db import get_db_session
-from backend.repositories.scrape_task_repository import ScrapeTaskRepository
-from backend.utils import model_list_to_dataframe
-import dash_bootstrap_components as dbc
+from backend.repositories import ScrapeTaskRepository
+from backend.task_events import TASK_LIST_SIZE
+from backend.utils import decode_cursor, encode_cursor, format_datetime
 
 dash.register_page(__name__)
 
 app = dash.get_app()
 
-
-def _fetch_tasks_df():
-    with get_db_session() as session:
-        tasks = ScrapeTaskRepository.get_all_tasks(session)
-        df_tasks = model_list_to_dataframe(tasks)
-
-    df_tasks = df_tasks[
-        ["id", "name", "status", "progress", "last_update", "created_at", "eta"]
-    ]
-
-    df_tasks["progress"] = (df_tasks["progress"] * 100).round(0).astype(int).astype(
-        str
-    ) + "%"
-
-    df_tasks["last_update"] = df_tasks["last_update"].dt.strftime("%Y-%m-%d %H:%M:%S")
-    df_tasks["created_at"] = df_tasks["created_at"].dt.strftime("%Y-%d %H:%M:%S")
-
-    # sort by last_update
-    df_tasks = df_tasks.sort_values("last_update", ascending=False).reset_index(
-        drop=True
-    )
-
-    return df_tasks
+TASK_COLUMNS = ["id", "name", "status", "progress", "last_update", "created_at", "eta"]
 
 
 def layout(*args, **kwargs):
+    # rows arrive over server-sent events: the latest tasks on connect, then one row per
+    # change; older tasks are appended a page at a time
     return html.Div(
         children=[
             html.H1("Scraping"),
             html.H2("Scrape Tasks"),
-            dcc.Interval(id="tasks-interval", interval=5000, n_intervals=0),
-            html.Div(
-                id="tasks-table-container",
-                children=[
-                    dbc.Table.from_dataframe(  # type: ignore
-                        _fetch_tasks_df(),
-                        id="tasks-table",
-                        striped=True,
-                        bordered=True,
-                        hover=True,
-                        responsive=True,
-                    )
-                ],
+            dcc.Store(id="tasks-events-url", data="/events/tasks"),
+            dcc.Store(id="tasks-event"),
+            # (last_update, id) cursor of the oldest task loaded; None when all are shown
+            dcc.Store(id="tasks-older-cursor"),
+            dash_table.DataTable(
+                id="tasks-table",
+                columns=[{"name": c, "id": c} for c in TASK_COLUMNS],
+                data=[],
+                style_cell={"textAlign": "left", "cursor": "pointer"},
+                style_as_list_view=True,
+            ),
+            html.Button(
+                "Load older tasks",
+                id="tasks-load-older",
+                disabled=True,
+                style={"marginTop": "1rem"},
             ),
             html.Div(id="scraping-dummy-output", style={"display": "none"}),
         ]
@@ -61,38 +46,116 @@ def layout(*args, **kwargs):
 
 app.clientside_callback(
     """
-    function(children) {
-        const table = document.getElementById('tasks-table');
-        if (!table) return '';
-        const rows = table.querySelectorAll('tbody tr');
-        rows.forEach(function(tr){
-            tr.style.cursor = 'pointer';
-            tr.onclick = function(){
-                const idCell = tr.querySelector('td:first-child');
-                const id = idCell && idCell.textContent.trim();
-                if (id) window.open(`/task?id=${id}`, '_blank');
-            };
-        });
+    function(url) {
+        if (window.bggTaskEvents) window.bggTaskEvents.close();
+        const source = new EventSource(url);
+        const push = function(e) {
+            if (!document.getElementById('tasks-table')) { source.close(); return; }
+            window.dash_clientside.set_props('tasks-event', {data: JSON.parse(e.data)});
+        };
+        source.addEventListener('tasks', push);
+        source.addEventListener('task', push);
+        window.bggTaskEvents = source;
         return '';
     }
     """,
     Output("scraping-dummy-output", "children"),
-    Input("tasks-table-container", "children"),
+    Input("tasks-events-url", "data"),
+)
+
+
+app.clientside_callback(
+    """
+    function(event, rows) {
+        const no_update = window.dash_clientside.no_update;
+        if (!event) return [no_update, no_update];
+        const time = function(t) { return t ? t.replace('T', ' ').slice(0, 19) : null; };
+        const row = function(t) {
+            return {
+                id: t.id,
+                name: t.name,
+                status: t.status,
+                progress: Math.round((t.progress || 0) * 100) + '%',
+                last_update: time(t.last_update),
+                created_at: time(t.created_at),
+                eta: t.eta,
+            };
+        };
+        // a snapshot replaces the table, a single task is upserted by id
+        const byId = {};
+        if (event.type === 'task') (rows || []).forEach(function(r) { byId[r.id] = r; });
+        (event.type === 'tasks' ? event.tasks : [event.task]).forEach(function(t) {
+            byId[t.id] = row(t);
+        });
+        const sorted = Object.values(byId).sort(function(a, b) {
+            return (b.last_update || '').localeCompare(a.last_update || '');
+        });
+        return [sorted, event.type === 'tasks' ? event.older : no_update];
+    }
+    """,
+    Output("tasks-table", "data"),
+    Output("tasks-older-cursor", "data"),
+    Input("tasks-event", "data"),
+    State("tasks-table", "data"),
 )
 
 
-@app.callback(
-    Output("tasks-table-container", "children"),
-    Input("tasks-interval", "n_intervals"),
+def _task_row(summary) -> dict:
+    # same shape as the rows built from stream events above
+    return {
+        "id": summary.id,
+        "name": summary.name,
+        "status": summary.status.value,
+        "progress": f"{int(summary.progress * 100 + 0.5)}%",
+        "last_update": format_datetime(summary.last_update),
+        "created_at": format_datetime(summary.created_at),
+        "eta": summary.eta,
+    }
+
+
+@dash.callback(
+    Output("tasks-table", "data", allow_duplicate=True),
+    Output("tasks-older-cursor", "data", allow_duplicate=True),
+    Input("tasks-load-older", "n_clicks"),
+    State("tasks-older-cursor", "data"),
+    State("tasks-table", "data"),
+    prevent_initial_call=True,
+)
+def load_older_tasks(_n_clicks, cursor, rows):
+    values = decode_cursor(cursor)
+    if values is None:
+        return dash.no_update, None
+    before = (datetime.fromisoformat(values[0]), int(values[1]))
+
+    with get_db_session() as session:
+        summaries = ScrapeTaskRepository.get_summaries(session, TASK_LIST_SIZE, before)
+
+    shown = {row["id"] for row in rows or []}
+    older = [_task_row(s) for s in summaries if s.id not in shown]
+    next_cursor = (
+        encode_cursor(ScrapeTaskRepository.summary_cursor(summaries[-1]))
+        if len(summaries) == TASK_LIST_SIZE
+        else None
+    )
+    return (rows or []) + older, next_cursor
+
+
+app.clientside_callback(
+    """
+    function(cursor) { return !cursor; }
+    """,
+    Output("tasks-load-older", "disabled"),
+    Input("tasks-older-cursor", "data"),
+)
+
+
+app.clientside_callback(
+    """
+    function(cell) {
+        if (cell && cell.row_id !== undefined) window.open(`/task?id=${cell.row_id}`, '_blank');
+        return '';
+    }
+    """,
+    Output("scraping-dummy-output", "title"),
+    Input("tasks-table", "active_cell"),
 )
-def _update_tasks_table(n_intervals: int):
-    return [
-        dbc.Table.from_dataframe(  # type: ignore
-            _fetch_tasks_df(),
-            id="tasks-table",
-            striped=True,
-            bordered=True,
-            hover=True,
-            responsive=True,
-        )
-    ]
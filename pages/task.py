@@ -1,7 +1,8 @@
+import math
 from urllib.parse import parse_qs
 
 import dash
-from dash import Input, Output, html, dcc
+from dash import Input, Output, State, dash_table, html, dcc
 import dash_bootstrap_components as dbc
 
 from backend.database.db import get_db_session
@@ -11,78 +12,238 @@ from backend.repositories.scrape_task_repository import ScrapeTaskRepository
 
 dash.register_page(__name__)
 
+app = dash.get_app()
+
+# log lines kept in the live tail; older ones are in the history table
+MAX_LOG_LINES = 200
+HISTORY_PAGE_SIZE = 500
+
 
 def layout(*args, **kwargs):
+    # every id a callback uses lives here, so Dash can validate the callbacks; the
+    # task-content block stays hidden until render_table has found the task
     return html.Div(
         [
             dcc.Location(id="url", refresh=False),
-            dcc.Interval(id="task-interval", interval=5000, n_intervals=0),
             html.Div(id="task_info_container"),
+            html.Div(
+                [
+                    dcc.Store(id="task-id"),
+                    dcc.Store(id="task-events-url"),
+                    dcc.Store(id="task-event"),
+                    html.H1(id="task-title"),
+                    html.Div([html.H2("Task Information"), html.Div(id="task-info")]),
+                    html.Div(
+                        [
+                            html.H3("Recent Logs"),
+                            html.P(
+                                "",
+                                id="task-logs",
+                                style={
+                                    "whiteSpace": "pre-wrap",
+                                    "fontFamily": "monospace",
+                                    "backgroundColor": "#f0f0f0",
+                                    "padding": "1rem",
+                                },
+                            ),
+                        ],
+                        style={"marginTop": "2rem"},
+                    ),
+                    # highest line_no received; the stream resumes after it
+                    dcc.Store(id="task-last-line", data=0),
+                    html.Div(
+                        [
+                            html.H3("Log History"),
+                            # pages are line_no ranges; the table only renders visible rows
+                            dash_table.DataTable(
+                                id="task-log-history",
+                                columns=[
+                                    {"name": "line", "id": "line_no"},
+                                    {"name": "time", "id": "created_at"},
+                                    {"name": "text", "id": "text"},
+                                ],
+                                data=[],
+                                page_action="custom",
+                                page_size=HISTORY_PAGE_SIZE,
+                                page_current=0,
+                                page_count=1,
+                                virtualization=True,
+                                fixed_rows={"headers": True},
+                                style_table={"height": "400px", "overflowY": "auto"},
+                                style_cell={
+                                    "textAlign": "left",
+                                    "fontFamily": "monospace",
+                                    "whiteSpace": "pre-wrap",
+                                },
+                            ),
+                        ],
+                        style={"marginTop": "2rem"},
+                    ),
+                ],
+                id="task-content",
+                style={"display": "none"},
+            ),
+            html.Div(id="task-dummy-output", style={"display": "none"}),
         ]
     )
 
 
 @dash.callback(
     Output("task_info_container", "children"),
+    Output("task-content", "style"),
+    Output("task-id", "data"),
+    Output("task-events-url", "data"),
+    Output("task-title", "children"),
+    Output("task-log-history", "page_current"),
+    Output("task-log-history", "page_count"),
+    Output("task-logs", "children"),
+    Output("task-last-line", "data"),
     Input("url", "search"),
-    Input("task-interval", "n_intervals"),
 )
-def render_table(query, n_intervals):
+def render_table(query):
     qs = parse_qs(query.lstrip("?")) if query else {}
     task_id_str = qs.get("id", [""])[0]
 
+    def missing(message):
+        return html.Div(message), {"display": "none"}, None, None, "", 0, 1, "", 0
+
     if task_id_str is None:
-        return html.Div("No task ID provided")
+        return missing("No task ID provided")
     elif task_id_str == "":
-        return html.Div("Empty task ID provided")
+        return missing("Empty task ID provided")
     elif not task_id_str.isdigit():
-        return html.Div("Invalid task ID")
+        return missing("Invalid task ID")
 
     task_id = int(task_id_str)
 
     with get_db_session() as session:
         task = ScrapeTaskRepository.get_by_id(session, task_id)
 
-        if task is None:
-            return html.Div(f"No task found with ID {task_id}")
-
-        task_info = html.Div(
-            [
-                html.H2("Task Information"),
-                html.P(f"ID: {task.id}"),
-                html.P(f"Name: {task.name}"),
-                html.P(f"Status: {task.status.value}"),
-                html.P(f"Progress: {task.progress*100:.0f}%"),
-                html.P(f"Current Page: {task.current_page}"),
-                html.P(f"Items Processed: {task.items_processed}"),
-                html.P(f"Message: {task.message}"),
-                html.P(f"Created At: {task.created_at}"),
-                html.P(f"Last Update: {task.last_update}"),
-            ]
-        )
+    if task is None:
+        return missing(f"No task found with ID {task_id}")
+
+    history_pages = max(1, math.ceil(task.last_line_no / HISTORY_PAGE_SIZE))
+
+    # task fields and log lines are filled in (and kept current) by the event stream
+    return (
+        None,
+        {"display": "block"},
+        task_id,
+        f"/events/tasks?task_id={task_id}",
+        f"{str(task.name)} ({task.status.value})",
+        history_pages - 1,
+        history_pages,
+        # the stream replays the tail for a fresh last line
+        "",
+        0,
+    )
+
 
-        task_logs = ScrapeLogRepository.get_recent_logs(session, task_id)
-
-        logs_str = "\n".join(f"{log.line_no}: {log.text}" for log in task_logs)
-
-        return html.Div(
-            [
-                html.H1(f"{str(task.name)} ({task.status.value})"),
-                task_info,
-                html.Div(
-                    [
-                        html.H3("Recent Logs"),
-                        html.P(
-                            logs_str,
-                            style={
-                                "whiteSpace": "pre-wrap",
-                                "fontFamily": "monospace",
-                                "backgroundColor": "#f0f0f0",
-                                "padding": "1rem",
-                            },
-                        ),
-                    ],
-                    style={"marginTop": "2rem"},
-                ),
-            ]
+@dash.callback(
+    Output("task-log-history", "data"),
+    Input("task-log-history", "page_current"),
+    State("task-log-history", "page_size"),
+    State("task-id", "data"),
+)
+def render_log_history(page_current, page_size, task_id):
+    if task_id is None:
+        return []
+    first = (page_current or 0) * page_size + 1
+    with get_db_session() as session:
+        lines = ScrapeLogRepository.get_logs_between(
+            session, task_id, first, first + page_size - 1
         )
+    return [
+        {
+            "line_no": line.line_no,
+            "created_at": line.created_at.strftime("%Y-%m-%d %H:%M:%S")
+            if line.created_at
+            else None,
+            "text": line.text,
+        }
+        for line in lines
+    ]
+
+
+app.clientside_callback(
+    """
+    function(url, lastLine) {
+        if (window.bggTaskEvents) window.bggTaskEvents.close();
+        if (!url) return '';
+        const source = new EventSource(lastLine ? url + '&after_line=' + lastLine : url);
+        const push = function(e) {
+            if (!document.getElementById('task-logs')) { source.close(); return; }
+            window.dash_clientside.set_props('task-event', {data: JSON.parse(e.data)});
+        };
+        source.addEventListener('task', push);
+        source.addEventListener('logs', push);
+        window.bggTaskEvents = source;
+        return '';
+    }
+    """,
+    Output("task-dummy-output", "children"),
+    Input("task-events-url", "data"),
+    State("task-last-line", "data"),
+)
+
+
+app.clientside_callback(
+    """
+    function(event, logs, lastLine) {
+        const no_update = window.dash_clientside.no_update;
+        if (!event) return [no_update, no_update, no_update, no_update];
+        if (event.type === 'logs') {
+            // the stream only sends lines after the last one seen; skip any replay
+            const fresh = event.lines.filter(function(l) { return l.line_no > (lastLine || 0); });
+            if (!fresh.length) return [no_update, no_update, no_update, no_update];
+            const lines = (logs ? logs.split('\\n') : []).concat(
+                fresh.map(function(l) { return l.line_no + ': ' + l.text; })
+            );
+            return [
+                no_update,
+                no_update,
+                lines.slice(-%d).join('\\n'),
+                fresh[fresh.length - 1].line_no,
+            ];
+        }
+        const t = event.task;
+        const p = function(text) {
+            return {type: 'P', namespace: 'dash_html_components', props: {children: text}};
+        };
+        const info = [
+            p('ID: ' + t.id),
+            p('Name: ' + t.name),
+            p('Status: ' + t.status),
+            p('Progress: ' + Math.round((t.progress || 0) * 100) + '%%'),
+            p('Current Page: ' + t.current_page),
+            p('Items Processed: ' + t.items_processed),
+            p('Message: ' + t.message),
+            p('Created At: ' + t.created_at),
+            p('Last Update: ' + t.last_update),
+        ];
+        return [t.name + ' (' + t.status + ')', info, no_update, no_update];
+    }
+    """
+    % MAX_LOG_LINES,
+    Output("task-title", "children", allow_duplicate=True),
+    Output("task-info", "children"),
+    Output("task-logs", "children", allow_duplicate=True),
+    Output("task-last-line", "data", allow_duplicate=True),
+    Input("task-event", "data"),
+    State("task-logs", "children"),
+    State("task-last-line", "data"),
+    prevent_initial_call=True,
+)
+
+
+app.clientside_callback(
+    """
+    function(lastLine, pageSize) {
+        return Math.max(1, Math.ceil((lastLine || 0) / pageSize));
+    }
+    """,
+    Output("task-log-history", "page_count", allow_duplicate=True),
+    Input("task-last-line", "data"),
+    State("task-log-history", "page_size"),
+    prevent_initial_call=True,
+)
@@ -0,0 +1,33 @@
+import argparse
+import os
+
+from scraping.reextract_boardgame_info import reextract_boardgames_info
+from scraping.snapshots import SnapshotStore
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Rebuild raw boardgame rows from saved page snapshots"
+    )
+    parser.add_argument(
+        "--snapshot-dir",
+        default=os.getenv("SNAPSHOT_DIR") or "snapshots",
+        help="snapshot store written by the scraper",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="number of processes parsing pages",
+    )
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    if not os.path.exists(os.path.join(args.snapshot_dir, "index.sqlite3")):
+        raise SystemExit(f"No snapshot store in {args.snapshot_dir}")
+
+    reextract_boardgames_info(
+        SnapshotStore(args.snapshot_dir),
+        workers=args.workers,
+        batch_size=args.batch_size,
+    )
@@ -1,6 +1,41 @@
+import argparse
+
 from scraping.scrape_boardgame_info import scrape_boardgames_info
 from scraping.scrape_boardgame_links import scrape_boardgames_links
 
 
-# scrape_boardgames_links(pages=10, log_to_console=True)
-scrape_boardgames_info(log_to_console=True)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape boardgame links or info pages")
+    parser.add_argument(
+        "--links",
+        type=int,
+        metavar="PAGES",
+        default=None,
+        help="scrape this many browse pages of boardgame links instead of info pages",
+    )
+    parser.add_argument(
+        "--task-id",
+        type=int,
+        default=None,
+        help="resume this info scrape task, skipping the games it already stored",
+    )
+    parser.add_argument(
+        "--fresh-days",
+        type=float,
+        default=7,
+        help="skip games scraped by any task within this many days (0 scrapes them again)",
+    )
+    parser.add_argument(
+        "--limit", type=int, default=None, help="scrape at most this many games"
+    )
+    args = parser.parse_args()
+
+    if args.links is not None:
+        scrape_boardgames_links(pages=args.links, log_to_console=True)
+    else:
+        scrape_boardgames_info(
+            task_id=args.task_id,
+            fresh_days=args.fresh_days,
+            limit=args.limit,
+            log_to_console=True,
+        )
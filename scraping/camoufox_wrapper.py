@@ -5,6 +5,7 @@ from playwright.sync_api import sync_playwright
 
 from backend.logger import ScrapeTaskLogger
 from scraping.page_wrapper import PageWrapper
+from scraping.resource_policy import ResourcePolicy, ResourceStats
 
 
 class CamoufoxWrapper:
@@ -45,12 +46,45 @@ class CamoufoxWrapper:
                 self._browser.close()
                 self._browser = None
 
-    def new_page(self, logger: Optional[ScrapeTaskLogger] = None) -> PageWrapper:
+    def new_page(
+        self,
+        logger: Optional[ScrapeTaskLogger] = None,
+        policy: Optional[ResourcePolicy] = None,
+    ) -> PageWrapper:
+        """Open a page; with `policy`, requests it denies are aborted.
+
+        Request counts (and blocked ones) are kept in `PageWrapper.resources`.
+        """
         if not self._browser:
             raise RuntimeError(
                 "Browser not started. Use start_browser() context manager."
             )
 
         page = self._browser.new_page()
+        stats = ResourceStats()
+
+        def on_response(response):
+            stats.requests += 1
+            length = response.headers.get("content-length")
+            if length and length.isdigit():
+                stats.bytes_loaded += int(length)
+
+        page.on("response", on_response)
+
+        if policy is not None:
+
+            def on_route(route):
+                request = route.request
+                if policy.blocks(request.resource_type, request.url):
+                    stats.requests += 1
+                    stats.blocked += 1
+                    stats.blocked_by_type[request.resource_type] += 1
+                    route.abort("blockedbyclient")
+                else:
+                    route.continue_()
+
+            # every request now makes a round trip to Python; that is cheap next to
+            # the downloads it saves
+            page.route("**/*", on_route)
 
-        return PageWrapper(page, logger)
+        return PageWrapper(page, logger, resources=stats)
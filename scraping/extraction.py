@@ -0,0 +1,180 @@
+"""Declarative extraction of boardgame pages in one browser round trip per page.
+
+Each page type has a selector map:
+    fields   key -> selector; text of the first match (None when missing)
+    lists    key -> selector; texts of all matches
+    outline  selector of `li.outline-item` rows whose title/description pairs are
+             merged into the result as title -> description
+
+`extract_page` ships the map to EXTRACT_JS, which walks the DOM inside the page and
+returns the whole result as one JSON object, instead of one Playwright call per
+element and per `inner_text`.
+
+`extract_html` does the same on saved HTML (see snapshots.py) with lxml and the XPath
+twins of the selectors in PAGE_XPATHS, without a browser. The two maps must be kept
+in step; `build_raw_payload` turns either result into the raw_data payload.
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from lxml import html as lxml_html
+
+if TYPE_CHECKING:
+    # offline extraction must not need playwright
+    from scraping.page_wrapper import PageWrapper
+
+PAGE_SELECTORS: Dict[str, Dict[str, Any]] = {
+    "credits": {
+        "fields": {
+            "player counts": 'li[itemprop="numberOfPlayers"]',
+            "year": "span.game-year",
+        },
+        "outline": "credits-module ul > li.outline-item",
+    },
+    "versions": {
+        "lists": {"dimensions": "span[ng-if=\"ldata.displaytype==='dimensions'\"]"},
+    },
+    "marketplace": {
+        "lists": {
+            "prices": "ul.shopping-listings > li.item-listing a[href] "
+            "span.item-listing__btn-text"
+        },
+    },
+    "stats": {
+        "outline": "div.panel-body > ul > li.outline-item",
+    },
+}
+
+OUTLINE_TITLE = "div.outline-item-title"
+OUTLINE_DESCRIPTION = "div.outline-item-description"
+
+
+def _class(name: str) -> str:
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+
+PAGE_XPATHS: Dict[str, Dict[str, Any]] = {
+    "credits": {
+        "fields": {
+            "player counts": '//li[@itemprop="numberOfPlayers"]',
+            "year": f"//span[{_class('game-year')}]",
+        },
+        "outline": f"//credits-module//ul/li[{_class('outline-item')}]",
+    },
+    "versions": {
+        "lists": {"dimensions": "//span[@ng-if=\"ldata.displaytype==='dimensions'\"]"},
+    },
+    "marketplace": {
+        "lists": {
+            "prices": f"//ul[{_class('shopping-listings')}]/li[{_class('item-listing')}]"
+            f"//a[@href]//span[{_class('item-listing__btn-text')}]"
+        },
+    },
+    "stats": {
+        "outline": f"//div[{_class('panel-body')}]/ul/li[{_class('outline-item')}]",
+    },
+}
+
+OUTLINE_TITLE_XPATH = f".//div[{_class('outline-item-title')}]"
+OUTLINE_DESCRIPTION_XPATH = f".//div[{_class('outline-item-description')}]"
+
+# elements that start a new line in innerText
+_BLOCK_TAGS = set(
+    "address article dd div dl dt h1 h2 h3 h4 h5 h6 header li ol p section table tr ul".split()
+)
+
+# fields and lists read textContent (as Locator.text_content did), outline rows read
+# innerText (as ElementHandle.inner_text did), so the payloads keep their old shape
+EXTRACT_JS = """
+([spec, titleSelector, descriptionSelector]) => {
+    const result = {};
+    for (const [key, selector] of Object.entries(spec.fields || {})) {
+        const el = document.querySelector(selector);
+        result[key] = el ? el.textContent : null;
+    }
+    for (const [key, selector] of Object.entries(spec.lists || {})) {
+        result[key] = Array.from(document.querySelectorAll(selector), (el) => el.textContent);
+    }
+    if (spec.outline) {
+        for (const item of document.querySelectorAll(spec.outline)) {
+            const title = item.querySelector(titleSelector);
+            const description = item.querySelector(descriptionSelector);
+            if (title && description) result[title.innerText] = description.innerText;
+        }
+    }
+    return result;
+}
+"""
+
+
+def extract_page(page: "PageWrapper", page_type: str) -> Dict[str, Any]:
+    """Extract the current page with the selector map of `page_type`."""
+    return page.evaluate_js_with_args(
+        EXTRACT_JS, [PAGE_SELECTORS[page_type], OUTLINE_TITLE, OUTLINE_DESCRIPTION]
+    )
+
+
+def _inner_text(element) -> str:
+    """Approximate innerText: block elements and <br> become line breaks."""
+    parts: List[str] = []
+
+    def walk(el) -> None:
+        if not isinstance(el.tag, str) or el.tag in ("script", "style"):
+            return
+        block = el.tag in _BLOCK_TAGS
+        if block:
+            parts.append("\n")
+        if el.tag == "br":
+            parts.append("\n")
+        parts.append(el.text or "")
+        for child in el:
+            walk(child)
+            parts.append(child.tail or "")
+        if block:
+            parts.append("\n")
+
+    walk(element)
+    lines = "".join(parts).split("\n")
+    return "\n".join(line for line in lines if line.strip()).strip()
+
+
+def extract_html(html: str, page_type: str) -> Dict[str, Any]:
+    """`extract_page` for saved HTML, using lxml instead of the browser."""
+    spec = PAGE_XPATHS[page_type]
+    tree = lxml_html.fromstring(html)
+    result: Dict[str, Any] = {}
+    for key, xpath in spec.get("fields", {}).items():
+        found = tree.xpath(xpath)
+        result[key] = found[0].text_content() if found else None
+    for key, xpath in spec.get("lists", {}).items():
+        result[key] = [el.text_content() for el in tree.xpath(xpath)]
+    if "outline" in spec:
+        for item in tree.xpath(spec["outline"]):
+            title = item.xpath(OUTLINE_TITLE_XPATH)
+            description = item.xpath(OUTLINE_DESCRIPTION_XPATH)
+            if title and description:
+                result[_inner_text(title[0])] = _inner_text(description[0])
+    return result
+
+
+def _normalize_text(value: str) -> str:
+    # remove tabs and collapse consecutive spaces to a single space, preserve newlines
+    return "\n".join(" ".join(line.replace("\t", " ").split()) for line in value.split("\n"))
+
+
+def build_raw_payload(
+    game_id: int, name: Optional[str], url: Optional[str], pages: Dict[str, Dict[str, Any]]
+) -> Dict[str, Any]:
+    """The raw_data payload of a game from its extracted pages (keyed by page type)."""
+    payload: Dict[str, Any] = {"id": game_id, "name": name, "url": url}
+    for page_type in PAGE_SELECTORS:
+        payload.update(pages.get(page_type, {}))
+    if "dimensions" in payload:
+        payload["dimensions"] = list(set(payload["dimensions"]))
+
+    for key, value in payload.items():
+        if isinstance(value, str):
+            payload[key] = _normalize_text(value)
+        elif isinstance(value, list):
+            payload[key] = [_normalize_text(v) for v in value]
+    return payload
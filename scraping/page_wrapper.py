@@ -1,14 +1,25 @@
-from playwright.sync_api import Page, Locator
+from playwright.sync_api import Page, Locator, TimeoutError as PlaywrightTimeoutError
 from typing import Optional, Any
 import random
+import time
 
 from backend.logger import ScrapeTaskLogger
+from scraping.readiness import ANGULAR_SETTLED_JS, ReadyCondition, WaitStats
+from scraping.resource_policy import ResourceStats
 
 
 class PageWrapper:
-    def __init__(self, page: Page, logger: Optional[ScrapeTaskLogger]):
+    def __init__(
+        self,
+        page: Page,
+        logger: Optional[ScrapeTaskLogger],
+        resources: Optional[ResourceStats] = None,
+    ):
         self.page = page
         self.logger = logger
+        # filled in by the page's request listeners (see CamoufoxWrapper.new_page)
+        self.resources = resources if resources is not None else ResourceStats()
+        self.wait_stats = WaitStats()
 
     def _print_error(self, context: str, e: Exception):
         import traceback
@@ -171,6 +182,37 @@ class PageWrapper:
             self._print_error("waiting for network idle", e)
             raise
 
+    def wait_ready(self, condition: ReadyCondition, label: Optional[str] = None) -> float:
+        """Wait until `condition` holds or its timeout runs out; returns the seconds waited.
+
+        Running out is not an error: the page is used as it is and the wait is recorded
+        as timed out in `wait_stats` under `label` (default: the condition).
+        """
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            if condition.kind == "selector":
+                self.page.wait_for_selector(
+                    condition.selector, state="attached", timeout=condition.timeout_ms
+                )
+            elif condition.kind == "network_idle":
+                self.page.wait_for_load_state("networkidle", timeout=condition.timeout_ms)
+            elif condition.kind == "angular":
+                self.page.wait_for_function(
+                    ANGULAR_SETTLED_JS, arg=condition.selector, timeout=condition.timeout_ms
+                )
+            else:
+                raise ValueError(f"Unknown ready condition '{condition.kind}'")
+        except PlaywrightTimeoutError:
+            timed_out = True
+        except Exception as e:
+            self._print_error(f"waiting for {condition}", e)
+            raise
+
+        waited = time.perf_counter() - start
+        self.wait_stats.record(label or str(condition), waited, timed_out)
+        return waited
+
     def exists(self, selector: str, has_text: str | None = None) -> bool:
         try:
             return self.page.locator(selector, has_text=has_text).first is not None
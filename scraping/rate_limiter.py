@@ -0,0 +1,55 @@
+"""Per-host politeness delay between page loads.
+
+Requests to one host start at least `min_interval` seconds apart (plus up to
+`jitter` of that, at random). The interval runs from the previous request's start,
+so time spent loading and extracting a page counts toward it: a slow page costs no
+extra delay, a fast one waits out the remainder.
+
+SCRAPE_MIN_INTERVAL_MS (default 750) and SCRAPE_INTERVAL_JITTER (default 0.5)
+configure `HostRateLimiter.from_env`.
+"""
+
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict
+from urllib.parse import urlsplit
+
+
+class HostRateLimiter:
+    def __init__(
+        self,
+        min_interval: float,
+        jitter: float = 0.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._next_slot: Dict[str, float] = {}
+        self.waited = 0.0
+
+    @classmethod
+    def from_env(cls) -> "HostRateLimiter":
+        return cls(
+            int(os.getenv("SCRAPE_MIN_INTERVAL_MS", "750")) / 1000,
+            float(os.getenv("SCRAPE_INTERVAL_JITTER", "0.5")),
+        )
+
+    def wait(self, url: str) -> float:
+        """Block until a request to `url`'s host may start; returns the seconds waited."""
+        host = urlsplit(url).hostname or ""
+        interval = self.min_interval * (1 + random.uniform(0, self.jitter))
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_slot.get(host, now))
+            # reserve the slot before sleeping, so concurrent callers queue up behind it
+            self._next_slot[host] = start + interval
+        delay = start - now
+        if delay > 0:
+            self._sleep(delay)
+        with self._lock:
+            self.waited += delay
+        return delay
@@ -0,0 +1,82 @@
+"""Page readiness conditions and how long waiting for them took.
+
+Instead of a fixed pause after every navigation, each page type names the condition
+that means its data is in the DOM (see PAGE_READY in scrape_boardgame_info.py):
+
+    selector(css)        an element matching `css` is attached
+    network_idle()       no requests for 500 ms (Playwright's networkidle)
+    angular_settled(css) AngularJS has no $http request in flight and, if given,
+                         `css` is attached, i.e. the ng-if/ng-repeat it sits in resolved
+
+Every condition has a fallback timeout: when it runs out the page is extracted as it
+is (a marketplace page that keeps polling never goes idle) and the wait is counted as
+timed out. `PageWrapper.wait_ready` records each wait in `WaitStats`.
+"""
+
+import math
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+# true once AngularJS is bootstrapped and idle; pages without angular count as idle
+ANGULAR_SETTLED_JS = """
+(selector) => {
+    if (selector && !document.querySelector(selector)) return false;
+    const angular = window.angular;
+    if (!angular) return document.readyState !== 'loading';
+    const root = document.querySelector('[ng-app], [data-ng-app]') || document.body;
+    const injector = angular.element(root).injector();
+    return !!injector && injector.get('$http').pendingRequests.length === 0;
+}
+"""
+
+
+@dataclass(frozen=True)
+class ReadyCondition:
+    kind: str  # "selector", "network_idle" or "angular"
+    selector: Optional[str] = None
+    timeout_ms: int = 5000
+
+    def __str__(self) -> str:
+        return f"{self.kind}({self.selector})" if self.selector else self.kind
+
+
+def selector(css: str, timeout_ms: int = 5000) -> ReadyCondition:
+    return ReadyCondition("selector", css, timeout_ms)
+
+
+def network_idle(timeout_ms: int = 5000) -> ReadyCondition:
+    return ReadyCondition("network_idle", None, timeout_ms)
+
+
+def angular_settled(css: Optional[str] = None, timeout_ms: int = 5000) -> ReadyCondition:
+    return ReadyCondition("angular", css, timeout_ms)
+
+
+class WaitStats:
+    """Per-label count, total and worst wait, and how many waits timed out."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waits: Dict[str, List[float]] = {}
+        self._timeouts: Dict[str, int] = {}
+
+    def record(self, label: str, seconds: float, timed_out: bool) -> None:
+        with self._lock:
+            self._waits.setdefault(label, []).append(seconds)
+            if timed_out:
+                self._timeouts[label] = self._timeouts.get(label, 0) + 1
+
+    def summary(self) -> str:
+        with self._lock:
+            lines = []
+            for label, waits in sorted(self._waits.items()):
+                ordered = sorted(waits)
+                lines.append(
+                    f"{label}: {len(waits)} waits, "
+                    f"mean {sum(waits) / len(waits):.2f}s, "
+                    f"p95 {ordered[math.ceil(0.95 * len(ordered)) - 1]:.2f}s, "
+                    f"max {ordered[-1]:.2f}s, "
+                    f"{self._timeouts.get(label, 0)} timed out"
+                )
+            return "\n".join(lines)
@@ -0,0 +1,123 @@
+"""Rebuild raw boardgame rows from saved page snapshots, without a browser.
+
+After a selector fix, update PAGE_XPATHS in extraction.py and run
+`python reextract.py`: the latest snapshot of every page of every game is parsed
+with lxml in worker processes, and the payloads are loaded as a new
+`reextract_boardgames_info` task through COPY. `clean.py` then picks the new rows
+up like any freshly scraped ones.
+"""
+
+import multiprocessing
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from backend.database.db import get_db_session
+from backend.database.schemas import RawDataIn
+from backend.logger import ScrapeTaskLogger
+from backend.repositories import BoardGameRepository, RawDataRepository
+from scraping.extraction import build_raw_payload, extract_html
+from scraping.snapshots import Snapshot, SnapshotStore
+
+ExtractJob = Tuple[str, int, Dict[str, Snapshot]]
+ExtractResult = Tuple[int, Dict[str, Dict[str, Any]], Optional[str]]
+
+# one store per worker process, opened on first use
+_stores: Dict[str, SnapshotStore] = {}
+
+
+def extract_game(job: ExtractJob) -> ExtractResult:
+    """Extract every saved page of (store root, game id, snapshots); returns
+    (game id, pages by page type, error)."""
+    root, game_id, snapshots = job
+    store = _stores.get(root)
+    if store is None:
+        store = _stores[root] = SnapshotStore(root)
+    try:
+        pages = {
+            page_type: extract_html(store.load(snapshot), page_type)
+            for page_type, snapshot in snapshots.items()
+        }
+        return game_id, pages, None
+    except Exception as e:
+        return game_id, {}, f"{type(e).__name__}: {e}"
+
+
+def extract_games(
+    store: SnapshotStore, workers: int = 1
+) -> Iterator[ExtractResult]:
+    """Extract the latest snapshots of every game in `store`, in game id order."""
+    jobs = (
+        (store.root, game_id, snapshots) for game_id, snapshots in store.iter_latest()
+    )
+    if workers <= 1:
+        yield from map(extract_game, jobs)
+        return
+
+    # parsing is pure CPU and touches no database connection, so forked workers are fine
+    with multiprocessing.Pool(workers) as pool:
+        yield from pool.imap(extract_game, jobs, chunksize=64)
+
+
+def reextract_boardgames_info(
+    store: SnapshotStore,
+    workers: int = 1,
+    batch_size: int = 1000,
+    log_to_console: bool = True,
+):
+    with ScrapeTaskLogger(
+        task_name="reextract_boardgames_info",
+        log_to_console=log_to_console,
+        buffered=True,
+    ) as logger:
+        logger.log(f"Started, snapshots from {store.root}")
+
+        with get_db_session() as session:
+            boardgames = {b.id: b for b in BoardGameRepository.get_all(session)}
+
+        start = time.perf_counter()
+        loaded = 0
+        errors = 0
+        batch: List[RawDataIn] = []
+
+        def flush():
+            nonlocal loaded
+            with get_db_session() as session:
+                loaded += RawDataRepository.copy_insert(session, batch)
+            batch.clear()
+            rate = loaded / (time.perf_counter() - start)
+            logger.update_progress(
+                items_processed=loaded, message=f"Re-extracted {loaded} games"
+            )
+            logger.log(f"Re-extracted {loaded} games ({errors} errors, {rate:.0f} games/s)")
+
+        for game_id, pages, error in extract_games(store, workers):
+            if error is not None:
+                errors += 1
+                logger.log(f"Failed to re-extract game {game_id}: {error}")
+                continue
+
+            boardgame = boardgames.get(game_id)
+            batch.append(
+                RawDataIn(
+                    source_table="boardgames",
+                    source_id=game_id,
+                    scrape_task_id=logger.task_id,
+                    payload=build_raw_payload(
+                        game_id,
+                        boardgame.name if boardgame else None,
+                        boardgame.url if boardgame else None,
+                        pages,
+                    ),
+                )
+            )
+            if len(batch) >= batch_size:
+                flush()
+
+        if batch:
+            flush()
+
+        logger.update_progress(progress=1.0, items_processed=loaded)
+        logger.log(
+            f"Re-extraction complete: {loaded} games, {errors} errors "
+            f"in {time.perf_counter() - start:.1f}s"
+        )
@@ -0,0 +1,110 @@
+"""Which subresources a scraping page may load, and counters of what it did.
+
+Each page load pulls fonts, media, analytics and ad scripts the extractors never
+read. `ResourcePolicy` decides per request from its Playwright resource type and
+URL; `CamoufoxWrapper.new_page` installs it with `page.route`, so denied requests
+are aborted before they leave the browser.
+
+A request is blocked when its type is in `block_types` or its URL matches one of
+`block_urls`, unless its URL matches one of `allow_urls`. URL patterns are globs
+(`*` matches anything, including `/`).
+
+SCRAPE_BLOCK_TYPES and SCRAPE_BLOCK_URLS (comma separated) replace the defaults;
+SCRAPE_BLOCK_TYPES=off disables the policy.
+"""
+
+import fnmatch
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterable, Optional, Tuple
+
+# documents, scripts, stylesheets and XHR build the DOM the extractors read
+DEFAULT_BLOCK_TYPES = ("image", "media", "font")
+
+DEFAULT_BLOCK_URLS = (
+    "*google-analytics.com/*",
+    "*googletagmanager.com/*",
+    "*googlesyndication.com/*",
+    "*doubleclick.net/*",
+    "*adnxs.com/*",
+    "*amazon-adsystem.com/*",
+    "*scorecardresearch.com/*",
+    "*quantserve.com/*",
+    "*facebook.net/*",
+    "*hotjar.com/*",
+    "*nitropay.com/*",
+)
+
+
+def _compile(patterns: Iterable[str]) -> Optional["re.Pattern[str]"]:
+    patterns = [p for p in patterns if p]
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in patterns))
+
+
+class ResourcePolicy:
+    def __init__(
+        self,
+        block_types: Iterable[str] = DEFAULT_BLOCK_TYPES,
+        block_urls: Iterable[str] = DEFAULT_BLOCK_URLS,
+        allow_urls: Iterable[str] = (),
+    ):
+        self.block_types = frozenset(block_types)
+        self._block_urls = _compile(block_urls)
+        self._allow_urls = _compile(allow_urls)
+
+    @classmethod
+    def from_env(cls) -> Optional["ResourcePolicy"]:
+        types = os.getenv("SCRAPE_BLOCK_TYPES")
+        if types is not None and types.strip().lower() == "off":
+            return None
+        urls = os.getenv("SCRAPE_BLOCK_URLS")
+        return cls(
+            block_types=DEFAULT_BLOCK_TYPES if types is None else _split(types),
+            block_urls=DEFAULT_BLOCK_URLS if urls is None else _split(urls),
+        )
+
+    def blocks(self, resource_type: str, url: str) -> bool:
+        if self._allow_urls is not None and self._allow_urls.match(url):
+            return False
+        if resource_type in self.block_types:
+            return True
+        return self._block_urls is not None and bool(self._block_urls.match(url))
+
+
+def _split(value: str) -> Tuple[str, ...]:
+    return tuple(v.strip() for v in value.split(",") if v.strip())
+
+
+@dataclass
+class ResourceStats:
+    """Requests seen by one page. Bytes come from Content-Length, so responses without
+    one (chunked) count as a request but not toward the bytes."""
+
+    requests: int = 0
+    blocked: int = 0
+    bytes_loaded: int = 0
+    blocked_by_type: Counter = field(default_factory=Counter)
+
+    def copy(self) -> "ResourceStats":
+        return ResourceStats(
+            self.requests, self.blocked, self.bytes_loaded, Counter(self.blocked_by_type)
+        )
+
+    def since(self, earlier: "ResourceStats") -> "ResourceStats":
+        """The requests made after `earlier` was copied."""
+        return ResourceStats(
+            self.requests - earlier.requests,
+            self.blocked - earlier.blocked,
+            self.bytes_loaded - earlier.bytes_loaded,
+            self.blocked_by_type - earlier.blocked_by_type,
+        )
+
+    def __str__(self) -> str:
+        return (
+            f"{self.requests} requests, {self.blocked} blocked, "
+            f"{self.bytes_loaded / 1024:.0f} KiB loaded"
+        )
@@ -1,4 +1,6 @@
-from typing import cast
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, cast
 
 from backend.database.db import get_db_session
 from backend.logger import ScrapeTaskLogger
@@ -6,7 +8,12 @@ from backend.repositories import BoardGameRepository, ScrapeTaskRepository
 from backend.database.schemas import BoardGameIn, RawDataIn
 from backend.repositories.raw_data_repository import RawDataRepository
 from scraping.camoufox_wrapper import CamoufoxWrapper
+from scraping.extraction import PAGE_SELECTORS, build_raw_payload, extract_page
+from scraping import readiness
 from scraping.page_wrapper import PageWrapper
+from scraping.rate_limiter import HostRateLimiter
+from scraping.resource_policy import ResourcePolicy
+from scraping.snapshots import SnapshotStore
 
 
 def login(page: PageWrapper, logger: ScrapeTaskLogger) -> bool:
@@ -50,26 +57,108 @@ def login(page: PageWrapper, logger: ScrapeTaskLogger) -> bool:
     return logged_in
 
 
-def scrape_boardgames_info(log_to_console: bool = True):
+# page type -> path under the game's URL
+PAGE_PATHS = {
+    "credits": "/credits",
+    "versions": "/versions?showcount=50",
+    "marketplace": "/marketplace/stores",
+    "stats": "/stats",
+}
+
+# what "the data is in the DOM" means for each page type; on timeout the page is
+# extracted as it is (not every game has versions or store listings)
+PAGE_READY = {
+    "credits": readiness.selector(PAGE_SELECTORS["credits"]["outline"]),
+    # no selector: a game without versions never renders a dimensions span, and
+    # waiting for one would run every such game into the timeout
+    "versions": readiness.angular_settled(),
+    "marketplace": readiness.network_idle(timeout_ms=3000),
+    "stats": readiness.selector(PAGE_SELECTORS["stats"]["outline"]),
+}
+
+
+def _visit(
+    page: PageWrapper,
+    url: str,
+    page_type: str,
+    timings: Dict[str, float],
+    limiter: Optional[HostRateLimiter] = None,
+    snapshots: Optional[SnapshotStore] = None,
+    game_id: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Open `url` once the rate limiter allows, wait until it is ready and extract it.
+
+    Adds to the rate_limit, navigation, ready and extraction timings. With
+    `snapshots`, the loaded page is saved for offline re-extraction.
+    """
+    if limiter is not None:
+        timings["rate_limit"] += limiter.wait(url)
+
+    start = time.perf_counter()
+    page.goto(url)
+    timings["navigation"] += time.perf_counter() - start
+
+    timings["ready"] += page.wait_ready(PAGE_READY[page_type], label=page_type)
+
+    start = time.perf_counter()
+    data = extract_page(page, page_type)
+    timings["extraction"] += time.perf_counter() - start
+
+    if snapshots is not None and game_id is not None:
+        try:
+            snapshots.save(game_id, page_type, url, page.content())
+        except Exception as e:
+            # a snapshot is a convenience; never lose the scrape over it
+            print(f"Failed to save snapshot of {url}: {e}")
+    return data
+
+
+def scrape_boardgames_info(
+    task_id: Optional[int] = None,
+    fresh_days: float = 7,
+    limit: Optional[int] = None,
+    log_to_console: bool = True,
+):
+    """Scrape the info pages of every game that still needs it.
+
+    Each game's raw row is committed as soon as it is scraped, so those rows are the
+    checkpoint: passing the `task_id` of an interrupted run resumes that task and
+    skips the games it already stored. Games scraped by any task in the last
+    `fresh_days` days are skipped too (0 disables that).
+    """
     with ScrapeTaskLogger(
-        task_name="scrape_boardgames_info", log_to_console=log_to_console
+        task_name="scrape_boardgames_info",
+        task_id=task_id,
+        log_to_console=log_to_console,
+        buffered=True,
     ) as logger:
-        logger.log("Started")
+        logger.log("Started" if task_id is None else f"Resumed task {task_id}")
 
-        boardgames = []
+        fresh_since = (
+            datetime.now(timezone.utc) - timedelta(days=fresh_days)
+            if fresh_days > 0
+            else None
+        )
         with get_db_session() as session:
-            boardgames = BoardGameRepository.get_all(session)
+            boardgames = BoardGameRepository.get_scrape_queue(
+                session, task_id=logger.task_id, fresh_since=fresh_since, limit=limit
+            )
+            task = ScrapeTaskRepository.get_by_id.uncached(session, logger.task_id)
 
         if len(boardgames) == 0:
-            logger.fail("No boardgames found in database, aborting scrape")
+            logger.log("No boardgames left to scrape")
             return
 
-        boardgames = boardgames[:20]
+        logger.log(f"{len(boardgames)} boardgames to scrape")
 
-        items_processed = 0
+        # a resumed task keeps counting from where it stopped
+        items_processed = (task.items_processed or 0) if task is not None else 0
+        total = items_processed + len(boardgames)
+        snapshots = SnapshotStore.from_env()
+        limiter = HostRateLimiter.from_env()
 
         with CamoufoxWrapper().start_browser() as browser:
-            page = browser.new_page(logger)
+            page = browser.new_page(logger, policy=ResourcePolicy.from_env())
 
             logged_in = login(page, logger)
             if not logged_in:
@@ -78,101 +167,30 @@ def scrape_boardgames_info(log_to_console: bool = True):
 
             logger.log("Login successful")
 
-            for i, boardgame in enumerate(boardgames):
-                raw_game_data = {
-                    "id": boardgame.id,
-                    "name": boardgame.name,
-                    "url": boardgame.url,
-                }
-
+            for boardgame in boardgames:
                 boardgame_url = f"https://boardgamegeek.com{boardgame.url}"
 
-                page.goto(f"{boardgame_url}/credits")
-                page.sleep_random(500, 1000)
-
-                raw_game_data["player counts"] = page.get_text(
-                    'li[itemprop="numberOfPlayers"]'
+                timings = dict.fromkeys(
+                    ["rate_limit", "navigation", "ready", "extraction"], 0.0
                 )
-
-                raw_game_data["year"] = page.get_text("span.game-year")
-
-                detail_elms = page.locator("credits-module ul > li.outline-item")
-
-                for detail_elm in detail_elms.element_handles():
-                    classification_name = detail_elm.query_selector(
-                        "div.outline-item-title"
+                resources_before = page.resources.copy()
+                pages = {
+                    page_type: _visit(
+                        page,
+                        f"{boardgame_url}{path}",
+                        page_type,
+                        timings,
+                        limiter=limiter,
+                        snapshots=snapshots,
+                        game_id=cast(int, boardgame.id),
                     )
-                    value = detail_elm.query_selector("div.outline-item-description")
-
-                    if not classification_name:
-                        continue
-                    if not value:
-                        continue
-
-                    classification_name = classification_name.inner_text()
-                    value = value.inner_text()
-
-                    raw_game_data[classification_name] = value
-                    pass
-
-                page.goto(f"{boardgame_url}/versions?showcount=50")
-                page.sleep_random(500, 1000)
-
-                page.wait_for_selector(
-                    "span[ng-if=\"ldata.displaytype==='dimensions'\"]"
-                )
-
-                dimensions = page.get_texts(
-                    "span[ng-if=\"ldata.displaytype==='dimensions'\"]"
-                )
-                raw_game_data["dimensions"] = list(
-                    set(dimensions if dimensions is not None else [])
-                )
-
-                page.goto(f"{boardgame_url}/marketplace/stores")
-                page.sleep_random(500, 1000)
+                    for page_type, path in PAGE_PATHS.items()
+                }
 
-                raw_game_data["prices"] = page.get_texts(
-                    "ul.shopping-listings > li.item-listing a[href] span.item-listing__btn-text"
+                raw_game_data = build_raw_payload(
+                    cast(int, boardgame.id), boardgame.name, boardgame.url, pages
                 )
 
-                page.goto(f"{boardgame_url}/stats")
-                page.sleep_random(500, 1000)
-
-                stat_elms = page.locator("div.panel-body > ul > li.outline-item")
-                for stat_elm in stat_elms.element_handles():
-                    stat_name = stat_elm.query_selector("div.outline-item-title")
-                    stat_value = stat_elm.query_selector("div.outline-item-description")
-
-                    if not stat_name:
-                        continue
-                    if not stat_value:
-                        continue
-
-                    stat_name = stat_name.inner_text()
-                    stat_value = stat_value.inner_text()
-
-                    raw_game_data[stat_name] = stat_value
-
-                # clean data by removing tabs and collapsing spaces
-                for key, value in raw_game_data.items():
-                    # remove tabs and collapse consecutive spaces to a single space, preserve newlines
-                    if isinstance(value, str):
-                        value = "\n".join(
-                            " ".join(line.replace("\t", " ").split())
-                            for line in value.split("\n")
-                        )
-                        raw_game_data[key] = value
-                    elif isinstance(value, list):
-                        value = [
-                            "\n".join(
-                                " ".join(line.replace("\t", " ").split())
-                                for line in v.split("\n")
-                            )
-                            for v in value
-                        ]
-                        raw_game_data[key] = value
-
                 with get_db_session() as session:
                     RawDataRepository.create(
                         session,
@@ -185,13 +203,21 @@ def scrape_boardgames_info(log_to_console: bool = True):
                     )
 
                 logger.log(
-                    f"Inserted/updated raw boardgame data for '{boardgame.name}'"
+                    f"Inserted/updated raw boardgame data for '{boardgame.name}' "
+                    f"(rate limit {timings['rate_limit']:.2f}s, "
+                    f"navigation {timings['navigation']:.2f}s, "
+                    f"ready {timings['ready']:.2f}s, "
+                    f"extraction {timings['extraction']:.3f}s, "
+                    f"{page.resources.since(resources_before)})"
                 )
 
                 items_processed += 1
 
                 logger.update_progress(
-                    progress=i / len(boardgames),
+                    progress=items_processed / total,
                     items_processed=items_processed,
                     message=f"Processed: {boardgame.name}",
                 )
+
+            logger.log(f"Readiness waits by page type:\n{page.wait_stats.summary()}")
+            logger.log(f"Rate limiter waited {limiter.waited:.1f}s in total")
@@ -49,7 +49,7 @@ def login(page: PageWrapper, logger: ScrapeTaskLogger) -> bool:
 
 def scrape_boardgames_links(pages: int = 10, log_to_console: bool = True):
     with ScrapeTaskLogger(
-        task_name="scrape_boardgames_links", log_to_console=log_to_console
+        task_name="scrape_boardgames_links", log_to_console=log_to_console, buffered=True
     ) as logger:
         logger.log("Started")
 
@@ -0,0 +1,174 @@
+"""On-disk store of fetched boardgame pages, for re-extraction without a browser.
+
+Every page the scraper loads is saved here (`PageWrapper.content()`, i.e. the
+rendered DOM). Bodies are content-addressed: stored once per distinct HTML as
+`objects/<sha256[:2]>/<sha256>.html.gz`, so refetching an unchanged page costs
+an index row, not another copy. `index.sqlite3` maps (game id, page type, fetch
+time) to the body's hash and URL.
+
+Only the newest SNAPSHOT_KEEP (default 3, 0 = unlimited) snapshots of each page
+are kept; saving a newer one drops the oldest index rows and deletes bodies no row
+refers to any more, so the store grows with the catalogue, not with every rescrape.
+
+SNAPSHOT_DIR selects the directory (default `snapshots`); set it to an empty
+string to stop saving snapshots. See `scraping/reextract_boardgame_info.py` for
+turning snapshots back into raw rows.
+"""
+
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+@dataclass
+class Snapshot:
+    game_id: int
+    page_type: str
+    url: str
+    fetched_at: datetime
+    digest: str
+
+
+class SnapshotStore:
+    def __init__(self, root: str, keep: int = 3):
+        self.root = root
+        self.keep = keep
+        self._local = threading.local()
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+
+    @classmethod
+    def from_env(cls) -> Optional["SnapshotStore"]:
+        root = os.getenv("SNAPSHOT_DIR", "snapshots")
+        return cls(root, int(os.getenv("SNAPSHOT_KEEP", "3"))) if root else None
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(
+                os.path.join(self.root, "index.sqlite3"), timeout=30, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS snapshots ("
+                " game_id INTEGER NOT NULL, page_type TEXT NOT NULL,"
+                " fetched_at TEXT NOT NULL, url TEXT NOT NULL, digest TEXT NOT NULL,"
+                " PRIMARY KEY (game_id, page_type, fetched_at))"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS snapshots_digest ON snapshots (digest)"
+            )
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.root, "objects", digest[:2], f"{digest}.html.gz")
+
+    def save(
+        self,
+        game_id: int,
+        page_type: str,
+        url: str,
+        html: str,
+        fetched_at: Optional[datetime] = None,
+    ) -> Snapshot:
+        body = html.encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+        snapshot = Snapshot(
+            game_id, page_type, url, fetched_at or datetime.now(timezone.utc), digest
+        )
+
+        connection = self._connection()
+        # one writer at a time, so pruning never deletes a body another save just reused
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # write under a temporary name so a crash never leaves a truncated object
+                tmp = f"{path}.{os.getpid()}.tmp"
+                with gzip.open(tmp, "wb", compresslevel=6) as f:
+                    f.write(body)
+                os.replace(tmp, path)
+            connection.execute(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?)",
+                (game_id, page_type, snapshot.fetched_at.isoformat(), url, digest),
+            )
+            if self.keep > 0:
+                self._prune(connection, game_id, page_type)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return snapshot
+
+    def _prune(self, connection: sqlite3.Connection, game_id: int, page_type: str) -> None:
+        """Drop all but the newest `keep` snapshots of a page, and orphaned bodies."""
+        stale = connection.execute(
+            "SELECT fetched_at, digest FROM snapshots WHERE game_id = ? AND page_type = ? "
+            "ORDER BY fetched_at DESC LIMIT -1 OFFSET ?",
+            (game_id, page_type, self.keep),
+        ).fetchall()
+        if not stale:
+            return
+        connection.execute(
+            "DELETE FROM snapshots WHERE game_id = ? AND page_type = ? AND fetched_at <= ?",
+            (game_id, page_type, stale[0][0]),
+        )
+        for digest in {digest for _, digest in stale}:
+            referenced = connection.execute(
+                "SELECT 1 FROM snapshots WHERE digest = ? LIMIT 1", (digest,)
+            ).fetchone()
+            if referenced is None:
+                try:
+                    os.remove(self._object_path(digest))
+                except FileNotFoundError:
+                    pass
+
+    def load(self, snapshot: Snapshot) -> str:
+        with gzip.open(self._object_path(snapshot.digest), "rb") as f:
+            return f.read().decode("utf-8")
+
+    @staticmethod
+    def _snapshot(row: Tuple) -> Snapshot:
+        game_id, page_type, fetched_at, url, digest = row
+        return Snapshot(game_id, page_type, url, datetime.fromisoformat(fetched_at), digest)
+
+    def history(self, game_id: int, page_type: str) -> List[Snapshot]:
+        """Every snapshot of one page, oldest first."""
+        rows = self._connection().execute(
+            "SELECT * FROM snapshots WHERE game_id = ? AND page_type = ? ORDER BY fetched_at",
+            (game_id, page_type),
+        )
+        return [self._snapshot(row) for row in rows]
+
+    def latest(self, game_id: int) -> Dict[str, Snapshot]:
+        """The most recent snapshot of each page type of a game."""
+        rows = self._connection().execute(
+            "SELECT game_id, page_type, max(fetched_at), url, digest FROM snapshots "
+            "WHERE game_id = ? GROUP BY page_type",
+            (game_id,),
+        )
+        return {row[1]: self._snapshot(row) for row in rows}
+
+    def iter_latest(self) -> Iterator[Tuple[int, Dict[str, Snapshot]]]:
+        """(game id, latest snapshot per page type) for every game, by game id."""
+        # SQLite returns the bare columns of the row holding max(fetched_at)
+        rows = self._connection().execute(
+            "SELECT game_id, page_type, max(fetched_at), url, digest FROM snapshots "
+            "GROUP BY game_id, page_type ORDER BY game_id"
+        )
+        game_id, pages = None, {}
+        for row in rows:
+            if row[0] != game_id and pages:
+                yield game_id, pages
+                pages = {}
+            game_id = row[0]
+            pages[row[1]] = self._snapshot(row)
+        if pages:
+            yield game_id, pages
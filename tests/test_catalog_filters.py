@@ -0,0 +1,64 @@
+import dash
+import pytest
+
+from backend.database.schemas import CleanBoardGameFilter
+from backend.repositories import CleanBoardGameRepository
+
+# registering a page needs an app created with use_pages
+dash.Dash(__name__, use_pages=True, pages_folder="")
+
+from pages.catalog import parse_filter_query  # noqa: E402
+
+
+def _filter(column, op, value):
+    return CleanBoardGameFilter(column=column, op=op, value=value)
+
+
+def test_numeric_columns_compare():
+    assert parse_filter_query("{year_released} >= 2000 && {avg_rating} < 7.5") == [
+        _filter("year_released", "ge", 2000),
+        _filter("avg_rating", "lt", 7.5),
+    ]
+
+
+@pytest.mark.parametrize("symbol", ["contains", "icontains", "scontains"])
+def test_numeric_columns_reject_contains(symbol):
+    assert parse_filter_query(f"{{year_released}} {symbol} 201") == []
+    assert parse_filter_query(f"{{avg_rating}} {symbol} 8") == []
+
+
+def test_array_columns_only_take_contains():
+    assert parse_filter_query("{categories} contains Economic") == [
+        _filter("categories", "contains", "Economic")
+    ]
+    assert parse_filter_query("{mechanics} scontains \"Tile Placement\"") == [
+        _filter("mechanics", "contains", "Tile Placement")
+    ]
+    for query in (
+        "{categories} icontains economic",
+        "{categories} = Economic",
+        "{mechanics} > Auction",
+    ):
+        assert parse_filter_query(query) == []
+
+
+def test_text_contains_searches_names():
+    assert parse_filter_query("{name} icontains brass") == [
+        _filter("search_names", "contains", "brass")
+    ]
+    assert parse_filter_query("{designer} contains Brown") == [
+        _filter("designer", "contains", "Brown")
+    ]
+
+
+@pytest.mark.parametrize(
+    "f",
+    [
+        _filter("year_released", "contains", 201),
+        _filter("avg_rating", "contains", "8"),
+        _filter("categories", "eq", "Economic"),
+    ],
+)
+def test_where_rejects_unsupported_operators(f):
+    with pytest.raises(ValueError):
+        CleanBoardGameRepository._where([f])
@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+from cleaning.clean_boardgame_info import clean_boardgame_payload
+from scraping.extraction import PAGE_XPATHS, build_raw_payload, extract_html
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "boardgame_pages.html")
+
+
+@pytest.fixture(scope="module")
+def pages():
+    with open(FIXTURE, encoding="utf-8") as f:
+        html = f.read()
+    return {page_type: extract_html(html, page_type) for page_type in PAGE_XPATHS}
+
+
+def test_fields_read_text_content(pages):
+    assert pages["credits"]["year"] == "(2018)"
+    # whitespace is only normalized by build_raw_payload
+    assert "Number of Players:\t2–4" in pages["credits"]["player counts"]
+
+
+def test_outline_descriptions_keep_line_breaks(pages):
+    assert pages["credits"]["Designer"] == "Gavan Brown\nMatt Tolman"
+    assert pages["credits"]["Categories"] == "Economic\nIndustry / Manufacturing"
+    assert pages["stats"] == {"Avg. Rating": "8.59", "Weight": "3.87 / 5"}
+
+
+def test_lists_only_match_their_selector(pages):
+    assert pages["versions"]["dimensions"] == ["30.5 x 30.5 x 7.6 cm"] * 2
+    assert pages["marketplace"]["prices"] == [
+        "from $59.99 - Miniature Market",
+        "from €64.90 - Philibert",
+    ]
+
+
+def test_build_raw_payload(pages):
+    payload = build_raw_payload(224517, "Brass: Birmingham", "/boardgame/224517", pages)
+
+    assert payload["id"] == 224517
+    assert payload["player counts"].split("\n") == [
+        "",
+        "Number of Players: 2–4",
+        "Players Community: 2–5",
+        "Best: 3–3",
+        "",
+    ]
+    assert payload["dimensions"] == ["30.5 x 30.5 x 7.6 cm"]
+    assert payload["Solo Designer"] == "N/A"
+    assert payload["Weight"] == "3.87 / 5"
+
+
+def test_missing_elements():
+    assert extract_html("<html><body></body></html>", "credits") == {
+        "player counts": None,
+        "year": None,
+    }
+    assert extract_html("<html><body></body></html>", "marketplace") == {"prices": []}
+
+
+def test_cleaning_reads_scraped_player_counts(pages):
+    payload = build_raw_payload(224517, "Brass: Birmingham", "/boardgame/224517", pages)
+    cleaned = clean_boardgame_payload(payload)
+
+    assert {k: v for k, v in cleaned.items() if "player_count" in k} == {
+        "official_player_count_min": 2,
+        "official_player_count_max": 4,
+        "community_player_count_min": 2,
+        "community_player_count_max": 5,
+        "best_player_count_min": 3,
+        "best_player_count_max": 3,
+    }
+
+
+def test_cleaning_reads_legacy_player_counts_key():
+    cleaned = clean_boardgame_payload({"id": 1, "player_counts": "Best: 2–3"})
+
+    assert cleaned["best_player_count_min"] == 2
+    assert cleaned["best_player_count_max"] == 3
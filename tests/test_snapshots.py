@@ -0,0 +1,51 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+from scraping.snapshots import SnapshotStore
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _objects(root):
+    return sorted(
+        name
+        for _, _, files in os.walk(os.path.join(root, "objects"))
+        for name in files
+    )
+
+
+def test_save_and_load(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    snapshot = store.save(1, "stats", "/boardgame/1/stats", "<p>ä</p>", START)
+
+    assert store.load(snapshot) == "<p>ä</p>"
+    assert store.latest(1) == {"stats": snapshot}
+
+
+def test_identical_pages_share_a_body(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    store.save(1, "stats", "/boardgame/1/stats", "<p>same</p>", START)
+    store.save(2, "stats", "/boardgame/2/stats", "<p>same</p>", START)
+
+    assert len(_objects(tmp_path)) == 1
+
+
+def test_keeps_only_the_newest_snapshots(tmp_path):
+    store = SnapshotStore(str(tmp_path), keep=2)
+    for day in range(4):
+        store.save(1, "stats", "/x", f"<p>{day}</p>", START + timedelta(days=day))
+    # another page still refers to the body of day 0
+    store.save(2, "stats", "/y", "<p>0</p>", START)
+
+    history = store.history(1, "stats")
+    assert [s.fetched_at for s in history] == [START + timedelta(days=d) for d in (2, 3)]
+    assert len(_objects(tmp_path)) == 3
+    assert [store.load(s) for s in history] == ["<p>2</p>", "<p>3</p>"]
+
+
+def test_keep_zero_is_unlimited(tmp_path):
+    store = SnapshotStore(str(tmp_path), keep=0)
+    for day in range(5):
+        store.save(1, "stats", "/x", f"<p>{day}</p>", START + timedelta(days=day))
+
+    assert len(store.history(1, "stats")) == 5